@@ -0,0 +1,194 @@
+"""
+End-to-end client benchmark against the local mock Borsdata server.
+
+Starts `MockBorsdataServer` with a synthetic universe (in a separate process
+unless --in-process, so it does not compete for the GIL) and times client methods
+and batch modes (thread pool, prefetching iterators, asyncio) over real HTTP.
+For each case it reports requests/s, p50/p99 call latency, time spent decoding
+and parsing per call (JSON loads, array decoding and model/record building,
+summed over threads) and peak traced memory of one call.
+
+    python scripts/benchmark_client.py --universe 2000 --latency 0.02
+"""
+import argparse
+import asyncio
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+
+import requests
+
+from borsdata_client import AsyncBorsdataAPIClient, BorsdataAPIClient, RetryPolicy
+from borsdata_client import arrays, async_client, client as client_module
+from borsdata_client.mock_server import STATS_PATH, MockBorsdataServer
+
+KEY = "benchmark"
+
+
+class _Timer:
+    """Thread-safe accumulator of seconds spent in wrapped functions."""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def wrap(self, fn):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self.seconds += elapsed
+        return timed
+
+
+PARSE = _Timer()
+
+
+def _instrument_parsing() -> None:
+    # Benchmark-only: route the decode/parse entry points through the timer.
+    client_module.loads = PARSE.wrap(client_module.loads)
+    async_client.loads = PARSE.wrap(async_client.loads)
+    arrays.decode_price_list = PARSE.wrap(arrays.decode_price_list)
+    arrays.decode_price_array_list = PARSE.wrap(arrays.decode_price_array_list)
+    for cls in (BorsdataAPIClient, AsyncBorsdataAPIClient):
+        cls._parse = PARSE.wrap(cls._parse)
+        cls._merge = PARSE.wrap(cls._merge)
+
+
+def percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def run_case(stats, fn, repeat: int) -> dict:
+    fn()  # warm the server's response cache and the connection pool
+    requests_before = sum(stats().values())
+    parse_before = PARSE.seconds
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call_start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+    requests = sum(stats().values()) - requests_before
+    parse = (PARSE.seconds - parse_before) / repeat
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"req/s": requests / elapsed, "p50": statistics.median(latencies), "p99": percentile(latencies, 0.99),
+            "parse": parse, "peak": peak, "requests": requests / repeat}
+
+
+def start_server(args):
+    """Returns (url, stop) for an in-process or subprocess mock server."""
+    options = dict(universe=args.universe, history=args.history, latency=args.latency,
+                   throttle_rate=args.throttle_rate, error_rate=args.error_rate)
+    if args.in_process:
+        server = MockBorsdataServer(**options).start()
+        return server.url, server.stop
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    command = [sys.executable, "-m", "borsdata_client.mock_server", "--port", str(port)]
+    for name, value in options.items():
+        command += [f"--{name.replace('_', '-')}", str(value)]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            requests.get(url + STATS_PATH, timeout=1)
+            break
+        except requests.ConnectionError:
+            time.sleep(0.1)
+
+    def stop():
+        process.terminate()
+        process.wait()
+    return url, stop
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--universe", type=int, default=2000)
+    parser.add_argument("--history", type=int, default=250, help="bars per instrument")
+    parser.add_argument("--repeat", type=int, default=20, help="calls per single-request case")
+    parser.add_argument("--batch-repeat", type=int, default=3, help="calls per universe-wide batch case")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0, help="server latency per request (s)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of requests answered 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered 500")
+    parser.add_argument("--in-process", action="store_true", help="run the server on a thread of this process")
+    args = parser.parse_args()
+
+    _instrument_parsing()
+    url, stop_server = start_server(args)
+    session = requests.Session()
+
+    def stats():
+        return {int(k): v for k, v in session.get(url + STATS_PATH).json().items()}
+
+    retry = RetryPolicy(backoff_base=0.05, backoff_max=1.0)
+    sync = BorsdataAPIClient(base_url=url, api_key=KEY, max_workers=args.workers, retry=retry)
+    records = sync.with_validation(False)
+    loop = asyncio.new_event_loop()
+    aclient = AsyncBorsdataAPIClient(base_url=url, api_key=KEY, max_concurrency=args.workers, retry=retry)
+    universe = range(1, args.universe + 1)
+    first50 = ",".join(map(str, range(1, 51)))
+
+    async def consume(agen):
+        async for _ in agen:
+            pass
+
+    single = [
+        ("get_markets", lambda: sync.get_markets()),
+        ("get_instruments", lambda: sync.get_instruments(KEY)),
+        ("get_stockprices", lambda: sync.get_stockprices(1)),
+        ("get_stockprices as_arrays", lambda: sync.get_stockprices(1, as_arrays=True)),
+        ("get_stockprices_last", lambda: sync.get_stockprices_last(KEY)),
+        ("get_stockprices_last records", lambda: records.get_stockprices_last(KEY)),
+        ("get_stockprices_last as_arrays", lambda: sync.get_stockprices_last(KEY, as_arrays=True)),
+        ("stream_stockprices_last", lambda: sum(1 for _ in sync.stream_stockprices_last(KEY))),
+        ("get_kpi_calc_alt", lambda: sync.get_kpi_calc_alt(1, "last", "latest")),
+        ("get_kpi_history_alt (50)", lambda: sync.get_kpi_history_alt(1, "year", "mean", instList=first50)),
+        ("get_reports_array (50)", lambda: sync.get_reports_array(first50, KEY)),
+        ("get_holdings_insider (50)", lambda: sync.get_holdings_insider(first50, KEY)),
+        ("async get_stockprices_last", lambda: loop.run_until_complete(aclient.get_stockprices_last(KEY))),
+    ]
+    batch = [
+        ("stockprices batch, 1 worker", lambda: sync.get_stockprices_array_batch(universe, KEY, as_arrays=True, max_workers=1)),
+        (f"stockprices batch, {args.workers} workers", lambda: sync.get_stockprices_array_batch(universe, KEY, as_arrays=True)),
+        ("stockprices batch, models", lambda: sync.get_stockprices_array_batch(universe, KEY)),
+        ("iter_stockprices", lambda: sum(1 for _ in sync.iter_stockprices(universe, KEY, as_arrays=True))),
+        ("async stockprices batch", lambda: loop.run_until_complete(aclient.get_stockprices_array_batch(universe, KEY, as_arrays=True))),
+        ("async iter_stockprices", lambda: loop.run_until_complete(consume(aclient.iter_stockprices(universe, KEY, as_arrays=True)))),
+        ("reports batch, records", lambda: records.get_reports_array_batch(universe, KEY)),
+        ("iter_kpi_history", lambda: sum(1 for _ in sync.iter_kpi_history(1, "year", "mean", universe))),
+    ]
+
+    print(f"universe {args.universe}, {args.history} bars, latency {args.latency * 1000:.0f} ms, "
+          f"429 rate {args.throttle_rate}, 500 rate {args.error_rate}")
+    print(f"{'case':<36} {'req/call':>8} {'req/s':>9} {'p50 (ms)':>9} {'p99 (ms)':>9} {'parse (ms)':>10} {'peak (MB)':>9}")
+    try:
+        for cases, repeat in ((single, args.repeat), (batch, args.batch_repeat)):
+            for name, fn in cases:
+                r = run_case(stats, fn, repeat)
+                print(f"{name:<36} {r['requests']:>8.1f} {r['req/s']:>9.1f} {r['p50'] * 1e3:>9.1f} {r['p99'] * 1e3:>9.1f} "
+                      f"{r['parse'] * 1e3:>10.1f} {r['peak'] / 1e6:>9.1f}")
+    finally:
+        loop.run_until_complete(aclient.close())
+        loop.close()
+        print(f"responses by status: {stats()}")
+        stop_server()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Micro-benchmark of the JSON decode paths on a synthetic universe-wide payload.
+
+Compares stdlib json against the fast parser (orjson, when installed) for a
+buffered decode, and buffered decode + pydantic parse against the streaming
+decoder, reporting wall time (best of `--repeat` runs of `--number` calls)
+and peak traced memory.
+
+    python scripts/benchmark_decode.py --rows 200000
+"""
+import argparse
+import gc
+import json
+import timeit
+import tracemalloc
+
+from borsdata_client.decode import JSON_BACKEND, iter_json_array, loads
+from borsdata_client.models import StockPriceFullV1, StockPricesGlobalLastRespV1
+
+
+def make_payload(rows: int) -> bytes:
+    return json.dumps({"stockPricesList": [
+        {"i": i, "d": "2024-01-02T00:00:00", "h": 101.5, "l": 99.25, "c": 100.0 + i % 7, "o": 100.5, "v": 12345 + i}
+        for i in range(rows)
+    ]}).encode()
+
+
+def measure(fn, number: int, repeat: int):
+    """Returns (seconds per call, peak bytes); timed without tracemalloc, which slows allocation down."""
+    gc.collect()
+    # timeit disables gc while timing, so collector pauses don't skew one run.
+    elapsed = min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk-size", type=int, default=64 * 1024)
+    parser.add_argument("--number", type=int, default=1, help="calls per timed run")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs; the fastest is reported")
+    args = parser.parse_args()
+
+    payload = make_payload(args.rows)
+    chunks = [payload[i:i + args.chunk_size] for i in range(0, len(payload), args.chunk_size)]
+
+    def consume_stream():
+        for row in iter_json_array(chunks, "stockPricesList"):
+            StockPriceFullV1.parse_obj(row)
+
+    cases = [
+        ("json.loads", lambda: json.loads(payload)),
+        (f"loads ({JSON_BACKEND})", lambda: loads(payload)),
+        ("buffered loads + parse_obj", lambda: StockPricesGlobalLastRespV1.parse_obj(loads(payload))),
+        ("streamed decode", lambda: sum(1 for _ in iter_json_array(chunks, "stockPricesList"))),
+        ("streamed decode + parse_obj", consume_stream),
+    ]
+    print(f"payload: {args.rows} rows, {len(payload) / 1e6:.1f} MB, best of {args.repeat} x {args.number}")
+    print(f"{'case':<30} {'time (s)':>10} {'peak (MB)':>10}")
+    for name, fn in cases:
+        elapsed, peak = measure(fn, args.number, args.repeat)
+        print(f"{name:<30} {elapsed:>10.3f} {peak / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
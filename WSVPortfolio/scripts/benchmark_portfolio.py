@@ -0,0 +1,46 @@
+"""
+Benchmark of vectorized portfolio valuation.
+
+Builds a random close-price matrix and random trades for many portfolios and
+times `valuate()` (NAV, cash, flows and time-weighted returns).
+
+    python scripts/benchmark_portfolio.py --portfolios 2000 --years 10
+"""
+import argparse
+import time
+
+import numpy as np
+
+from WSVPortfolio.portfolio import TRANSACTION_DTYPE, PriceMatrix, valuate
+
+
+def make_inputs(portfolios: int, days: int, instruments: int, trades: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    dates = np.datetime64("2014-01-01") + np.arange(days)
+    closes = 100 * np.cumprod(1 + rng.normal(0, 0.01, (days, instruments)), axis=0)
+    tx = np.zeros(portfolios * trades, dtype=TRANSACTION_DTYPE)
+    tx["portfolio"] = np.repeat(np.arange(portfolios), trades)
+    tx["insId"] = rng.integers(0, instruments, len(tx))
+    tx["d"] = dates[rng.integers(0, days, len(tx))]
+    tx["quantity"] = rng.integers(-5, 10, len(tx))
+    tx["price"] = 100.0
+    return PriceMatrix(dates, np.arange(instruments), closes), tx
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--portfolios", type=int, default=2000)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--instruments", type=int, default=500)
+    parser.add_argument("--trades", type=int, default=100, help="trades per portfolio")
+    args = parser.parse_args()
+
+    prices, tx = make_inputs(args.portfolios, args.years * 252, args.instruments, args.trades)
+    start = time.perf_counter()
+    valuate(prices, tx)
+    elapsed = time.perf_counter() - start
+    print(f"{args.portfolios} portfolios x {len(prices.dates)} days, {len(tx)} trades: {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark of validated models against lightweight records for reports.
+
+Builds a synthetic reports-array payload and compares `parse_obj` with the
+validation-free `build_record` path: parse time (best of `--repeat` runs of
+`--number` builds) and retained memory per 10k reports.
+
+    python scripts/benchmark_records.py --reports 10000
+"""
+import argparse
+import gc
+import timeit
+import tracemalloc
+
+from borsdata_client.models import ReportsArrayRespV1
+from borsdata_client.records import build_record
+
+REPORT_FIELDS_FLOAT = [
+    "revenues", "gross_Income", "operating_Income", "profit_Before_Tax", "profit_To_Equity_Holders",
+    "earnings_Per_Share", "number_Of_Shares", "dividend", "intangible_Assets", "tangible_Assets",
+    "financial_Assets", "non_Current_Assets", "cash_And_Equivalents", "current_Assets", "total_Assets",
+    "total_Equity", "non_Current_Liabilities", "current_Liabilities", "total_Liabilities_And_Equity",
+    "net_Debt", "cash_Flow_From_Operating_Activities", "cash_Flow_From_Investing_Activities",
+    "cash_Flow_From_Financing_Activities", "cash_Flow_For_The_Year", "free_Cash_Flow",
+    "stock_Price_Average", "stock_Price_High", "stock_Price_Low", "currency_Ratio", "net_Sales",
+]
+
+
+def make_payload(reports: int, per_instrument: int = 10) -> dict:
+    def report(k):
+        row = {name: float(k + j) for j, name in enumerate(REPORT_FIELDS_FLOAT)}
+        row.update(year=2000 + k % 20, period=4, report_Start_Date="2023-01-01", report_End_Date="2023-12-31",
+                   broken_Fiscal_Year=False, currency="SEK", report_Date="2024-02-01")
+        return row
+    instruments = max(1, reports // per_instrument)
+    return {"reportList": [
+        {"instrument": i, "reportsYear": [report(k) for k in range(per_instrument)]} for i in range(instruments)
+    ]}
+
+
+def measure(build, number: int, repeat: int):
+    gc.collect()
+    # timeit disables gc while timing, so collector pauses don't skew one run.
+    elapsed = min(timeit.repeat(build, number=number, repeat=repeat)) / number
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reports", type=int, default=10_000)
+    parser.add_argument("--number", type=int, default=3, help="builds per timed run")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs; the fastest is reported")
+    args = parser.parse_args()
+
+    payload = make_payload(args.reports)
+    scale = 10_000 / args.reports
+    print(f"{args.reports} reports, best of {args.repeat} x {args.number}, figures per 10k reports")
+    print(f"{'mode':<22} {'parse (ms)':>12} {'memory (MB)':>12}")
+    for name, build in [
+        ("parse_obj (validated)", lambda: ReportsArrayRespV1.parse_obj(payload)),
+        ("build_record", lambda: build_record(ReportsArrayRespV1, payload)),
+    ]:
+        elapsed, retained = measure(build, args.number, args.repeat)
+        print(f"{name:<22} {elapsed * 1000 * scale:>12.1f} {retained / 1e6 * scale:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
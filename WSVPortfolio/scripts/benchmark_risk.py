@@ -0,0 +1,49 @@
+"""
+Benchmark of the shared-memory risk engine.
+
+Builds a random close-price matrix and times rolling volatility, the full
+covariance/correlation matrix and betas against a few index columns.
+
+    python scripts/benchmark_risk.py --instruments 2000 --years 10 --workers 8
+"""
+import argparse
+import time
+
+import numpy as np
+
+from WSVPortfolio.portfolio import PriceMatrix
+from WSVPortfolio.risk import RiskEngine
+
+
+def make_prices(days: int, instruments: int, seed: int = 0) -> PriceMatrix:
+    rng = np.random.default_rng(seed)
+    dates = np.datetime64("2014-01-01") + np.arange(days)
+    closes = 100 * np.cumprod(1 + rng.normal(0, 0.01, (days, instruments)), axis=0)
+    # Listings start at random dates.
+    closes[np.arange(days)[:, None] < rng.integers(0, days // 2, instruments)] = np.nan
+    return PriceMatrix(dates, np.arange(instruments), closes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--instruments", type=int, default=2000)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--window", type=int, default=60)
+    args = parser.parse_args()
+
+    prices = make_prices(args.years * 252, args.instruments)
+    with RiskEngine(prices, max_workers=args.workers) as engine:
+        for name, run in (
+            ("rolling volatility", lambda: engine.rolling_volatility(args.window)),
+            ("covariance + correlation", lambda: engine.covariance()),
+            ("betas vs 5 indexes", lambda: engine.betas(prices.ids[:5])),
+        ):
+            start = time.perf_counter()
+            run()
+            print(f"{name}: {time.perf_counter() - start:.2f} s")
+    print(f"({args.instruments} instruments x {len(prices.dates)} days)")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,4 +9,6 @@ setup(
     packages=find_packages(where="src"),
     package_dir={"": "src"},
     python_requires=">=3.8",
+    install_requires=["numpy", "pydantic", "requests"],
+    extras_require={"async": ["aiohttp"], "fast": ["orjson"]},
 )
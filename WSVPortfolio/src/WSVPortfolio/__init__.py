@@ -1,2 +1,14 @@
 # WSVPortfolio package
 
+from .pricestore import PriceStore
+from .universe import InstrumentUniverse
+from .screener import Kpi, KpiScreener
+from .kpicube import KpiCube
+from .portfolio import PriceMatrix, valuate
+from .adjust import Adjuster
+from .reports import ReportStore
+from .panel import Panel, PanelBuilder
+from .poller import LastPricePoller
+from .risk import RiskEngine
+
+__all__ = ["PriceStore", "InstrumentUniverse", "Kpi", "KpiScreener", "KpiCube", "PriceMatrix", "valuate", "Adjuster", "ReportStore", "Panel", "PanelBuilder", "LastPricePoller", "RiskEngine"]
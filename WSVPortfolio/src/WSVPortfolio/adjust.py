@@ -0,0 +1,219 @@
+"""
+Split and dividend adjustment of price history.
+
+Corporate actions are parsed once into per-instrument event arrays: the
+ex-date and a price factor per event. A split with ratio r (new shares per
+old share) has factor 1 / r. A cash dividend D against the last close P
+before the ex-date has factor 1 - D / P. Each instrument keeps the suffix
+products of its factors, so the cumulative adjustment on any date is one
+`searchsorted` lookup.
+
+Adjusting a price series multiplies o/h/l/c by the cumulative factor and
+divides volume by the split-only factor, all in one pass. New events only
+recompute the event arrays of the instruments they touch, never the bars.
+"""
+import os
+import re
+from typing import Dict, Iterable, Optional, Set, TYPE_CHECKING, Union
+
+import numpy as np
+
+from .pricestore import PRICE_DTYPE, to_day
+
+if TYPE_CHECKING:
+    from borsdata_client import BorsdataAPIClient
+    from borsdata_client.arrays import PriceArrays
+    from borsdata_client.models import DividendsDateV1, StockSplitV1
+    from .portfolio import PriceMatrix
+
+SPLIT = 0
+DIVIDEND = 1
+
+# `DividendsDateV1.dividendType` values that are ordinary cash dividends.
+CASH_DIVIDEND_TYPES = (0,)
+
+EVENT_DTYPE = np.dtype([
+    ("d", "M8[D]"),
+    ("kind", "i1"),
+    ("f", "f8"),
+])
+
+_RATIO = re.compile(r"^\s*([0-9]+(?:[.,][0-9]+)?)\s*(?::|/|-?\s*for\s*-?|\s)\s*([0-9]+(?:[.,][0-9]+)?)\s*$", re.IGNORECASE)
+_NUMBER = re.compile(r"^\s*([0-9]+(?:[.,][0-9]+)?)\s*$")
+
+
+def parse_ratio(ratio: Optional[str], splitType: Optional[str] = None) -> float:
+    """
+    Parses a split ratio ("2:1", "1/10", "3 for 1", "2,5") to new shares per old share.
+
+    Reverse splits written larger-first (e.g. "10:1" with a splitType that
+    mentions "reverse" or "omvänd") are inverted. Returns NaN if unparsable.
+    """
+    if not ratio:
+        return float("nan")
+    match = _RATIO.match(ratio)
+    if match:
+        new, old = (float(x.replace(",", ".")) for x in match.groups())
+    else:
+        match = _NUMBER.match(ratio)
+        if not match:
+            return float("nan")
+        new, old = float(match.group(1).replace(",", ".")), 1.0
+    if new <= 0 or old <= 0:
+        return float("nan")
+    value = new / old
+    if splitType and re.search(r"reverse|omv[äa]nd", splitType, re.IGNORECASE) and value > 1:
+        value = 1 / value
+    return value
+
+
+def _bars(prices) -> tuple:
+    if isinstance(prices, np.ndarray):
+        return prices["d"], prices["c"]
+    return prices.d, prices.c
+
+
+class Adjuster:
+    """
+    Per-instrument split and dividend factors.
+
+    `add_splits()` and `add_dividends()` merge new events and return the
+    instruments whose factors changed; re-adding a known event is a no-op.
+    """
+
+    def __init__(self):
+        self._events: Dict[int, np.ndarray] = {}
+        self._cum: Dict[int, tuple] = {}
+
+    def __contains__(self, ins_id: int) -> bool:
+        return int(ins_id) in self._events
+
+    def instruments(self):
+        return sorted(self._events)
+
+    def events(self, ins_id: int) -> np.ndarray:
+        """Returns an instrument's events sorted by ex-date."""
+        return self._events.get(int(ins_id), np.empty(0, dtype=EVENT_DTYPE))
+
+    def _merge(self, ins_id: int, new: np.ndarray) -> bool:
+        new = new[np.isfinite(new["f"]) & (new["f"] > 0)]
+        if not len(new):
+            return False
+        old = self.events(ins_id)
+        # Events are few per instrument; a later copy of a (date, kind) event replaces the earlier one.
+        table = {(d, kind): f for d, kind, f in old.tolist()}
+        table.update(((d, kind), f) for d, kind, f in new.tolist())
+        events = np.array([(d, kind, f) for (d, kind), f in sorted(table.items())], dtype=EVENT_DTYPE)
+        if np.array_equal(events, old):
+            return False
+        self._events[ins_id] = events
+        self._cum.pop(ins_id, None)
+        return True
+
+    def add_splits(self, splits: Iterable['StockSplitV1']) -> Set[int]:
+        """Merges `get_stock_splits` rows; unparsable ratios are skipped."""
+        by_ins: Dict[int, list] = {}
+        for split in splits:
+            by_ins.setdefault(int(split.instrumentId), []).append(
+                (to_day(split.splitDate), SPLIT, 1.0 / parse_ratio(split.ratio, split.splitType)))
+        return {ins_id for ins_id, rows in by_ins.items() if self._merge(ins_id, np.array(rows, dtype=EVENT_DTYPE))}
+
+    def add_dividends(self, ins_id: int, dividends: Iterable['DividendsDateV1'], prices,
+                      types: Iterable[int] = CASH_DIVIDEND_TYPES) -> bool:
+        """
+        Merges cash dividends for one instrument, priced against its close history.
+
+        `prices` is PriceArrays or PRICE_DTYPE records covering the ex-dates;
+        dividends whose `dividendType` is not in `types`, or without an
+        ex-date, amount or earlier close, are skipped. Returns True if the
+        instrument's factors changed.
+        """
+        types = set(types)
+        rows = [(to_day(div.excludingDate), div.amountPaid) for div in dividends
+                if div.dividendType in types and div.excludingDate and div.amountPaid]
+        if not rows:
+            return False
+        ex_dates = np.array([d for d, _ in rows], dtype="M8[D]")
+        amounts = np.array([a for _, a in rows], dtype=np.float64)
+        dates, closes = _bars(prices)
+        prev = np.searchsorted(dates, ex_dates, side="left") - 1
+        valid = prev >= 0
+        close = np.where(valid, closes[np.maximum(prev, 0)], np.nan)
+        events = np.empty(len(rows), dtype=EVENT_DTYPE)
+        events["d"], events["kind"] = ex_dates, DIVIDEND
+        with np.errstate(invalid="ignore", divide="ignore"):
+            events["f"] = 1.0 - amounts / close
+        return self._merge(int(ins_id), events)
+
+    def _cumulative(self, ins_id: int) -> tuple:
+        cum = self._cum.get(ins_id)
+        if cum is None:
+            events = self._events[ins_id]
+            split_f = np.where(events["kind"] == SPLIT, events["f"], 1.0)
+            # total[k] is the product of factors of events k.. (so dates before event k get it).
+            total = np.append(np.cumprod(events["f"][::-1])[::-1], 1.0)
+            split = np.append(np.cumprod(split_f[::-1])[::-1], 1.0)
+            cum = self._cum[ins_id] = (events["d"], total, split)
+        return cum
+
+    def factors(self, ins_id: int, dates: np.ndarray, splits_only: bool = False) -> np.ndarray:
+        """Cumulative price factor on each date: the product of all events with ex-date after it."""
+        dates = np.asarray(dates, dtype="M8[D]")
+        ins_id = int(ins_id)
+        if ins_id not in self._events:
+            return np.ones(len(dates))
+        ex_dates, total, split = self._cumulative(ins_id)
+        return (split if splits_only else total)[np.searchsorted(ex_dates, dates, side="right")]
+
+    def adjust(self, ins_id: int, prices: Union['PriceArrays', np.ndarray], dividends: bool = True):
+        """
+        Returns adjusted copies of PriceArrays or PRICE_DTYPE records.
+
+        Prices are back-adjusted so the latest bars are unchanged. With
+        `dividends=False` only splits are applied.
+        """
+        dates, _ = _bars(prices)
+        price_f = self.factors(ins_id, dates, splits_only=not dividends)
+        volume_f = price_f if not dividends else self.factors(ins_id, dates, splits_only=True)
+        if isinstance(prices, np.ndarray):
+            out = np.array(prices, dtype=PRICE_DTYPE)
+            for field in ("o", "h", "l", "c"):
+                out[field] *= price_f
+            out["v"] /= volume_f
+            return out
+        # PriceArrays overrides __len__, which breaks NamedTuple._replace.
+        return type(prices)(prices.d, prices.o * price_f, prices.h * price_f, prices.l * price_f, prices.c * price_f,
+                            prices.v / volume_f, prices.i, prices.instrument, prices.error)
+
+    def adjust_matrix(self, prices: 'PriceMatrix', dividends: bool = True) -> 'PriceMatrix':
+        """Returns a PriceMatrix with every column that has events adjusted."""
+        closes = prices.closes.copy()
+        for col, ins_id in enumerate(prices.ids):
+            if int(ins_id) in self._events:
+                closes[:, col] *= self.factors(ins_id, prices.dates, splits_only=not dividends)
+        return prices._replace(closes=closes)
+
+    def update_splits(self, client: 'BorsdataAPIClient', authKey: str, from_date: str = None) -> Set[int]:
+        """Fetches `get_stock_splits` and merges them; returns the instruments that changed."""
+        return self.add_splits(client.get_stock_splits(authKey, from_date).stockSplitList or [])
+
+    # --- Persistence ---
+    def save(self, path: str) -> None:
+        """Writes all events to one .npz file atomically."""
+        ids = np.array(self.instruments(), dtype=np.int64)
+        counts = np.array([len(self._events[i]) for i in ids], dtype=np.int64)
+        events = np.concatenate([self._events[i] for i in ids]) if len(ids) else np.empty(0, dtype=EVENT_DTYPE)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, ids=ids, counts=counts, events=events)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'Adjuster':
+        """Reads events written by `save()`."""
+        adjuster = cls()
+        with np.load(path) as data:
+            ids, counts, events = data["ids"], data["counts"], data["events"]
+        for ins_id, chunk in zip(ids, np.split(events, np.cumsum(counts)[:-1]) if len(ids) else []):
+            adjuster._events[int(ins_id)] = chunk
+        return adjuster
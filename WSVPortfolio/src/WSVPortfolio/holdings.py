@@ -0,0 +1,165 @@
+"""
+Bulk holdings, calendar and description ingestion into flat columnar tables.
+
+Each endpoint's per-instrument lists are flattened into one table per
+endpoint: a dict of equal-length NumPy columns with one row per event and
+an `insId` column. Dates become datetime64[D] (NaT when missing) and strings
+fixed-width unicode ("" when missing). Tables are saved as uncompressed .npz
+files that load without pickle.
+
+`refresh_holdings()` is the nightly insider/short/buyback job and
+`refresh_calendars()` the dividend/report calendar and description job. They
+fetch through the client's chunked batch methods, so every request goes
+through the client's pool and rate limiter.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from borsdata_client import BorsdataAPIClient
+
+Table = Dict[str, np.ndarray]
+
+# Column name -> dtype per table. "M8[D]" columns are parsed from ISO strings.
+INSIDER_COLUMNS = {
+    "insId": "i8", "verificationDate": "M8[D]", "transactionDate": "M8[D]", "transactionType": "i8",
+    "shares": "i8", "price": "f8", "amount": "f8", "currency": "U", "ownerName": "U", "ownerPosition": "U",
+    "equityProgram": "?", "misc": "?",
+}
+SHORTS_COLUMNS = {
+    "insId": "i8", "shortsProc": "f8", "shortsHolders": "f8", "shortsAvgProc": "f8", "shortsMilj": "f8",
+    "shortsAvgMilj": "f8", "lastTransactionDate": "M8[D]", "dtcSum": "f8", "dtcAvg": "f8", "trend1w": "f8",
+    "trend1m": "f8", "trend3m": "f8", "trend6m": "f8",
+}
+BUYBACK_COLUMNS = {
+    "insId": "i8", "date": "M8[D]", "change": "i8", "changeProc": "f8", "price": "f8", "currency": "U",
+    "shares": "i8", "sharesProc": "f8",
+}
+DIVIDEND_COLUMNS = {
+    "insId": "i8", "excludingDate": "M8[D]", "amountPaid": "f8", "currencyShortName": "U",
+    "distributionFrequency": "f8", "dividendType": "i8",
+}
+REPORT_CALENDAR_COLUMNS = {"insId": "i8", "releaseDate": "M8[D]", "reportType": "U"}
+DESCRIPTION_COLUMNS = {"insId": "i8", "languageCode": "U", "text": "U"}
+
+
+def _column(values: list, dtype: str) -> np.ndarray:
+    if dtype == "M8[D]":
+        return np.array([v[:10] if v else None for v in values], dtype="M8[D]")
+    if dtype == "U":
+        return np.array(["" if v is None else v for v in values], dtype=str) if values else np.empty(0, dtype="U1")
+    if dtype == "f8":
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    return np.array(values, dtype=dtype)
+
+
+def flatten(items: Iterable, columns: Dict[str, str], nested: bool = True, values: str = "values", key: str = "insId") -> Table:
+    """
+    Flattens response items into a columnar table.
+
+    With `nested`, each item's list under `values` is expanded to rows and the
+    item's id (attribute `key`) repeated in the insId column; otherwise each
+    item is one row. Items carrying an `error` are skipped.
+    """
+    rows: List = []
+    ins_ids: List[int] = []
+    for item in items:
+        if getattr(item, "error", None):
+            continue
+        if nested:
+            children = getattr(item, values) or []
+            rows.extend(children)
+            ins_ids.extend([getattr(item, key)] * len(children))
+        else:
+            rows.append(item)
+            ins_ids.append(getattr(item, key))
+    table = {}
+    for name, dtype in columns.items():
+        column = ins_ids if name == "insId" else [getattr(row, name, None) for row in rows]
+        table[name] = _column(column, dtype)
+    return table
+
+
+def insider_table(resp) -> Table:
+    return flatten(resp.list or [], INSIDER_COLUMNS)
+
+
+def shorts_table(resp) -> Table:
+    return flatten(resp.list or [], SHORTS_COLUMNS, nested=False)
+
+
+def buyback_table(resp) -> Table:
+    return flatten(resp.list or [], BUYBACK_COLUMNS)
+
+
+def dividend_table(resp) -> Table:
+    return flatten(resp.list or [], DIVIDEND_COLUMNS)
+
+
+def report_calendar_table(resp) -> Table:
+    return flatten(resp.list or [], REPORT_CALENDAR_COLUMNS)
+
+
+def description_table(resp) -> Table:
+    return flatten(resp.list or [], DESCRIPTION_COLUMNS, nested=False)
+
+
+def save_table(path: str, table: Table) -> None:
+    """Writes a table to `path` atomically."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, **table)
+    os.replace(tmp, path)
+
+
+def load_table(path: str) -> Table:
+    """Reads a table written by `save_table()`."""
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def _refresh(jobs: Dict[str, callable], root: str) -> Dict[str, int]:
+    os.makedirs(root, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        futures = {name: pool.submit(job) for name, job in jobs.items()}
+        tables = {name: future.result() for name, future in futures.items()}
+    for name, table in tables.items():
+        save_table(os.path.join(root, f"{name}.npz"), table)
+    return {name: len(table["insId"]) for name, table in tables.items()}
+
+
+def refresh_holdings(client: 'BorsdataAPIClient', instruments: Iterable[int], authKey: str, root: str,
+                     max_workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Fetches insider, short and buyback data for the universe and writes
+    `insider.npz`, `shorts.npz` and `buyback.npz` under `root`.
+
+    Responses skip pydantic validation. Returns the row count per table.
+    """
+    client = client.with_validation(False)
+    instruments = list(instruments)
+    return _refresh({
+        "insider": lambda: insider_table(client.get_holdings_insider_batch(instruments, authKey, max_workers)),
+        "shorts": lambda: shorts_table(client.get_holdings_shorts(authKey)),
+        "buyback": lambda: buyback_table(client.get_holdings_buyback_batch(instruments, authKey, max_workers)),
+    }, root)
+
+
+def refresh_calendars(client: 'BorsdataAPIClient', instruments: Iterable[int], authKey: str, root: str,
+                      max_workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Fetches dividend and report calendars and descriptions for the universe and
+    writes `dividends.npz`, `report_calendar.npz` and `descriptions.npz` under `root`.
+
+    Responses skip pydantic validation. Returns the row count per table.
+    """
+    client = client.with_validation(False)
+    instruments = list(instruments)
+    return _refresh({
+        "dividends": lambda: dividend_table(client.get_dividend_calendar_batch(instruments, authKey, max_workers)),
+        "report_calendar": lambda: report_calendar_table(client.get_report_calendar_batch(instruments, authKey, max_workers)),
+        "descriptions": lambda: description_table(client.get_instruments_description_batch(instruments, authKey, max_workers)),
+    }, root)
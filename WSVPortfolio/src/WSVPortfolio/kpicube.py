@@ -0,0 +1,234 @@
+"""
+Memory-mapped KPI history cube.
+
+A cube holds `get_kpi_history_alt` data for one report type and price type as
+a dense float array of shape (kpis, instruments, periods), stored C-ordered in
+`values.f8`, with NaN where a value is missing. The axes are described by
+index files: `instruments.i8` and `periods.i8` are fixed when the cube is
+created, and `kpis.i8` lists the KPI slices in file order.
+
+Each KPI is one contiguous slice of the file. Building a new KPI appends its
+slice, fsyncs it and only then appends its id, so `kpis.i8` never points
+past the data. A slice left without an id by a writer that died is cut off
+before the next append. Rebuilding an existing KPI rewrites only that slice
+in place. Readers map the file read-only and share pages across processes.
+
+Writers in different processes serialize on an `flock` of the cube
+directory. Where `fcntl` is unavailable (Windows) only one process may write
+to a cube at a time.
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+if TYPE_CHECKING:
+    from borsdata_client import BorsdataAPIClient
+
+VALUE_DTYPE = np.dtype("f8")
+INDEX_DTYPE = np.dtype("i8")
+
+REPORT_TYPES = ("year", "r12", "quarter")
+
+
+def period_code(year, period, reporttype: str):
+    """
+    Encodes (year, period) as `year * 10 + period`, the period axis key.
+
+    Year reports have one period per year, so their period number is ignored
+    and the code is `year * 10`. Works on scalars and arrays.
+    """
+    if reporttype == "year":
+        return np.asarray(year, dtype=INDEX_DTYPE) * 10
+    return np.asarray(year, dtype=INDEX_DTYPE) * 10 + np.asarray(period, dtype=INDEX_DTYPE)
+
+
+def period_range(first_year: int, last_year: int, reporttype: str) -> np.ndarray:
+    """Returns the period codes from `first_year` through `last_year` for a report type."""
+    years = np.arange(first_year, last_year + 1, dtype=INDEX_DTYPE)
+    if reporttype == "year":
+        return years * 10
+    return (years[:, None] * 10 + np.arange(1, 5, dtype=INDEX_DTYPE)).ravel()
+
+
+class KpiCube:
+    """
+    KPI x instrument x period cube in a directory.
+
+    Open an existing cube with `KpiCube(root)`; it is read-only unless
+    `writable=True`. `values` and `slice()` are memory-mapped views.
+    """
+
+    def __init__(self, root: str, writable: bool = False):
+        self.root = root
+        self.writable = writable
+        with open(self._path("meta.json")) as f:
+            meta = json.load(f)
+        self.reporttype: str = meta["reporttype"]
+        self.pricetype: str = meta["pricetype"]
+        self.instruments = np.fromfile(self._path("instruments.i8"), dtype=INDEX_DTYPE)
+        self.periods = np.fromfile(self._path("periods.i8"), dtype=INDEX_DTYPE)
+        self._row = {int(ins_id): k for k, ins_id in enumerate(self.instruments)}
+        self._lock = threading.Lock()
+        self._load_kpis()
+
+    @classmethod
+    def create(cls, root: str, instruments: Iterable[int], periods: Iterable[int], reporttype: str,
+               pricetype: str = "mean") -> 'KpiCube':
+        """Creates an empty cube with fixed instrument and period axes and opens it writable."""
+        if reporttype not in REPORT_TYPES:
+            raise ValueError(f"reporttype must be one of {REPORT_TYPES}, got {reporttype!r}")
+        os.makedirs(root, exist_ok=True)
+        np.unique(np.fromiter(instruments, dtype=INDEX_DTYPE)).tofile(os.path.join(root, "instruments.i8"))
+        np.unique(np.fromiter(periods, dtype=INDEX_DTYPE)).tofile(os.path.join(root, "periods.i8"))
+        for name in ("kpis.i8", "values.f8"):
+            open(os.path.join(root, name), "wb").close()
+        with open(os.path.join(root, "meta.json"), "w") as f:
+            json.dump({"reporttype": reporttype, "pricetype": pricetype}, f)
+        return cls(root, writable=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def _load_kpis(self) -> None:
+        kpis = np.fromfile(self._path("kpis.i8"), dtype=INDEX_DTYPE)
+        needed = len(kpis) * self._slice_bytes
+        if os.path.getsize(self._path("values.f8")) < needed:
+            raise ValueError(f"KpiCube at {self.root}: values.f8 is shorter than the {len(kpis)} KPIs in kpis.i8")
+        self.kpis = kpis
+        self._slot = {int(kpi_id): k for k, kpi_id in enumerate(kpis)}
+
+    @contextmanager
+    def _write_lock(self):
+        """Holds the thread lock and an exclusive flock on the cube directory."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            fd = os.open(self.root, os.O_RDONLY)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(fd)  # releases the flock
+
+    @property
+    def slice_shape(self):
+        return (len(self.instruments), len(self.periods))
+
+    @property
+    def _slice_bytes(self) -> int:
+        return len(self.instruments) * len(self.periods) * VALUE_DTYPE.itemsize
+
+    @property
+    def values(self) -> np.ndarray:
+        """The whole cube as a read-only memory-mapped (kpis, instruments, periods) array."""
+        if not len(self.kpis) or not all(self.slice_shape):
+            return np.empty((len(self.kpis), *self.slice_shape), dtype=VALUE_DTYPE)
+        return np.memmap(self._path("values.f8"), dtype=VALUE_DTYPE, mode="r", shape=(len(self.kpis), *self.slice_shape))
+
+    def reload(self) -> None:
+        """Picks up KPI slices appended by another process."""
+        self._load_kpis()
+
+    def slice(self, kpiId: int) -> np.ndarray:
+        """Returns one KPI as a read-only memory-mapped (instruments, periods) array."""
+        k = self._slot[int(kpiId)]
+        n, p = self.slice_shape
+        if not n * p:
+            return np.empty((n, p), dtype=VALUE_DTYPE)
+        return np.memmap(self._path("values.f8"), dtype=VALUE_DTYPE, mode="r", shape=(n, p),
+                         offset=k * n * p * VALUE_DTYPE.itemsize)
+
+    def series(self, kpiId: int, insId: int) -> np.ndarray:
+        """Returns one instrument's history of a KPI along the period axis."""
+        return self.slice(kpiId)[self._row[int(insId)]]
+
+    # --- Building ---
+    def _fill(self, client: 'BorsdataAPIClient', kpiId: int) -> np.ndarray:
+        block = np.full(self.slice_shape, np.nan, dtype=VALUE_DTYPE)
+        for item in client.iter_kpi_history(kpiId, self.reporttype, self.pricetype, self.instruments.tolist()):
+            row = self._row.get(item.instrument)
+            if row is None or not item.values:
+                continue
+            values = item.values
+            years = np.fromiter((v.y for v in values), dtype=INDEX_DTYPE, count=len(values))
+            periods = np.fromiter((v.p for v in values), dtype=INDEX_DTYPE, count=len(values))
+            data = np.fromiter((np.nan if v.v is None else v.v for v in values), dtype=VALUE_DTYPE, count=len(values))
+            codes = period_code(years, periods, self.reporttype)
+            cols = np.minimum(np.searchsorted(self.periods, codes), len(self.periods) - 1)
+            hit = self.periods[cols] == codes
+            block[row, cols[hit]] = data[hit]
+        return block
+
+    def build(self, client: 'BorsdataAPIClient', kpiId: int) -> None:
+        """
+        Fetches one KPI's history for the cube's instruments into its slice.
+
+        A KPI already in the cube is rewritten in place, leaving every other
+        slice untouched. A new KPI is appended. Instruments and periods outside
+        the cube's axes are skipped.
+        """
+        if not self.writable:
+            raise PermissionError(f"KpiCube at {self.root} was opened read-only")
+        kpiId = int(kpiId)
+        block = self._fill(client, kpiId)
+        with self._write_lock():
+            # Another process may have appended KPIs since this cube was loaded.
+            self._load_kpis()
+            k = self._slot.get(kpiId)
+            if k is None:
+                with open(self._path("values.f8"), "r+b") as f:
+                    f.truncate(len(self.kpis) * block.nbytes)
+                    f.seek(0, os.SEEK_END)
+                    f.write(block.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                with open(self._path("kpis.i8"), "ab") as f:
+                    f.write(np.array([kpiId], dtype=INDEX_DTYPE).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._load_kpis()
+            elif block.size:
+                with open(self._path("values.f8"), "r+b") as f:
+                    f.seek(k * block.nbytes)
+                    f.write(block.tobytes())
+
+    def build_many(self, client: 'BorsdataAPIClient', kpi_ids: Iterable[int], max_workers: Optional[int] = None) -> None:
+        """Builds several KPIs concurrently."""
+        kpi_ids = list(dict.fromkeys(int(k) for k in kpi_ids))
+        workers = min(max_workers or getattr(client, "max_workers", 8), len(kpi_ids)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda kpi_id: self.build(client, kpi_id), kpi_ids))
+
+
+def build_cubes(client: 'BorsdataAPIClient', root: str, kpi_ids: Iterable[int], instruments: Iterable[int],
+                first_year: int, last_year: int, reporttypes: Iterable[str] = REPORT_TYPES,
+                pricetype: str = "mean") -> Dict[str, KpiCube]:
+    """
+    Builds one cube per report type under `root/<reporttype>`.
+
+    Existing cubes are reopened and their KPI slices rebuilt; missing cubes
+    are created with instrument and period axes from the arguments.
+    """
+    kpi_ids: List[int] = list(kpi_ids)
+    instruments = list(instruments)
+    cubes = {}
+    for reporttype in reporttypes:
+        path = os.path.join(root, reporttype)
+        if os.path.exists(os.path.join(path, "meta.json")):
+            cube = KpiCube(path, writable=True)
+        else:
+            cube = KpiCube.create(path, instruments, period_range(first_year, last_year, reporttype), reporttype, pricetype)
+        cube.build_many(client, kpi_ids)
+        cubes[reporttype] = cube
+    return cubes
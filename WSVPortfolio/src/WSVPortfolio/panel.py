@@ -0,0 +1,154 @@
+"""
+Resumable cross-sectional price panel built from date snapshots.
+
+`get_stockprices_date` / `get_stockprices_global_date` return one bar per
+instrument for a single date. `PanelBuilder` fetches every weekday in a
+range concurrently and scatters each snapshot into date x instrument
+matrices, one flat float64 file per price field (`c.f8`, `v.f8`, ...), with
+NaN where an instrument has no bar.
+
+Progress is checkpointed per date in `done.u1`. A date's flag is written only
+after its rows, so an interrupted build resumes with the dates that were not
+finished. Readers open the panel with `Panel(root)` and get read-only
+memory-mapped matrices.
+"""
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Optional, Sequence, TYPE_CHECKING
+
+import numpy as np
+
+from .portfolio import PriceMatrix, forward_fill
+from .pricestore import to_day
+
+if TYPE_CHECKING:
+    from borsdata_client import BorsdataAPIClient
+
+VALUE_DTYPE = np.dtype("f8")
+PRICE_FIELDS = ("o", "h", "l", "c", "v")
+
+
+def weekdays(start, end) -> np.ndarray:
+    """Returns the Monday-Friday dates from `start` through `end`."""
+    days = np.arange(to_day(start), to_day(end) + 1)
+    return days[np.is_busday(days)]
+
+
+class Panel:
+    """Read-only view of a panel directory."""
+
+    def __init__(self, root: str):
+        self.root = root
+        with open(os.path.join(root, "meta.json")) as f:
+            meta = json.load(f)
+        self.fields: Sequence[str] = meta["fields"]
+        self.global_ = meta["global"]
+        self.dates = np.fromfile(os.path.join(root, "dates.M8"), dtype="M8[D]")
+        self.instruments = np.fromfile(os.path.join(root, "instruments.i8"), dtype=np.int64)
+
+    @property
+    def shape(self):
+        return (len(self.dates), len(self.instruments))
+
+    @property
+    def done(self) -> np.ndarray:
+        """True for dates whose snapshot has been stored."""
+        return np.fromfile(os.path.join(self.root, "done.u1"), dtype=np.uint8).astype(bool)
+
+    def matrix(self, field: str = "c") -> np.ndarray:
+        """Returns one field as a read-only memory-mapped dates x instruments array."""
+        if field not in self.fields:
+            raise KeyError(f"Panel has no field {field!r}; stored fields are {list(self.fields)}")
+        if not all(self.shape):
+            return np.empty(self.shape, dtype=VALUE_DTYPE)
+        return np.memmap(os.path.join(self.root, f"{field}.f8"), dtype=VALUE_DTYPE, mode="r", shape=self.shape)
+
+    def column(self, ins_id: int, field: str = "c") -> np.ndarray:
+        """Returns one instrument's series along the date axis."""
+        k = int(np.searchsorted(self.instruments, ins_id))
+        if k == len(self.instruments) or self.instruments[k] != ins_id:
+            raise KeyError(ins_id)
+        return self.matrix(field)[:, k]
+
+    def price_matrix(self, field: str = "c") -> PriceMatrix:
+        """Loads one field as a forward-filled PriceMatrix for `valuate()`."""
+        return PriceMatrix(self.dates, self.instruments, forward_fill(np.array(self.matrix(field))))
+
+
+class PanelBuilder(Panel):
+    """
+    Creates or resumes a panel over fixed date and instrument axes.
+
+    Re-opening an existing directory keeps its axes and fields; the
+    arguments only matter the first time.
+    """
+
+    def __init__(self, root: str, instruments: Iterable[int], start, end, fields: Sequence[str] = ("c",),
+                 global_: bool = False):
+        if not os.path.exists(os.path.join(root, "meta.json")):
+            self._create(root, instruments, start, end, fields, global_)
+        super().__init__(root)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _create(root, instruments, start, end, fields, global_) -> None:
+        unknown = [f for f in fields if f not in PRICE_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown price fields {unknown}; expected a subset of {PRICE_FIELDS}")
+        os.makedirs(root, exist_ok=True)
+        dates = weekdays(start, end)
+        ids = np.unique(np.fromiter(instruments, dtype=np.int64))
+        dates.tofile(os.path.join(root, "dates.M8"))
+        ids.tofile(os.path.join(root, "instruments.i8"))
+        np.zeros(len(dates), dtype=np.uint8).tofile(os.path.join(root, "done.u1"))
+        row = np.full(len(ids), np.nan, dtype=VALUE_DTYPE).tobytes()
+        for field in fields:
+            with open(os.path.join(root, f"{field}.f8"), "wb") as f:
+                for _ in range(len(dates)):
+                    f.write(row)
+        # meta.json last: its presence marks a fully initialised panel.
+        with open(os.path.join(root, "meta.json"), "w") as f:
+            json.dump({"fields": list(fields), "global": global_}, f)
+
+    def _store(self, k: int, snapshot) -> None:
+        ids = snapshot.i
+        cols = np.searchsorted(self.instruments, ids)
+        # Instruments outside the panel's axis are dropped.
+        hit = cols < len(self.instruments)
+        hit[hit] = self.instruments[cols[hit]] == ids[hit]
+        row_bytes = len(self.instruments) * VALUE_DTYPE.itemsize
+        with self._lock:
+            for field in self.fields:
+                row = np.full(len(self.instruments), np.nan, dtype=VALUE_DTYPE)
+                row[cols[hit]] = getattr(snapshot, field)[hit]
+                with open(os.path.join(self.root, f"{field}.f8"), "r+b") as f:
+                    f.seek(k * row_bytes)
+                    f.write(row.tobytes())
+            with open(os.path.join(self.root, "done.u1"), "r+b") as f:
+                f.seek(k)
+                f.write(b"\x01")
+
+    def build(self, client: 'BorsdataAPIClient', authKey: str, max_workers: Optional[int] = None) -> Dict[str, object]:
+        """
+        Fetches every date not yet stored, concurrently, and stores each as it arrives.
+
+        Requests go through the client's rate limiter and retries. A date that
+        still fails is left unfinished for the next run. Returns the number of
+        dates fetched and skipped and the errors per failed date.
+        """
+        fetch = client.get_stockprices_global_date if self.global_ else client.get_stockprices_date
+        pending = np.flatnonzero(~self.done)
+        failed: Dict[str, Exception] = {}
+        if len(pending):
+            workers = min(max_workers or getattr(client, "max_workers", 8), len(pending))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(fetch, authKey, str(self.dates[k]), as_arrays=True): k for k in pending}
+                for future in as_completed(futures):
+                    k = futures[future]
+                    try:
+                        self._store(k, future.result())
+                    except Exception as exc:
+                        failed[str(self.dates[k])] = exc
+        return {"fetched": len(pending) - len(failed), "skipped": len(self.dates) - len(pending), "failed": failed}
@@ -0,0 +1,168 @@
+"""
+Last-price poller with delta detection.
+
+`LastPricePoller` keeps the latest bar of every instrument in one record
+array (`LAST_DTYPE`) sorted by insId. Each poll of `get_stockprices_last` (or
+`get_stockprices_global_last`) is decoded with `as_arrays=True` and compared
+with that table column by column. Only the rows whose date, prices or volume
+changed are written back and handed to subscribers, as a `CHANGE_DTYPE`
+array that also carries the previous close.
+
+The response has to be decoded in full on every poll. After that, the work
+is a few vectorized comparisons, and the writes and allocations scale with
+the number of changed rows. When a poll covers exactly the instruments in the
+table (the usual case), columns are compared in place, with no lookup of
+table rows. Repeated insIds in a poll keep their last row.
+"""
+import queue
+import threading
+from typing import Callable, List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from .pricestore import PRICE_DTYPE
+
+if TYPE_CHECKING:
+    from borsdata_client import BorsdataAPIClient
+    from borsdata_client.arrays import PriceArrays
+
+LAST_DTYPE = np.dtype([("i", "i8")] + [(name, PRICE_DTYPE[name]) for name in PRICE_DTYPE.names])
+CHANGE_DTYPE = np.dtype(LAST_DTYPE.descr + [("prev_c", "f8")])
+
+_FIELDS = PRICE_DTYPE.names
+
+
+def _differs(old: np.ndarray, new: np.ndarray) -> np.ndarray:
+    """Elementwise !=, treating NaN/NaT on both sides as equal."""
+    both_missing = np.isnat(old) & np.isnat(new) if old.dtype.kind == "M" else np.isnan(old) & np.isnan(new)
+    return (old != new) & ~both_missing
+
+
+def _dedupe(ids: np.ndarray, cols: dict):
+    """Sorts a poll by insId, keeping the last row of a repeated id. Sorted unique ids pass through unchanged."""
+    if len(ids) < 2 or (ids[1:] > ids[:-1]).all():
+        return ids, cols
+    unique, first = np.unique(ids[::-1], return_index=True)
+    take = len(ids) - 1 - first
+    return unique, {name: col[take] for name, col in cols.items()}
+
+
+class LastPricePoller:
+    """
+    Polls last prices and publishes the rows that changed.
+
+    Subscribers are callables taking a CHANGE_DTYPE array; `queue()` returns a
+    queue.Queue fed the same arrays. The first poll publishes every row. Rows
+    missing from a later poll keep their last value.
+    """
+
+    def __init__(self, client: 'BorsdataAPIClient', authKey: str, global_: bool = False):
+        self.client = client
+        self.authKey = authKey
+        self.global_ = global_
+        self.table = np.empty(0, dtype=LAST_DTYPE)
+        self.last_error: Optional[Exception] = None
+        self._subscribers: List[Callable[[np.ndarray], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, callback: Callable[[np.ndarray], None]) -> Callable[[], None]:
+        """Registers `callback` for change arrays; returns a function that unregisters it."""
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def queue(self, maxsize: int = 0) -> 'queue.Queue[np.ndarray]':
+        """Returns a queue that receives every change array."""
+        q: queue.Queue = queue.Queue(maxsize)
+        self.subscribe(q.put)
+        return q
+
+    def snapshot(self, ins_id: int) -> Optional[np.void]:
+        """Returns the stored row of one instrument, or None."""
+        k = int(np.searchsorted(self.table["i"], ins_id))
+        if k < len(self.table) and self.table["i"][k] == ins_id:
+            return self.table[k]
+        return None
+
+    def apply(self, prices: 'PriceArrays') -> np.ndarray:
+        """Merges one decoded poll into the table and returns the changed rows, in insId order."""
+        ids, cols = _dedupe(prices.i, {name: getattr(prices, name) for name in _FIELDS})
+        with self._lock:
+            table = self.table
+            if len(table) == len(ids) and np.array_equal(table["i"], ids):
+                # Same instruments as the table, the usual case: compare the columns in place.
+                changed = np.zeros(len(ids), dtype=bool)
+                for name in _FIELDS:
+                    changed |= _differs(table[name], cols[name])
+                rows = upd = slots = np.flatnonzero(changed)
+                fresh = rows[:0]
+            else:
+                pos = np.searchsorted(table["i"], ids)
+                known = pos < len(table)
+                known[known] = table["i"][pos[known]] == ids[known]
+                krows = np.flatnonzero(known)
+                kpos = pos[krows]
+                changed = np.zeros(len(krows), dtype=bool)
+                for name in _FIELDS:
+                    changed |= _differs(table[name][kpos], cols[name][krows])
+                upd, slots = krows[changed], kpos[changed]
+                fresh = np.flatnonzero(~known)
+                rows = np.sort(np.concatenate([upd, fresh]))
+
+            out = np.empty(len(rows), dtype=CHANGE_DTYPE)
+            out["i"] = ids[rows]
+            for name in _FIELDS:
+                out[name] = cols[name][rows]
+            out["prev_c"] = np.nan
+            if len(upd):
+                out["prev_c"][np.searchsorted(rows, upd)] = table["c"][slots]
+                for name in _FIELDS:
+                    table[name][slots] = cols[name][upd]
+            if len(fresh):
+                # New instruments are rare; only then is the table reallocated.
+                added = np.empty(len(fresh), dtype=LAST_DTYPE)
+                added["i"] = ids[fresh]
+                for name in _FIELDS:
+                    added[name] = cols[name][fresh]
+                self.table = np.concatenate([table, added])
+                self.table.sort(order="i", kind="stable")
+        return out
+
+    def poll(self) -> np.ndarray:
+        """Fetches last prices once, publishes changes if any and returns them."""
+        fetch = self.client.get_stockprices_global_last if self.global_ else self.client.get_stockprices_last
+        changes = self.apply(fetch(self.authKey, as_arrays=True))
+        if len(changes):
+            for callback in list(self._subscribers):
+                callback(changes)
+        return changes
+
+    # --- Background polling ---
+    def start(self, interval: float, on_error: Optional[Callable[[Exception], None]] = None) -> None:
+        """Polls every `interval` seconds on a daemon thread until `stop()`; the first poll is immediate."""
+        if self._thread and self._thread.is_alive():
+            raise RuntimeError("Poller is already running")
+        self._stop.clear()
+
+        def run():
+            while True:
+                try:
+                    self.poll()
+                except Exception as exc:
+                    # A failed poll is retried on the next tick.
+                    self.last_error = exc
+                    if on_error:
+                        on_error(exc)
+                if self._stop.wait(interval):
+                    return
+
+        self._thread = threading.Thread(target=run, name="LastPricePoller", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stops background polling and waits for the current poll to finish."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,244 @@
+"""
+Vectorized portfolio valuation and returns.
+
+Close prices are aligned onto one date index as a dates x instruments matrix
+(`PriceMatrix`, forward-filled). Trades and external cash flows for any number
+of portfolios are plain structured arrays (`TRANSACTION_DTYPE`,
+`CASHFLOW_DTYPE`). `valuate()` turns them into daily NAV, cash, holdings value,
+flows and time-weighted returns per portfolio as whole-matrix operations,
+with one matrix product per run of dates between trades.
+"""
+from typing import Dict, Iterable, Mapping, NamedTuple, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from borsdata_client import BorsdataAPIClient
+    from borsdata_client.arrays import PriceArrays
+    from .pricestore import PriceStore
+
+# A trade: positive quantity buys, negative sells. Cash moves by
+# -(quantity * price) - fee on the trade date.
+TRANSACTION_DTYPE = np.dtype([
+    ("portfolio", "i8"),
+    ("d", "M8[D]"),
+    ("insId", "i8"),
+    ("quantity", "f8"),
+    ("price", "f8"),
+    ("fee", "f8"),
+])
+
+# An external cash flow: positive deposits, negative withdrawals.
+CASHFLOW_DTYPE = np.dtype([
+    ("portfolio", "i8"),
+    ("d", "M8[D]"),
+    ("amount", "f8"),
+])
+
+
+class PriceMatrix(NamedTuple):
+    """Close prices on a common date index; `closes[t, k]` is instrument `ids[k]` on `dates[t]`."""
+    dates: np.ndarray
+    ids: np.ndarray
+    closes: np.ndarray
+
+
+class Valuation(NamedTuple):
+    """Daily per-portfolio series; every array is portfolios x dates, rows in `portfolios` order."""
+    dates: np.ndarray
+    portfolios: np.ndarray
+    nav: np.ndarray
+    holdings: np.ndarray
+    cash: np.ndarray
+    flows: np.ndarray
+    returns: np.ndarray
+    twr: np.ndarray
+
+
+def forward_fill(values: np.ndarray) -> np.ndarray:
+    """Carries the last non-NaN value down each column; leading NaNs stay NaN."""
+    rows = np.where(np.isnan(values), 0, np.arange(len(values))[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return values[rows, np.arange(values.shape[1])]
+
+
+def align_closes(prices: Mapping[int, 'PriceArrays'], dates: Optional[np.ndarray] = None) -> PriceMatrix:
+    """
+    Aligns per-instrument closes onto one date index and forward-fills gaps.
+
+    `prices` maps insId to PriceArrays (or anything with `d` and `c` fields,
+    such as PriceStore records). `dates` defaults to the union of all dates.
+    """
+    ids = np.array(sorted(prices), dtype=np.int64)
+    blocks = [prices[int(i)] for i in ids]
+    if dates is None:
+        dates = np.unique(np.concatenate([np.asarray(b["d"] if isinstance(b, np.ndarray) else b.d, dtype="M8[D]") for b in blocks])) \
+            if blocks else np.empty(0, dtype="M8[D]")
+    dates = np.asarray(dates, dtype="M8[D]")
+    closes = np.full((len(dates), len(ids)), np.nan)
+    for k, block in enumerate(blocks):
+        d, c = (block["d"], block["c"]) if isinstance(block, np.ndarray) else (block.d, block.c)
+        rows = np.searchsorted(dates, d)
+        hit = rows < len(dates)
+        hit[hit] = dates[rows[hit]] == d[hit]
+        closes[rows[hit], k] = c[hit]
+    return PriceMatrix(dates, ids, forward_fill(closes))
+
+
+def load_closes(client: 'BorsdataAPIClient', instruments: Iterable[int], authKey: str, from_date: str = None, to_date: str = None) -> PriceMatrix:
+    """Fetches closes with `get_stockprices_array_batch` and aligns them."""
+    blocks = client.get_stockprices_array_batch(instruments, authKey, from_date, to_date, as_arrays=True)
+    return align_closes({ins_id: block for ins_id, block in blocks.items() if not block.error})
+
+
+def store_closes(store: 'PriceStore', instruments: Iterable[int], start=None, end=None) -> PriceMatrix:
+    """Aligns closes read from a PriceStore."""
+    return align_closes({ins_id: bars for ins_id, bars in store.read_many(instruments, start, end).items() if len(bars)})
+
+
+def _date_rows(dates: np.ndarray, when: np.ndarray) -> np.ndarray:
+    # Events on non-trading days land on the next trading day; after the end, on len(dates).
+    return np.searchsorted(dates, when.astype("M8[D]"), side="left")
+
+
+def _instrument_cols(prices: PriceMatrix, ins_ids: np.ndarray) -> np.ndarray:
+    cols = np.searchsorted(prices.ids, ins_ids)
+    known = cols < len(prices.ids)
+    known[known] = prices.ids[cols[known]] == ins_ids[known]
+    if not known.all():
+        raise ValueError(f"No prices for instruments {sorted(set(ins_ids[~known].tolist()))}")
+    return cols
+
+
+def _positions(prices: PriceMatrix, tx: np.ndarray, port_rows: np.ndarray):
+    """Groups trades into (portfolio, instrument) positions sorted portfolio-major."""
+    cols = _instrument_cols(prices, tx["insId"])
+    keys, inverse = np.unique(port_rows * len(prices.ids) + cols, return_inverse=True)
+    return keys // len(prices.ids), keys % len(prices.ids), inverse
+
+
+def _quantities(T: int, tx: np.ndarray, rows: np.ndarray, inverse: np.ndarray, start: int, stop: int) -> np.ndarray:
+    """Dates x positions[start:stop] quantities held."""
+    m = stop - start
+    sel = (inverse >= start) & (inverse < stop) & (rows < T)
+    qty = np.bincount(rows[sel] * m + (inverse[sel] - start), weights=tx["quantity"][sel], minlength=T * m).reshape(T, m)
+    return np.cumsum(qty, axis=0, out=qty)
+
+
+def _position_values(prices: PriceMatrix, tx: np.ndarray, rows: np.ndarray, pos_cols: np.ndarray, inverse: np.ndarray,
+                     start: int, stop: int) -> np.ndarray:
+    """Dates x positions[start:stop] market values."""
+    qty = _quantities(len(prices.dates), tx, rows, inverse, start, stop)
+    return np.where(qty != 0, qty * prices.closes[:, pos_cols[start:stop]], 0.0)
+
+
+def _holdings(prices: PriceMatrix, tx: np.ndarray, rows: np.ndarray, port_rows: np.ndarray, P: int) -> np.ndarray:
+    """
+    Portfolios x dates market value of all positions.
+
+    Quantities are a dense portfolios x traded-instruments matrix that only
+    changes on trade dates, so each run of dates between trades is valued with
+    one matrix product against the closes of that run.
+    """
+    T = len(prices.dates)
+    holdings = np.zeros((P, T))
+    live = rows < T
+    if not live.any():
+        return holdings
+    tx, rows, port_rows = tx[live], rows[live], port_rows[live]
+    traded, cols = np.unique(_instrument_cols(prices, tx["insId"]), return_inverse=True)
+    closes = prices.closes[:, traded]
+    missing = np.isnan(closes)
+    has_missing = missing.any()
+    closes = np.where(missing, 0.0, closes)
+
+    order = np.argsort(rows, kind="stable")
+    rows, port_rows, cols, qty = rows[order], port_rows[order], cols[order], tx["quantity"][order]
+    starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+    run_rows = np.r_[rows[starts], T]
+    bounds = np.r_[starts, len(rows)]
+
+    held = np.zeros((P, len(traded)))
+    for k in range(len(starts)):
+        lo, hi = bounds[k], bounds[k + 1]
+        np.add.at(held, (port_rows[lo:hi], cols[lo:hi]), qty[lo:hi])
+        first, last = run_rows[k], run_rows[k + 1]
+        holdings[:, first:last] = held @ closes[first:last].T
+        if has_missing:
+            # A held position without a close makes the whole value unknown.
+            unknown = (held != 0).astype(np.float64) @ missing[first:last].T.astype(np.float64)
+            holdings[:, first:last][unknown > 0] = np.nan
+    return holdings
+
+
+def valuate(prices: PriceMatrix, transactions: np.ndarray, cashflows: Optional[np.ndarray] = None,
+            portfolios: Optional[Iterable[int]] = None) -> Valuation:
+    """
+    Values every portfolio on every date of `prices`.
+
+    Positions are marked at the (forward-filled) close; holding an instrument
+    before its first close gives NaN. Trades and flows dated after the last
+    price date are ignored. Daily returns are time-weighted with external
+    flows assumed at the close: r_t = (nav_t - flow_t) / nav_{t-1} - 1, and
+    0 while the previous NAV is not positive.
+    """
+    tx = np.asarray(transactions, dtype=TRANSACTION_DTYPE)
+    cf = np.asarray(cashflows if cashflows is not None else np.empty(0, dtype=CASHFLOW_DTYPE), dtype=CASHFLOW_DTYPE)
+    ports = np.unique(np.concatenate([tx["portfolio"], cf["portfolio"]])) if portfolios is None \
+        else np.unique(np.fromiter(portfolios, dtype=np.int64))
+    tx = tx[np.isin(tx["portfolio"], ports)]
+    cf = cf[np.isin(cf["portfolio"], ports)]
+    P, T = len(ports), len(prices.dates)
+
+    tx_rows = _date_rows(prices.dates, tx["d"])
+    tx_ports = np.searchsorted(ports, tx["portfolio"])
+    cf_rows = _date_rows(prices.dates, cf["d"])
+    cf_ports = np.searchsorted(ports, cf["portfolio"])
+
+    def per_day(port_rows, rows, weights):
+        live = rows < T
+        return np.bincount(port_rows[live] * T + rows[live], weights=weights[live], minlength=P * T).reshape(P, T)
+
+    flows = per_day(cf_ports, cf_rows, cf["amount"])
+    trade_cash = per_day(tx_ports, tx_rows, -(tx["quantity"] * tx["price"]) - tx["fee"])
+    cash = np.cumsum(flows + trade_cash, axis=1)
+
+    holdings = _holdings(prices, tx, tx_rows, tx_ports, P)
+    nav = holdings + cash
+    returns = np.zeros((P, T))
+    if T > 1:
+        prev = nav[:, :-1]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            daily = (nav[:, 1:] - flows[:, 1:]) / prev - 1.0
+        returns[:, 1:] = np.where(prev > 0, daily, 0.0)
+    twr = np.cumprod(1.0 + returns, axis=1) - 1.0
+    return Valuation(prices.dates, ports, nav, holdings, cash, flows, returns, twr)
+
+
+def weights(prices: PriceMatrix, transactions: np.ndarray, portfolio: int, cashflows: Optional[np.ndarray] = None,
+            valuation: Optional[Valuation] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns (insIds, dates x insIds weights) of one portfolio's positions in its NAV.
+
+    Pass an existing `valuation` to reuse its NAV; cash makes up the rest.
+    """
+    tx = np.asarray(transactions, dtype=TRANSACTION_DTYPE)
+    tx = tx[tx["portfolio"] == portfolio]
+    if valuation is None:
+        valuation = valuate(prices, tx, cashflows, portfolios=[portfolio])
+    nav = valuation.nav[int(np.searchsorted(valuation.portfolios, portfolio))]
+    rows = _date_rows(prices.dates, tx["d"])
+    _, pos_cols, inverse = _positions(prices, tx, np.zeros(len(tx), dtype=np.int64))
+    values = _position_values(prices, tx, rows, pos_cols, inverse, 0, len(pos_cols))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return prices.ids[pos_cols], values / nav[:, None]
+
+
+def positions(prices: PriceMatrix, transactions: np.ndarray, portfolio: int) -> Dict[int, np.ndarray]:
+    """Returns each instrument's daily quantity held by one portfolio."""
+    tx = np.asarray(transactions, dtype=TRANSACTION_DTYPE)
+    tx = tx[tx["portfolio"] == portfolio]
+    rows = _date_rows(prices.dates, tx["d"])
+    _, pos_cols, inverse = _positions(prices, tx, np.zeros(len(tx), dtype=np.int64))
+    qty = _quantities(len(prices.dates), tx, rows, inverse, 0, len(pos_cols))
+    return {int(prices.ids[c]): qty[:, k] for k, c in enumerate(pos_cols)}
@@ -0,0 +1,165 @@
+"""
+Incremental, append-only local store of daily stock prices.
+
+Each instrument's history is a flat binary file of fixed-size records
+(`PRICE_DTYPE`) sorted by date, so the last stored date is simply the last
+record, appends never rewrite earlier data, and readers memory-map the file
+and slice it by date without going through pydantic.
+"""
+import datetime as dt
+import os
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from borsdata_client import BorsdataAPIClient
+    from borsdata_client.arrays import PriceArrays
+
+PRICE_DTYPE = np.dtype([
+    ("d", "M8[D]"),
+    ("o", "f8"),
+    ("h", "f8"),
+    ("l", "f8"),
+    ("c", "f8"),
+    ("v", "f8"),
+])
+
+
+def to_day(value) -> np.datetime64:
+    """Converts a date, 'yyyy-MM-dd...' string or datetime64 to datetime64[D]."""
+    if isinstance(value, str):
+        value = value[:10]
+    return np.datetime64(value, "D")
+
+
+def records_from_arrays(arrays: 'PriceArrays') -> np.ndarray:
+    """Packs columnar PriceArrays into a PRICE_DTYPE record array."""
+    out = np.empty(len(arrays.d), dtype=PRICE_DTYPE)
+    for field in PRICE_DTYPE.names:
+        out[field] = getattr(arrays, field)
+    return out
+
+
+class PriceStore:
+    """
+    Directory of per-instrument price files.
+
+    `update()` fetches only the missing tail for each instrument, batching
+    instruments that share the same start date into chunked array requests.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, ins_id: int) -> str:
+        return os.path.join(self.root, f"{int(ins_id)}.prices")
+
+    def instruments(self) -> List[int]:
+        """Returns the ids of all stored instruments."""
+        return sorted(int(name.split(".")[0]) for name in os.listdir(self.root) if name.endswith(".prices"))
+
+    def _record_count(self, path: str) -> int:
+        try:
+            return os.path.getsize(path) // PRICE_DTYPE.itemsize
+        except FileNotFoundError:
+            return 0
+
+    def last_date(self, ins_id: int) -> Optional[np.datetime64]:
+        """Returns the last stored date for an instrument, or None if nothing is stored."""
+        path = self._path(ins_id)
+        count = self._record_count(path)
+        if count == 0:
+            return None
+        with open(path, "rb") as f:
+            f.seek((count - 1) * PRICE_DTYPE.itemsize)
+            return np.frombuffer(f.read(PRICE_DTYPE.itemsize), dtype=PRICE_DTYPE)[0]["d"]
+
+    def last_dates(self, instruments: Optional[Iterable[int]] = None) -> Dict[int, Optional[np.datetime64]]:
+        """Returns the last stored date per instrument."""
+        ids = self.instruments() if instruments is None else instruments
+        return {int(i): self.last_date(i) for i in ids}
+
+    def append(self, ins_id: int, records: np.ndarray) -> int:
+        """
+        Appends records newer than the last stored date. Returns the number appended.
+
+        Records are sorted by date and de-duplicated first; anything at or before
+        the last stored date is ignored, so appends are idempotent.
+        """
+        records = np.asarray(records, dtype=PRICE_DTYPE)
+        if records.size == 0:
+            return 0
+        records = np.sort(records, order="d")
+        keep = np.ones(len(records), dtype=bool)
+        keep[1:] = records["d"][1:] != records["d"][:-1]
+        last = self.last_date(ins_id)
+        if last is not None:
+            keep &= records["d"] > last
+        records = records[keep]
+        if records.size == 0:
+            return 0
+        path = self._path(ins_id)
+        # Drop a torn trailing record left by an interrupted append.
+        count = self._record_count(path)
+        if os.path.exists(path) and os.path.getsize(path) != count * PRICE_DTYPE.itemsize:
+            os.truncate(path, count * PRICE_DTYPE.itemsize)
+        with open(path, "ab") as f:
+            f.write(records.tobytes())
+        return len(records)
+
+    def read(self, ins_id: int, start=None, end=None) -> np.ndarray:
+        """
+        Returns the stored bars for an instrument with start <= d <= end.
+
+        The result is a read-only memory-mapped view; copy it if it must outlive
+        later appends.
+        """
+        path = self._path(ins_id)
+        count = self._record_count(path)
+        if count == 0:
+            return np.empty(0, dtype=PRICE_DTYPE)
+        data = np.memmap(path, dtype=PRICE_DTYPE, mode="r", shape=(count,))
+        dates = data["d"]
+        lo = 0 if start is None else int(np.searchsorted(dates, to_day(start), side="left"))
+        hi = count if end is None else int(np.searchsorted(dates, to_day(end), side="right"))
+        return data[lo:hi]
+
+    def read_many(self, instruments: Iterable[int], start=None, end=None) -> Dict[int, np.ndarray]:
+        """Returns `read()` for each instrument."""
+        return {int(i): self.read(i, start, end) for i in instruments}
+
+    def update(self, client: 'BorsdataAPIClient', instruments: Iterable[int], authKey: str, start=None, until=None) -> Dict[int, int]:
+        """
+        Fetches and appends the missing tail of each instrument's history.
+
+        Instruments with no stored data are fetched from `start` (or the API
+        default when None). Bars after `until` are not stored; it defaults to
+        yesterday so an unfinished trading day is never frozen into the store.
+        Returns the number of bars appended per instrument.
+        """
+        until = to_day(until) if until is not None else np.datetime64(dt.date.today(), "D") - 1
+        groups = defaultdict(list)
+        for ins_id in dict.fromkeys(int(i) for i in instruments):
+            last = self.last_date(ins_id)
+            if last is not None and last >= until:
+                continue
+            from_day = last + 1 if last is not None else (to_day(start) if start is not None else None)
+            groups[from_day].append(ins_id)
+
+        appended = {}
+        for from_day, ids in groups.items():
+            resp = client.get_stockprices_array_batch(
+                ids, authKey,
+                from_date=str(from_day) if from_day is not None else None,
+                to_date=str(until),
+                as_arrays=True,
+            )
+            for ins_id, block in resp.items():
+                if block.error or len(block) == 0:
+                    continue
+                records = records_from_arrays(block)
+                appended[ins_id] = self.append(ins_id, records[records["d"] <= until])
+        return appended
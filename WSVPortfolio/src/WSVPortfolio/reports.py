@@ -0,0 +1,172 @@
+"""
+Full-depth reports backfill into columnar tables.
+
+`/v1/instruments/reports` returns year, R12 and quarter reports for up to 50
+instruments per call, up to 20 years (`maxYearCount`) and 40 R12/quarter
+reports (`maxR12QCount`) deep. `ReportStore` flattens those responses into
+one table per report type, keyed and sorted by (insId, year, period), and
+saves them with `save_table()`.
+
+`backfill()` fetches full depth for the whole universe. `update()` only asks
+each instrument for the periods after its last stored report, and merges
+the result: new keys are added and re-reported periods replace the stored
+row.
+"""
+import datetime as dt
+import os
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from .holdings import Table, flatten, load_table, save_table
+
+if TYPE_CHECKING:
+    from borsdata_client import BorsdataAPIClient
+
+MAX_YEAR_COUNT = 20
+MAX_R12Q_COUNT = 40
+
+KEY_COLUMNS = ("insId", "year", "period")
+
+REPORT_COLUMNS = {
+    "insId": "i8", "year": "i8", "period": "i8",
+    **{name: "f8" for name in (
+        "revenues", "gross_Income", "operating_Income", "profit_Before_Tax", "profit_To_Equity_Holders",
+        "earnings_Per_Share", "number_Of_Shares", "dividend", "intangible_Assets", "tangible_Assets",
+        "financial_Assets", "non_Current_Assets", "cash_And_Equivalents", "current_Assets", "total_Assets",
+        "total_Equity", "non_Current_Liabilities", "current_Liabilities", "total_Liabilities_And_Equity",
+        "net_Debt", "cash_Flow_From_Operating_Activities", "cash_Flow_From_Investing_Activities",
+        "cash_Flow_From_Financing_Activities", "cash_Flow_For_The_Year", "free_Cash_Flow",
+        "stock_Price_Average", "stock_Price_High", "stock_Price_Low", "currency_Ratio", "net_Sales",
+    )},
+    "report_Start_Date": "M8[D]", "report_End_Date": "M8[D]", "report_Date": "M8[D]",
+    "broken_Fiscal_Year": "?",  # None reads as False
+    "currency": "U",
+}
+
+# Report type -> ReportsCombineRespV1 field.
+REPORT_LISTS = {"year": "reportsYear", "r12": "reportsR12", "quarter": "reportsQuarter"}
+
+
+def report_tables(items: Iterable) -> Dict[str, Table]:
+    """Flattens ReportsCombineRespV1 items into one table per report type, sorted by key."""
+    items = list(items)
+    tables = {}
+    for reporttype, field in REPORT_LISTS.items():
+        tables[reporttype] = _sorted_unique(flatten(items, REPORT_COLUMNS, values=field, key="instrument"))
+    return tables
+
+
+def _sorted_unique(table: Table) -> Table:
+    """Sorts by (insId, year, period), keeping the last row of each key."""
+    n = len(table["insId"])
+    if n == 0:
+        return table
+    order = np.lexsort((np.arange(n), table["period"], table["year"], table["insId"]))
+    ins, year, period = (table[k][order] for k in KEY_COLUMNS)
+    last = np.ones(n, dtype=bool)
+    last[:-1] = (ins[1:] != ins[:-1]) | (year[1:] != year[:-1]) | (period[1:] != period[:-1])
+    keep = order[last]
+    return {name: column[keep] for name, column in table.items()}
+
+
+def _key_codes(table: Table) -> np.ndarray:
+    return (table["insId"] * 10_000 + table["year"]) * 100 + table["period"]
+
+
+def merge_tables(old: Table, new: Table) -> Tuple[Table, int]:
+    """
+    Merges `new` rows into `old`; rows of `new` replace stored rows with the
+    same key. Returns the merged table and the number of keys added.
+    """
+    if not len(old.get("insId", ())):
+        return new, len(new["insId"])
+    added = int(np.count_nonzero(~np.isin(_key_codes(new), _key_codes(old))))
+    merged = {}
+    for name, column in new.items():
+        old_column = old[name]
+        if column.dtype.kind == "U" and old_column.dtype != column.dtype:
+            width = max(column.dtype.itemsize, old_column.dtype.itemsize) // 4
+            column, old_column = column.astype(f"U{width}"), old_column.astype(f"U{width}")
+        merged[name] = np.concatenate([old_column, column])
+    return _sorted_unique(merged), added
+
+
+class ReportStore:
+    """Directory holding `year.npz`, `r12.npz` and `quarter.npz` report tables."""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, reporttype: str) -> str:
+        return os.path.join(self.root, f"{reporttype}.npz")
+
+    def read(self, reporttype: str) -> Table:
+        """Returns a report table; empty columns if nothing is stored yet."""
+        path = self._path(reporttype)
+        if not os.path.exists(path):
+            return report_tables([])[reporttype]
+        return load_table(path)
+
+    def last_periods(self, reporttype: str) -> Dict[int, Tuple[int, int]]:
+        """Returns the latest stored (year, period) per instrument."""
+        table = self.read(reporttype)
+        ins = table["insId"]
+        if not len(ins):
+            return {}
+        last = np.ones(len(ins), dtype=bool)
+        last[:-1] = ins[1:] != ins[:-1]
+        return {int(i): (int(y), int(p)) for i, y, p in zip(ins[last], table["year"][last], table["period"][last])}
+
+    def _merge(self, items: Iterable) -> Dict[str, int]:
+        added = {}
+        for reporttype, table in report_tables(items).items():
+            merged, added[reporttype] = merge_tables(self.read(reporttype), table)
+            save_table(self._path(reporttype), merged)
+        return added
+
+    def backfill(self, client: 'BorsdataAPIClient', instruments: Iterable[int], authKey: str,
+                 max_workers: Optional[int] = None, original: Optional[bool] = None) -> Dict[str, int]:
+        """Fetches full-depth reports for every instrument and merges them. Returns keys added per report type."""
+        return self._fetch_and_merge(client, {(MAX_YEAR_COUNT, MAX_R12Q_COUNT): list(instruments)}, authKey, max_workers, original)
+
+    def update(self, client: 'BorsdataAPIClient', instruments: Iterable[int], authKey: str, today=None,
+               max_workers: Optional[int] = None, original: Optional[bool] = None) -> Dict[str, int]:
+        """
+        Fetches only the reports after each instrument's last stored period.
+
+        The last stored period is fetched again so restatements replace it.
+        Depths are rounded up to a few sizes so instruments share requests;
+        instruments with nothing stored get full depth. Returns keys added per
+        report type.
+        """
+        today = today or dt.date.today()
+        year_now, quarter_now = today.year, (today.month - 1) // 3 + 1
+        last_year = self.last_periods("year")
+        last_quarter = self.last_periods("quarter")
+        groups = defaultdict(list)
+        for ins_id in dict.fromkeys(int(i) for i in instruments):
+            year_count = _depth(year_now - last_year[ins_id][0] + 1, MAX_YEAR_COUNT) if ins_id in last_year else MAX_YEAR_COUNT
+            if ins_id in last_quarter:
+                year, period = last_quarter[ins_id]
+                r12q_count = _depth((year_now - year) * 4 + (quarter_now - period) + 1, MAX_R12Q_COUNT)
+            else:
+                r12q_count = MAX_R12Q_COUNT
+            groups[(year_count, r12q_count)].append(ins_id)
+        return self._fetch_and_merge(client, groups, authKey, max_workers, original)
+
+    def _fetch_and_merge(self, client, groups, authKey, max_workers, original) -> Dict[str, int]:
+        client = client.with_validation(False)
+        items = []
+        for (year_count, r12q_count), ids in groups.items():
+            resp = client.get_reports_array_batch(ids, authKey, max_workers=max_workers, maxYearCount=year_count,
+                                                  maxR12QCount=r12q_count, original=original)
+            items.extend(resp.reportList or [])
+        return self._merge(items)
+
+
+def _depth(count: int, maximum: int) -> int:
+    """Rounds a report count up to the next power of two, capped at `maximum`."""
+    return min(maximum, 1 << max(0, int(count) - 1).bit_length())
@@ -0,0 +1,251 @@
+"""
+Parallel risk analytics over a shared-memory returns matrix.
+
+`RiskEngine` computes daily returns from a `PriceMatrix` once and places the
+dates x instruments matrix in a `multiprocessing.shared_memory` block. Pool
+workers attach to that block by name on their first task and keep it mapped;
+they never receive a copy. Each task writes its part of the result (a column
+block of rolling volatility, a tile of the covariance matrix, a block of
+betas) straight into a shared output block, which the parent copies out once.
+
+Missing returns (NaN) are skipped pairwise. The covariance of two instruments
+uses only the dates where both have a return, computed for a whole tile with
+a few matrix products.
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .portfolio import PriceMatrix
+
+TRADING_DAYS = 252
+BLOCK_SIZE = 256
+
+# Block key -> (SharedMemory, array view) attached in this process.
+_attached: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+
+def returns(prices: PriceMatrix, log: bool = False) -> np.ndarray:
+    """Dates x instruments daily returns; the first row and gaps in the closes are NaN."""
+    closes = prices.closes
+    out = np.full(closes.shape, np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = closes[1:] / closes[:-1]
+        out[1:] = np.log(ratio) if log else ratio - 1.0
+    return out
+
+
+def _open(name: str) -> shared_memory.SharedMemory:
+    try:
+        # Only the creating process may unlink the block.
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        return shared_memory.SharedMemory(name=name)
+
+
+def _attach(specs: Dict[str, Tuple[str, tuple]]) -> None:
+    """Maps the named shared blocks into this process, dropping blocks no longer in use."""
+    for key in list(_attached):
+        if key not in specs or _attached[key][0].name != specs[key][0]:
+            shm, _ = _attached.pop(key)
+            shm.close()
+    for key, (name, shape) in specs.items():
+        if key not in _attached:
+            shm = _open(name)
+            _attached[key] = (shm, np.ndarray(shape, dtype=np.float64, buffer=shm.buf))
+
+
+def _array(key: str) -> np.ndarray:
+    return _attached[key][1]
+
+
+def _call(specs: Dict[str, Tuple[str, tuple]], fn, *args) -> None:
+    _attach(specs)
+    fn(*args)
+
+
+def _rolling_block(lo: int, hi: int, window: int, min_periods: int, scale: float) -> None:
+    """Rolling standard deviation of columns lo:hi into the "vol" block."""
+    x = _array("returns")[:, lo:hi]
+    valid = ~np.isnan(x)
+    # Centre each column first; running sums of raw values cancel badly in b - a*a/n
+    # once the history is long or the returns sit far from zero.
+    count = valid.sum(axis=0)
+    centre = np.where(count > 0, np.where(valid, x, 0.0).sum(axis=0) / np.maximum(count, 1), 0.0)
+    x0 = np.where(valid, x - centre, 0.0)
+    zero = np.zeros((1, hi - lo))
+    s1 = np.concatenate([zero, np.cumsum(x0, axis=0)])
+    s2 = np.concatenate([zero, np.cumsum(x0 * x0, axis=0)])
+    cn = np.concatenate([zero, np.cumsum(valid, axis=0, dtype=np.float64)])
+    first = np.maximum(np.arange(1, len(x) + 1) - window, 0)
+    end = np.arange(1, len(x) + 1)
+    n, a, b = cn[end] - cn[first], s1[end] - s1[first], s2[end] - s2[first]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = np.maximum(b - a * a / n, 0.0) / (n - 1)
+    _array("vol")[:, lo:hi] = np.where(n >= max(min_periods, 2), np.sqrt(var) * scale, np.nan)
+
+
+def _pairwise(xa: np.ndarray, xb: np.ndarray, min_periods: int):
+    """Pairwise-complete covariance of columns of xa with columns of xb, and each side's variance over the same dates."""
+    ma, mb = ~np.isnan(xa), ~np.isnan(xb)
+    a0, b0 = np.where(ma, xa, 0.0), np.where(mb, xb, 0.0)
+    ma, mb = ma.astype(np.float64), mb.astype(np.float64)
+    n = ma.T @ mb
+    sa, sb = a0.T @ mb, ma.T @ b0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = (a0.T @ b0 - sa * sb / n) / (n - 1)
+        var_a = ((a0 * a0).T @ mb - sa * sa / n) / (n - 1)
+        var_b = (ma.T @ (b0 * b0) - sb * sb / n) / (n - 1)
+    short = n < max(min_periods, 2)
+    cov[short] = np.nan
+    return cov, var_a, var_b
+
+
+def _cov_tile(a: Tuple[int, int], b: Tuple[int, int], start: int, min_periods: int) -> None:
+    """Covariance and correlation of column blocks a x b into the "cov"/"corr" blocks, mirrored."""
+    x = _array("returns")[start:]
+    cov, var_a, var_b = _pairwise(x[:, a[0]:a[1]], x[:, b[0]:b[1]], min_periods)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = np.clip(cov / np.sqrt(var_a * var_b), -1.0, 1.0)
+    for key, tile in (("cov", cov), ("corr", corr)):
+        out = _array(key)
+        out[a[0]:a[1], b[0]:b[1]] = tile
+        out[b[0]:b[1], a[0]:a[1]] = tile.T
+
+
+def _beta_block(lo: int, hi: int, index_cols: List[int], start: int, min_periods: int) -> None:
+    """Betas of columns lo:hi against the index columns into the "beta" block."""
+    x = _array("returns")[start:]
+    cov, _, var_index = _pairwise(x[:, lo:hi], x[:, index_cols], min_periods)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        _array("beta")[lo:hi] = cov / var_index
+
+
+def _blocks(n: int, size: int) -> List[Tuple[int, int]]:
+    return [(lo, min(lo + size, n)) for lo in range(0, n, size)]
+
+
+class RiskEngine:
+    """
+    Rolling volatility, covariance, correlation and betas of one PriceMatrix.
+
+    Outputs are plain arrays aligned with `prices.ids` (and `prices.dates` for
+    rolling series). `returns` is a copy, so no caller ever holds a view of
+    shared memory. Use as a context manager, or call `close()`, to stop the
+    pool and free the shared memory.
+    """
+
+    def __init__(self, prices: PriceMatrix, max_workers: Optional[int] = None, log: bool = False,
+                 block_size: int = BLOCK_SIZE):
+        self.dates = prices.dates
+        self.ids = np.asarray(prices.ids)
+        self.max_workers = max_workers
+        self.block_size = block_size
+        self._blocks: Dict[str, shared_memory.SharedMemory] = {}
+        self._shapes: Dict[str, tuple] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._returns = self._share("returns", returns(prices, log))
+
+    def __enter__(self) -> 'RiskEngine':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stops the pool and frees the shared memory; safe to call more than once."""
+        if self._pool:
+            self._pool.shutdown()
+            self._pool = None
+        # Views into a block must be released before it can be closed.
+        self._returns = None
+        for shm in self._blocks.values():
+            shm.close()
+            shm.unlink()
+        self._blocks.clear()
+
+    def _check_open(self) -> np.ndarray:
+        if self._returns is None:
+            raise ValueError("RiskEngine is closed")
+        return self._returns
+
+    @property
+    def returns(self) -> np.ndarray:
+        """Dates x instruments returns the engine works on, as a copy."""
+        return self._check_open().copy()
+
+    def _share(self, key: str, source: Optional[np.ndarray] = None, shape: tuple = None) -> np.ndarray:
+        shape = source.shape if source is not None else shape
+        shm = shared_memory.SharedMemory(create=True, size=max(1, math.prod(shape) * 8))
+        self._blocks[key], self._shapes[key] = shm, shape
+        array = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        if source is not None:
+            array[...] = source
+        else:
+            array.fill(np.nan)
+        return array
+
+    def _run(self, outputs: Dict[str, tuple], fn, tasks: Iterable[tuple]) -> Dict[str, np.ndarray]:
+        """Runs fn over tasks in the pool and returns copies of the output blocks."""
+        arrays = {key: self._share(key, shape=shape) for key, shape in outputs.items()}
+        specs = {key: (self._blocks[key].name, self._shapes[key]) for key in self._blocks}
+        try:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            for future in [self._pool.submit(_call, specs, fn, *task) for task in tasks]:
+                future.result()
+            return {key: array.copy() for key, array in arrays.items()}
+        finally:
+            del arrays
+            for key in outputs:
+                shm = self._blocks.pop(key)
+                del self._shapes[key]
+                shm.close()
+                shm.unlink()
+
+    def rolling_volatility(self, window: int = 20, min_periods: Optional[int] = None,
+                           annualize: Optional[int] = TRADING_DAYS) -> np.ndarray:
+        """Dates x instruments standard deviation of returns over the trailing `window` dates."""
+        scale = math.sqrt(annualize) if annualize else 1.0
+        T, N = self._check_open().shape
+        tasks = [(lo, hi, window, min_periods or window, scale) for lo, hi in _blocks(N, self.block_size)]
+        return self._run({"vol": (T, N)}, _rolling_block, tasks)["vol"]
+
+    def covariance(self, window: Optional[int] = None, min_periods: int = 2) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (covariance, correlation), both instruments x instruments, over
+        the last `window` dates (all dates by default). Pairs with fewer than
+        `min_periods` common returns are NaN.
+        """
+        T, N = self._check_open().shape
+        start = max(T - window, 0) if window else 0
+        blocks = _blocks(N, self.block_size)
+        tasks = [(a, b, start, min_periods) for i, a in enumerate(blocks) for b in blocks[i:]]
+        out = self._run({"cov": (N, N), "corr": (N, N)}, _cov_tile, tasks)
+        return out["cov"], out["corr"]
+
+    def correlation(self, window: Optional[int] = None, min_periods: int = 2) -> np.ndarray:
+        """Instruments x instruments correlation; see `covariance()`."""
+        return self.covariance(window, min_periods)[1]
+
+    def betas(self, index_ids: Iterable[int], window: Optional[int] = None, min_periods: int = 2) -> np.ndarray:
+        """
+        Instruments x indexes betas, cov(r_i, r_index) / var(r_index) over the
+        last `window` dates, columns in `index_ids` order.
+
+        Index ids come from `InstrumentUniverse.index_instruments()` and must
+        be columns of the price matrix.
+        """
+        index_ids = np.fromiter(index_ids, dtype=np.int64)
+        cols = np.searchsorted(self.ids, index_ids)
+        known = cols < len(self.ids)
+        known[known] = self.ids[cols[known]] == index_ids[known]
+        if not known.all():
+            raise ValueError(f"No prices for index instruments {index_ids[~known].tolist()}")
+        T, N = self._check_open().shape
+        start = max(T - window, 0) if window else 0
+        tasks = [(lo, hi, cols.tolist(), start, min_periods) for lo, hi in _blocks(N, self.block_size)]
+        return self._run({"beta": (N, len(cols))}, _beta_block, tasks)["beta"]
@@ -0,0 +1,301 @@
+"""
+KPI screener over a cached instrument x KPI matrix.
+
+Screens are written as small expression trees over `Kpi(kpiId, calcGroup,
+calc)` leaves:
+
+    pe, roe = Kpi(2), Kpi(33, "1year", "mean")
+    result = screener.screen(where=(pe > 0) & (pe < 15) & (roe.percentile() >= 80),
+                             order_by=roe, ascending=False, limit=20, select=[pe, roe])
+
+Only the KPI columns an expression refers to are fetched, concurrently, with
+`get_kpi_calc_alt`. Each column is scattered into a dense float matrix (NaN
+where an instrument has no value) and kept between screens until
+`get_kpis_updated` reports a new calculation time. Expressions evaluate as
+whole-column NumPy operations.
+"""
+import operator
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from borsdata_client import BorsdataAPIClient
+
+ColumnKey = Tuple[int, str, str]
+
+
+class Expr(ABC):
+    """Node of a screen expression; evaluates to one value per instrument row."""
+
+    @abstractmethod
+    def keys(self) -> Iterable[ColumnKey]:
+        """The KPI columns this node reads."""
+
+    @abstractmethod
+    def evaluate(self, column: Callable[[ColumnKey], np.ndarray]) -> np.ndarray:
+        """Evaluates the node, reading KPI columns through `column(key)`."""
+
+    def _binary(self, other, op, label) -> 'Expr':
+        return _Op(op, label, self, other if isinstance(other, Expr) else _Const(other))
+
+    def _rbinary(self, other, op, label) -> 'Expr':
+        return _Op(op, label, _Const(other), self)
+
+    def __lt__(self, other): return self._binary(other, operator.lt, "<")
+    def __le__(self, other): return self._binary(other, operator.le, "<=")
+    def __gt__(self, other): return self._binary(other, operator.gt, ">")
+    def __ge__(self, other): return self._binary(other, operator.ge, ">=")
+    def __eq__(self, other): return self._binary(other, operator.eq, "==")  # type: ignore[override]
+    def __ne__(self, other): return self._binary(other, operator.ne, "!=")  # type: ignore[override]
+    def __and__(self, other): return self._binary(other, operator.and_, "&")
+    def __or__(self, other): return self._binary(other, operator.or_, "|")
+    def __add__(self, other): return self._binary(other, operator.add, "+")
+    def __sub__(self, other): return self._binary(other, operator.sub, "-")
+    def __mul__(self, other): return self._binary(other, operator.mul, "*")
+    def __truediv__(self, other): return self._binary(other, operator.truediv, "/")
+    def __radd__(self, other): return self._rbinary(other, operator.add, "+")
+    def __rsub__(self, other): return self._rbinary(other, operator.sub, "-")
+    def __rmul__(self, other): return self._rbinary(other, operator.mul, "*")
+    def __rtruediv__(self, other): return self._rbinary(other, operator.truediv, "/")
+
+    def __invert__(self) -> 'Expr':
+        return _Func(operator.invert, "~", self)
+
+    def __neg__(self) -> 'Expr':
+        return _Func(operator.neg, "-", self)
+
+    __hash__ = object.__hash__
+
+    def isna(self) -> 'Expr':
+        """True where the value is missing."""
+        return _Func(np.isnan, "isna", self)
+
+    def notna(self) -> 'Expr':
+        """True where the value is present."""
+        return ~self.isna()
+
+    def rank(self, ascending: bool = True) -> 'Expr':
+        """1-based rank among instruments with a value (ties share the lowest rank); NaN stays NaN."""
+        return _Func(lambda v: rank(v, ascending), "rank" if ascending else "rank_desc", self)
+
+    def percentile(self) -> 'Expr':
+        """Percentile (0-100] of the value among instruments with a value; NaN stays NaN."""
+        return _Func(percentile, "percentile", self)
+
+
+class Kpi(Expr):
+    """Leaf referring to one `get_kpi_calc_alt(kpiId, calcGroup, calc)` column."""
+
+    def __init__(self, kpiId: int, calcGroup: str = "last", calc: str = "latest"):
+        self.key: ColumnKey = (int(kpiId), calcGroup, calc)
+
+    def keys(self) -> Iterable[ColumnKey]:
+        return (self.key,)
+
+    def evaluate(self, column):
+        return column(self.key)
+
+    def __repr__(self) -> str:
+        return "Kpi(%d, %r, %r)" % self.key
+
+
+class _Const(Expr):
+    def __init__(self, value):
+        self.value = value
+
+    def keys(self):
+        return ()
+
+    def evaluate(self, column):
+        return self.value
+
+    def __repr__(self) -> str:
+        return repr(self.value)
+
+
+class _Op(Expr):
+    def __init__(self, op, label: str, left: Expr, right: Expr):
+        self.op, self.label, self.left, self.right = op, label, left, right
+
+    def keys(self):
+        return (*self.left.keys(), *self.right.keys())
+
+    def evaluate(self, column):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.op(self.left.evaluate(column), self.right.evaluate(column))
+
+    def __repr__(self) -> str:
+        return f"({self.left!r} {self.label} {self.right!r})"
+
+
+class _Func(Expr):
+    def __init__(self, fn, label: str, arg: Expr):
+        self.fn, self.label, self.arg = fn, label, arg
+
+    def keys(self):
+        return self.arg.keys()
+
+    def evaluate(self, column):
+        return self.fn(self.arg.evaluate(column))
+
+    def __repr__(self) -> str:
+        return f"{self.label}({self.arg!r})"
+
+
+def rank(values: np.ndarray, ascending: bool = True) -> np.ndarray:
+    """Min-method 1-based rank of the non-NaN entries of `values`; NaN entries stay NaN."""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    valid = ~np.isnan(values)
+    present = values[valid] if ascending else -values[valid]
+    ordered = np.sort(present)
+    out[valid] = np.searchsorted(ordered, present, side="left") + 1
+    return out
+
+
+def percentile(values: np.ndarray) -> np.ndarray:
+    """Share (in percent) of non-NaN entries less than or equal to each entry; NaN stays NaN."""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    valid = ~np.isnan(values)
+    present = values[valid]
+    if present.size:
+        ordered = np.sort(present)
+        out[valid] = np.searchsorted(ordered, present, side="right") * (100.0 / present.size)
+    return out
+
+
+class ScreenResult(NamedTuple):
+    """Instruments passing a screen, in result order, with the selected columns."""
+    ids: np.ndarray
+    values: np.ndarray  # len(ids) x len(columns)
+    columns: List[str]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class KpiScreener:
+    """
+    Screens instruments on cached KPI columns.
+
+    `ids` fixes the instrument rows up front (e.g. `InstrumentUniverse.ids`);
+    without it, rows grow to the union of instruments seen in fetched columns.
+    The matrix is `self.values` (rows x columns) with `self.mask` flagging the
+    cells that hold a value.
+    """
+
+    def __init__(self, client: 'BorsdataAPIClient', ids: Optional[Iterable[int]] = None, include_global: bool = False,
+                 max_workers: Optional[int] = None):
+        self.client = client
+        self.include_global = include_global
+        self.max_workers = max_workers or getattr(client, "max_workers", 8)
+        self.fixed_rows = ids is not None
+        self.ids = np.unique(np.fromiter(ids, dtype=np.int64)) if ids is not None else np.empty(0, dtype=np.int64)
+        self.columns: Dict[ColumnKey, int] = {}
+        self.values = np.empty((len(self.ids), 0))
+        self.calc_updated: Optional[str] = None
+
+    @property
+    def mask(self) -> np.ndarray:
+        return ~np.isnan(self.values)
+
+    # --- Column cache ---
+    def check_updated(self) -> bool:
+        """Drops all cached columns if `get_kpis_updated` reports a new calculation; returns True if dropped."""
+        updated = self.client.get_kpis_updated().kpisCalcUpdated
+        stale = updated != self.calc_updated and bool(self.columns)
+        if stale:
+            self.invalidate()
+        self.calc_updated = updated
+        return stale
+
+    def invalidate(self) -> None:
+        """Drops all cached columns."""
+        self.columns = {}
+        self.values = np.empty((len(self.ids), 0))
+
+    def _fetch_column(self, key: ColumnKey) -> Tuple[np.ndarray, np.ndarray]:
+        kpi_id, calc_group, calc = key
+        responses = [self.client.get_kpi_calc_alt(kpi_id, calc_group, calc)]
+        if self.include_global:
+            responses.append(self.client.get_kpi_calc_global(kpi_id, calc_group, calc))
+        rows = [row for resp in responses for row in resp.values or []]
+        ids = np.fromiter((row.i for row in rows), dtype=np.int64, count=len(rows))
+        values = np.fromiter((np.nan if row.n is None else row.n for row in rows), dtype=np.float64, count=len(rows))
+        return ids, values
+
+    def _grow_rows(self, ids: np.ndarray) -> None:
+        new_ids = np.union1d(self.ids, ids)
+        if len(new_ids) == len(self.ids):
+            return
+        values = np.full((len(new_ids), self.values.shape[1]), np.nan)
+        values[np.searchsorted(new_ids, self.ids)] = self.values
+        self.ids, self.values = new_ids, values
+
+    def load(self, keys: Iterable[ColumnKey]) -> None:
+        """Fetches the given columns that are not cached yet, concurrently, into the matrix."""
+        missing = list(dict.fromkeys(k for k in keys if k not in self.columns))
+        if not missing:
+            return
+        if len(missing) == 1:
+            fetched = [self._fetch_column(missing[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as pool:
+                fetched = list(pool.map(self._fetch_column, missing))
+        if not self.fixed_rows:
+            self._grow_rows(np.concatenate([ids for ids, _ in fetched]))
+        block = np.full((len(self.ids), len(missing)), np.nan)
+        for j, (ids, values) in enumerate(fetched):
+            if not len(self.ids):
+                break
+            pos = np.minimum(np.searchsorted(self.ids, ids), len(self.ids) - 1)
+            hit = self.ids[pos] == ids
+            block[pos[hit], j] = values[hit]
+        start = self.values.shape[1]
+        self.values = np.hstack([self.values, block])
+        for j, key in enumerate(missing):
+            self.columns[key] = start + j
+
+    def column(self, key: ColumnKey) -> np.ndarray:
+        """Returns one cached column aligned with `self.ids`, fetching it if needed."""
+        self.load([key])
+        return self.values[:, self.columns[key]]
+
+    # --- Queries ---
+    def evaluate(self, expr: Expr, check_updated: bool = True) -> np.ndarray:
+        """Evaluates an expression to one value per row of `self.ids`."""
+        self._prepare([expr], check_updated)
+        result = expr.evaluate(self.column)
+        return np.broadcast_to(result, self.ids.shape)
+
+    def screen(self, where: Optional[Expr] = None, order_by: Optional[Expr] = None, ascending: bool = True,
+               limit: Optional[int] = None, select: Sequence[Expr] = (), check_updated: bool = True) -> ScreenResult:
+        """
+        Filters rows on `where`, sorts by `order_by` (missing values last) and
+        returns the first `limit` ids with the `select` expressions evaluated.
+        """
+        exprs = [e for e in (where, order_by, *select) if e is not None]
+        self._prepare(exprs, check_updated)
+        rows = np.arange(len(self.ids))
+        if where is not None:
+            keep = np.broadcast_to(where.evaluate(self.column), self.ids.shape)
+            rows = rows[keep.astype(bool)]
+        if order_by is not None:
+            key = np.broadcast_to(order_by.evaluate(self.column), self.ids.shape)[rows].astype(np.float64)
+            key = key if ascending else -key
+            rows = rows[np.argsort(key, kind="stable")]  # NaN sorts last
+        if limit is not None:
+            rows = rows[:limit]
+        values = np.empty((len(rows), len(select)))
+        for j, expr in enumerate(select):
+            values[:, j] = np.broadcast_to(expr.evaluate(self.column), self.ids.shape)[rows]
+        return ScreenResult(self.ids[rows], values, [repr(e) for e in select])
+
+    def _prepare(self, exprs: Sequence[Expr], check_updated: bool) -> None:
+        if check_updated:
+            self.check_updated()
+        self.load(key for expr in exprs for key in expr.keys())
@@ -0,0 +1,203 @@
+"""
+Indexed instrument universe.
+
+Loads the instrument lists and the market/sector/branch/country metadata once
+and builds hash indexes on top: ticker, ISIN and Yahoo symbol to insId, and
+sector, branch, market and country id to arrays of insIds. Lookups are dict
+hits; resolving thousands of tickers is one pass over the input.
+"""
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from borsdata_client import BorsdataAPIClient
+    from borsdata_client.models import InstrumentV1, MarketV1, SectorV1, BranchV1, CountryV1
+
+# Placeholder id for unresolved lookups and missing group ids.
+MISSING = -1
+
+_GROUPS = {
+    "sector": "sectorId",
+    "branch": "branchId",
+    "market": "marketId",
+    "country": "countryId",
+}
+
+
+def _norm(key: Optional[str]) -> Optional[str]:
+    return key.strip().upper() if key else None
+
+
+class InstrumentUniverse:
+    """
+    Instruments and their metadata with O(1) lookups.
+
+    Ticker, ISIN and Yahoo lookups are case-insensitive. When global
+    instruments are included, Nordic instruments win ticker collisions.
+    """
+
+    def __init__(self, instruments: Iterable['InstrumentV1'], markets: Iterable['MarketV1'] = (), sectors: Iterable['SectorV1'] = (),
+                 branches: Iterable['BranchV1'] = (), countries: Iterable['CountryV1'] = (), include_global: bool = False):
+        self.include_global = include_global
+        self.markets: Dict[int, 'MarketV1'] = {m.id: m for m in markets}
+        self.sectors: Dict[int, 'SectorV1'] = {s.id: s for s in sectors}
+        self.branches: Dict[int, 'BranchV1'] = {b.id: b for b in branches}
+        self.countries: Dict[int, 'CountryV1'] = {c.id: c for c in countries}
+        self.instruments: Dict[int, 'InstrumentV1'] = {}
+        self.updated_at: Dict[int, Optional[str]] = {}
+        self._by_ticker: Dict[str, int] = {}
+        self._by_isin: Dict[str, int] = {}
+        self._by_yahoo: Dict[str, int] = {}
+        # Other instruments sharing an indexed key, in load order, promoted when the owner goes.
+        self._shadowed: Dict[Tuple[str, str], List[int]] = {}
+        self._groups: Optional[Dict[str, Dict[int, np.ndarray]]] = None
+        self._set_instruments(instruments)
+
+    @classmethod
+    def load(cls, client: 'BorsdataAPIClient', authKey: str, include_global: bool = False) -> 'InstrumentUniverse':
+        """Fetches instruments and metadata and builds the indexes."""
+        instruments = list(client.get_instruments(authKey).instruments or [])
+        if include_global:
+            instruments += client.get_instruments_global(authKey).instruments or []
+        universe = cls(
+            instruments,
+            markets=client.get_markets().markets or [],
+            sectors=client.get_sectors().sectors or [],
+            branches=client.get_branches().branches or [],
+            countries=client.get_countries().countries or [],
+            include_global=include_global,
+        )
+        universe.updated_at = {u.insId: u.updatedAt for u in client.get_instruments_updated(authKey).instruments or []}
+        return universe
+
+    def _set_instruments(self, instruments: Iterable['InstrumentV1']) -> None:
+        for ins in instruments:
+            if ins.insId in self.instruments:
+                continue
+            self._index(ins)
+
+    def _keys(self, ins: 'InstrumentV1') -> Iterator[Tuple[str, Dict[str, int], str]]:
+        for kind, index, key in (("ticker", self._by_ticker, ins.ticker), ("isin", self._by_isin, ins.isin),
+                                 ("yahoo", self._by_yahoo, ins.yahoo)):
+            key = _norm(key)
+            if key is not None:
+                yield kind, index, key
+
+    def _index(self, ins: 'InstrumentV1') -> None:
+        self.instruments[ins.insId] = ins
+        for kind, index, key in self._keys(ins):
+            if index.setdefault(key, ins.insId) != ins.insId:
+                self._shadowed.setdefault((kind, key), []).append(ins.insId)
+        self._groups = None
+
+    def _unindex(self, ins: 'InstrumentV1') -> None:
+        del self.instruments[ins.insId]
+        for kind, index, key in self._keys(ins):
+            shadowed = self._shadowed.get((kind, key))
+            if index.get(key) == ins.insId:
+                if shadowed:
+                    index[key] = shadowed.pop(0)
+                else:
+                    del index[key]
+            elif shadowed and ins.insId in shadowed:
+                shadowed.remove(ins.insId)
+            if shadowed is not None and not shadowed:
+                del self._shadowed[(kind, key)]
+        self._groups = None
+
+    def __len__(self) -> int:
+        return len(self.instruments)
+
+    def __contains__(self, ins_id: int) -> bool:
+        return ins_id in self.instruments
+
+    def __getitem__(self, ins_id: int) -> 'InstrumentV1':
+        return self.instruments[ins_id]
+
+    @property
+    def ids(self) -> np.ndarray:
+        """All instrument ids, in load order."""
+        return np.fromiter(self.instruments, dtype=np.int64, count=len(self.instruments))
+
+    # --- Key lookups ---
+    def by_ticker(self, ticker: str) -> Optional[int]:
+        return self._by_ticker.get(_norm(ticker))
+
+    def by_isin(self, isin: str) -> Optional[int]:
+        return self._by_isin.get(_norm(isin))
+
+    def by_yahoo(self, symbol: str) -> Optional[int]:
+        return self._by_yahoo.get(_norm(symbol))
+
+    def resolve(self, keys: Iterable[str], kind: str = "ticker") -> np.ndarray:
+        """Resolves tickers, ISINs or Yahoo symbols (`kind`) to insIds; unknown keys map to MISSING."""
+        index = {"ticker": self._by_ticker, "isin": self._by_isin, "yahoo": self._by_yahoo}[kind]
+        get = index.get
+        return np.array([get(_norm(k), MISSING) for k in keys], dtype=np.int64)
+
+    # --- Group lookups ---
+    def _group_index(self) -> Dict[str, Dict[int, np.ndarray]]:
+        if self._groups is None:
+            ids = self.ids
+            groups = {}
+            for group, field in _GROUPS.items():
+                values = np.array([getattr(ins, field) if getattr(ins, field) is not None else MISSING for ins in self.instruments.values()], dtype=np.int64)
+                order = np.argsort(values, kind="stable")
+                sorted_ids = ids[order]
+                keys, starts = np.unique(values[order], return_index=True)
+                ends = np.append(starts[1:], len(order))
+                groups[group] = {int(k): sorted_ids[start:end] for k, start, end in zip(keys, starts, ends)}
+            self._groups = groups
+        return self._groups
+
+    def members(self, group: str, group_id: int) -> np.ndarray:
+        """Returns the insIds in a sector, branch, market or country (`group`)."""
+        return self._group_index()[group].get(group_id, np.empty(0, dtype=np.int64))
+
+    def by_sector(self, sector_id: int) -> np.ndarray:
+        return self.members("sector", sector_id)
+
+    def by_branch(self, branch_id: int) -> np.ndarray:
+        return self.members("branch", branch_id)
+
+    def by_market(self, market_id: int) -> np.ndarray:
+        return self.members("market", market_id)
+
+    def by_country(self, country_id: int) -> np.ndarray:
+        return self.members("country", country_id)
+
+    def index_instruments(self) -> np.ndarray:
+        """Returns the insIds listed on markets flagged `isIndex`."""
+        parts = [self.by_market(m.id) for m in self.markets.values() if m.isIndex]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    # --- Refresh ---
+    def refresh(self, client: 'BorsdataAPIClient', authKey: str) -> List[int]:
+        """
+        Re-indexes instruments that /v1/instruments/updated reports as changed.
+
+        Does nothing beyond that one call when nothing changed. Returns the ids
+        that were added, changed or removed.
+        """
+        updated = {u.insId: u.updatedAt for u in client.get_instruments_updated(authKey).instruments or []}
+        changed = {ins_id for ins_id, at in updated.items() if self.updated_at.get(ins_id) != at}
+        if not changed:
+            return []
+        if getattr(client, "cache", None) is not None:
+            client.cache.invalidate_instruments((ins_id, updated[ins_id]) for ins_id in changed)
+        fresh = list(client.get_instruments(authKey).instruments or [])
+        if self.include_global:
+            fresh += client.get_instruments_global(authKey).instruments or []
+        fresh_by_id = {}
+        for ins in fresh:
+            fresh_by_id.setdefault(ins.insId, ins)
+        touched = changed | (set(fresh_by_id) ^ set(self.instruments))
+        for ins_id in touched:
+            if ins_id in self.instruments:
+                self._unindex(self.instruments[ins_id])
+        for ins_id in touched:
+            if ins_id in fresh_by_id:
+                self._index(fresh_by_id[ins_id])
+        self.updated_at = updated
+        return sorted(touched)
@@ -3,5 +3,10 @@
 # This package will contain the auto-generated API client for the Borsdata API, based on the OpenAPI specification in borsdataAPI.json.
 
 from .client import BorsdataAPIClient
+from .async_client import AsyncBorsdataAPIClient
+from .ratelimit import TokenBucket, SQLiteTokenBucket, RetryPolicy
+from .cache import ResponseCache
+from .memo import MemoryCache
+from .metrics import HistogramMetrics, PrometheusMetrics
 
-__all__ = ["BorsdataAPIClient"]
+__all__ = ["BorsdataAPIClient", "AsyncBorsdataAPIClient", "TokenBucket", "SQLiteTokenBucket", "RetryPolicy", "ResponseCache", "MemoryCache", "HistogramMetrics", "PrometheusMetrics"]
@@ -0,0 +1,84 @@
+"""
+Columnar NumPy decoding of stock price responses.
+
+Turns the JSON price lists straight into one contiguous array per field instead
+of one pydantic object per bar. Validation is limited to what the arrays need:
+every bar must have a date and a close; missing o/h/l/v become NaN.
+"""
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+
+class PriceArrays(NamedTuple):
+    """
+    Stock prices as parallel arrays.
+
+    `d` is datetime64[D]; `o`, `h`, `l`, `c` and `v` are float64 with NaN for
+    missing values. `i` holds the instrument id per row for the cross-sectional
+    endpoints (last/date) and is None otherwise. `instrument` and `error` carry
+    the per-instrument fields of array responses.
+    """
+    d: np.ndarray
+    o: np.ndarray
+    h: np.ndarray
+    l: np.ndarray
+    c: np.ndarray
+    v: np.ndarray
+    i: Optional[np.ndarray] = None
+    instrument: Optional[int] = None
+    error: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.d)
+
+
+def _float_column(rows: List[dict], field: str) -> np.ndarray:
+    # np.array maps None to NaN for float dtypes.
+    return np.array([row.get(field) for row in rows], dtype=np.float64)
+
+
+def _bad_row(rows: List[dict], with_instrument: bool) -> str:
+    """Describes the first row lacking a date, a close or (if required) an instrument id."""
+    for k, row in enumerate(rows):
+        if not isinstance(row.get("d"), str):
+            return f"{k}: missing or null 'd'"
+        if "c" not in row:
+            return f"{k}: missing 'c'"
+        if with_instrument and not isinstance(row.get("i"), int):
+            return f"{k}: missing or null 'i'"
+    return "with an unexpected layout"
+
+
+def decode_price_list(rows: Optional[List[dict]], with_instrument: bool = False, instrument: Optional[int] = None, error: Optional[str] = None) -> PriceArrays:
+    """Decodes a `stockPricesList` JSON array into PriceArrays."""
+    rows = rows or []
+    try:
+        d = np.array([row["d"][:10] for row in rows], dtype="datetime64[D]")
+        c = np.array([row["c"] for row in rows], dtype=np.float64)
+        i = np.array([row["i"] for row in rows], dtype=np.int64) if with_instrument else None
+    except (KeyError, TypeError) as exc:
+        raise ValueError(f"Malformed stock price row {_bad_row(rows, with_instrument)}") from exc
+    # JSON has no NaN, so a NaN close can only come from null.
+    missing = np.flatnonzero(np.isnan(c))
+    if len(missing):
+        raise ValueError(f"Malformed stock price row {missing[0]}: null 'c'")
+    return PriceArrays(
+        d=d,
+        o=_float_column(rows, "o"),
+        h=_float_column(rows, "h"),
+        l=_float_column(rows, "l"),
+        c=c,
+        v=_float_column(rows, "v"),
+        i=i,
+        instrument=instrument,
+        error=error,
+    )
+
+
+def decode_price_array_list(items: Optional[List[dict]]) -> Dict[int, PriceArrays]:
+    """Decodes a `stockPricesArrayList` JSON array into one PriceArrays block per instrument."""
+    return {
+        item["instrument"]: decode_price_list(item.get("stockPricesList"), instrument=item["instrument"], error=item.get("error"))
+        for item in items or []
+    }
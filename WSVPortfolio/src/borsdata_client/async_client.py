@@ -0,0 +1,527 @@
+"""
+Asyncio client for Borsdata API.
+
+Mirrors the method surface of BorsdataAPIClient, but every call is a coroutine
+sharing one pooled aiohttp connector, so a single event loop can keep many
+requests in flight. Requires the optional `aiohttp` dependency.
+"""
+import asyncio
+import copy
+import itertools
+import os
+import time
+from collections import deque
+from typing import AsyncIterator, Dict, Iterable, Optional, Type, Union, TYPE_CHECKING
+
+from .client import ReportType, PriceType, CalcGroup, Calc, ModelT, chunk_instruments
+from .ratelimit import RetryPolicy, TokenBucket
+from .decode import loads
+from .records import build_record, record_type
+
+if TYPE_CHECKING:
+    import aiohttp
+    from .models import (
+        MarketsRespV1, SectorsRespV1, TranslationMetadataRespV1, ReportsRespV1, ReportsCompoundRespV1, ReportMetadataRespV1, ReportsArrayRespV1,
+        StockPricesRespV1, StockPricesLastRespV1, StockPricesGlobalLastRespV1, StockPricesDateRespV1, StockPricesGlobalDateRespV1, StockPricesArrayRespV1, StockSplitRespV1,
+        KpisHistoryRespV1, KpisSummaryRespV1, KpisHistoryArrayRespV1, KpisRespV1, KpisAllCompRespV1, KpisCalcUpdatedRespV1, KpiMetadataRespV1,
+        BranchesRespV1, CountriesRespV1, InstrumentsRespV1, InstrumentUpdatedRespV1,
+        HoldingsInsiderTableArrayRespV1, HoldingsShortsTableRespV1, HoldingsBuybackArrayRespV1,
+        CompaniesCalenderArrayRespV1, CompaniesDividendArrayRespV1, CompaniesDescriptionArrayRespV1,
+        ReportsCombineRespV1, StockPricesArrayRespListV1, KpisHistoryCompV1, InsiderRespV1, BuybackRespV1
+    )
+    from .ratelimit import SQLiteTokenBucket
+    from .arrays import PriceArrays
+    from .metrics import MetricsSink
+
+
+class _Shared:
+    """Session and semaphore of a client, shared with its `with_validation` copies."""
+
+    def __init__(self):
+        self.session: Optional['aiohttp.ClientSession'] = None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+
+
+class AsyncBorsdataAPIClient:
+    """
+    Async counterpart of BorsdataAPIClient.
+
+    `pool_size` caps the number of open connections, `max_concurrency` caps the
+    number of requests in flight. `rate_limiter`, `retry` and `validate` behave
+    as on BorsdataAPIClient; a SQLiteTokenBucket is consulted from the default
+    executor. Use as an async context manager, or call `close()` when done.
+
+    `metrics` takes the same sinks as BorsdataAPIClient and additionally
+    separates DNS resolution from connect time.
+    """
+
+    def __init__(self, base_url: str = "https://apiservice.borsdata.se", api_key: Optional[str] = None, pool_size: int = 100, max_concurrency: int = 50,
+                 rate_limiter: Optional[Union['TokenBucket', 'SQLiteTokenBucket']] = None, retry: Optional[RetryPolicy] = None,
+                 validate: bool = True, metrics: Optional['MetricsSink'] = None):
+        self.base_url = base_url.rstrip("/")
+        if api_key is None:
+            api_key = os.environ.get("BORSDATA_API_KEY")
+            if not api_key:
+                raise RuntimeError("BORSDATA_API_KEY environment variable must be set or api_key provided.")
+        self.api_key = api_key
+        self.pool_size = pool_size
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.validate = validate
+        self.metrics = metrics
+        # Created lazily so they bind to the running event loop.
+        self._shared = _Shared()
+
+    async def __aenter__(self) -> 'AsyncBorsdataAPIClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the session shared by this client and its `with_validation` copies."""
+        shared = self._shared
+        if shared.session is not None:
+            await shared.session.close()
+            shared.session = None
+            shared.semaphore = None
+
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        shared = self._shared
+        if shared.session is None:
+            import aiohttp
+            connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.pool_size)
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else None
+            trace_configs = None
+            if self.metrics is not None:
+                from .metrics import aiohttp_trace_config
+                trace_configs = [aiohttp_trace_config()]
+            shared.session = aiohttp.ClientSession(connector=connector, headers=headers, trace_configs=trace_configs)
+            shared.semaphore = asyncio.Semaphore(self.max_concurrency)
+        return shared.session
+
+    async def _limit(self, method, *args):
+        """
+        Calls a rate limiter method. Methods of a SQLiteTokenBucket (or any
+        other limiter) run in the default executor, so their blocking database
+        transactions don't stall the event loop.
+        """
+        if type(self.rate_limiter) is TokenBucket:
+            return method(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, method, *args)
+
+    async def _get(self, path: str, params: Optional[dict] = None):
+        session = self._get_session()
+        url = f"{self.base_url}{path}"
+        if self.metrics is not None:
+            return await self._timed_get(session, url, path, params)
+        attempt = 0
+        async with self._shared.semaphore:
+            while True:
+                if self.rate_limiter is not None:
+                    wait = await self._limit(self.rate_limiter.reserve)
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                async with session.get(url, params=params) as response:
+                    if not self.retry.should_retry(response.status, attempt):
+                        response.raise_for_status()
+                        return loads(await response.read())
+                    delay = self.retry.delay(attempt, response.headers.get("Retry-After"))
+                if self.rate_limiter is not None and response.status == 429:
+                    await self._limit(self.rate_limiter.pause, delay)
+                else:
+                    await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _timed_get(self, session: 'aiohttp.ClientSession', url: str, path: str, params: Optional[dict]):
+        """`_get` recording per-phase times, bytes, retries and errors in `self.metrics`."""
+        from .metrics import current_endpoint, endpoint_template, observe_trace
+        metrics = self.metrics
+        endpoint = endpoint_template(path)
+        current_endpoint.set(endpoint)
+        attempt = 0
+        async with self._shared.semaphore:
+            while True:
+                if self.rate_limiter is not None:
+                    wait = await self._limit(self.rate_limiter.reserve)
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                trace: dict = {}
+                start = time.perf_counter()
+                async with session.get(url, params=params, trace_request_ctx=trace) as response:
+                    headers_at = time.perf_counter()
+                    metrics.observe(endpoint, "ttfb", headers_at - start - observe_trace(metrics, endpoint, trace))
+                    metrics.increment(endpoint, "requests")
+                    if not self.retry.should_retry(response.status, attempt):
+                        if response.status >= 400:
+                            metrics.increment(endpoint, "errors")
+                        response.raise_for_status()
+                        body = await response.read()
+                        decode_at = time.perf_counter()
+                        metrics.observe(endpoint, "download", decode_at - headers_at)
+                        metrics.increment(endpoint, "bytes", len(body))
+                        data = loads(body)
+                        metrics.observe(endpoint, "decode", time.perf_counter() - decode_at)
+                        return data
+                    delay = self.retry.delay(attempt, response.headers.get("Retry-After"))
+                metrics.increment(endpoint, "retries")
+                if self.rate_limiter is not None and response.status == 429:
+                    await self._limit(self.rate_limiter.pause, delay)
+                else:
+                    await asyncio.sleep(delay)
+                attempt += 1
+
+    def with_validation(self, validate: bool) -> 'AsyncBorsdataAPIClient':
+        """Returns a copy of this client with validation switched on or off, sharing its session; closing either closes both."""
+        view = copy.copy(self)
+        view.validate = validate
+        return view
+
+    def _parse(self, model: Type[ModelT], data) -> ModelT:
+        """Validates decoded JSON into `model`, or builds a lightweight record of it when validation is off."""
+        start = time.perf_counter() if self.metrics is not None else None
+        result = model.parse_obj(data) if self.validate else build_record(model, data)
+        if start is not None:
+            from .metrics import current_endpoint
+            self.metrics.observe(current_endpoint.get(), "parse", time.perf_counter() - start)
+        return result
+
+    def _merge(self, model: Type[ModelT], field: str, responses: list) -> ModelT:
+        """Concatenates the `field` lists of chunked responses into one response."""
+        items = [item for resp in responses for item in getattr(resp, field) or []]
+        if self.validate:
+            return model(**{field: items})
+        return record_type(model)(**{field: items})
+
+    async def _gather_chunks(self, fetch, instruments: Iterable[int]) -> list:
+        """Runs `fetch(instList)` for every 50-id chunk concurrently, results in chunk order."""
+        chunks = [",".join(map(str, chunk)) for chunk in chunk_instruments(instruments)]
+        return await asyncio.gather(*(fetch(chunk) for chunk in chunks))
+
+    async def _iter_chunks(self, fetch, instruments: Iterable[int], prefetch: Optional[int] = None) -> AsyncIterator:
+        """
+        Yields `await fetch(instList)` for every 50-id chunk as each completes.
+
+        At most `prefetch` chunks (default `max_concurrency`) are in flight or
+        waiting to be consumed, counting the result the caller holds. Closing
+        the generator cancels the rest.
+        """
+        chunks = (",".join(map(str, chunk)) for chunk in chunk_instruments(instruments))
+        depth = max(1, prefetch or self.max_concurrency)
+        pending: set = set()
+        ready: deque = deque()
+        try:
+            while True:
+                for chunk in itertools.islice(chunks, depth - len(pending) - len(ready)):
+                    pending.add(asyncio.ensure_future(fetch(chunk)))
+                if not ready:
+                    if not pending:
+                        return
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    ready.extend(done)
+                yield ready.popleft().result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    # --- Instrument Meta ---
+    async def get_markets(self) -> 'MarketsRespV1':
+        """Returns all Markets."""
+        from .models import MarketsRespV1
+        return self._parse(MarketsRespV1, await self._get("/v1/markets"))
+
+    async def get_sectors(self) -> 'SectorsRespV1':
+        """Returns all Sectors."""
+        from .models import SectorsRespV1
+        return self._parse(SectorsRespV1, await self._get("/v1/sectors"))
+
+    async def get_translation_metadata(self, authKey: str) -> 'TranslationMetadataRespV1':
+        """Returns translations for bransch, sector, country. Requires API key."""
+        from .models import TranslationMetadataRespV1
+        return self._parse(TranslationMetadataRespV1, await self._get("/v1/translationmetadata", params={"authKey": authKey}))
+
+    async def get_instruments(self, authKey: str) -> 'InstrumentsRespV1':
+        """Returns all Nordic Instruments."""
+        from .models import InstrumentsRespV1
+        return self._parse(InstrumentsRespV1, await self._get("/v1/instruments", params={"authKey": authKey}))
+
+    async def get_instruments_global(self, authKey: str) -> 'InstrumentsRespV1':
+        """Returns all Global Instruments. Only Global(Pro+)."""
+        from .models import InstrumentsRespV1
+        return self._parse(InstrumentsRespV1, await self._get("/v1/instruments/global", params={"authKey": authKey}))
+
+    async def get_instruments_updated(self, authKey: str) -> 'InstrumentUpdatedRespV1':
+        """Returns last Updated Nordic Instruments. Time when Nordic Instrument or Reports was updated."""
+        from .models import InstrumentUpdatedRespV1
+        return self._parse(InstrumentUpdatedRespV1, await self._get("/v1/instruments/updated", params={"authKey": authKey}))
+
+    # --- Reports ---
+    async def get_reports(self, instrument_id: int, reporttype: ReportType) -> 'ReportsRespV1':
+        """Returns Reports for Instrument. Report Type (year, r12, quarter)."""
+        from .models import ReportsRespV1
+        return self._parse(ReportsRespV1, await self._get(f"/v1/instruments/{instrument_id}/reports/{reporttype}"))
+
+    async def get_reports_compound(self, instrument_id: int) -> 'ReportsCompoundRespV1':
+        """Returns Reports for one Instrument. All Reports Type included (year, r12, quarter)."""
+        from .models import ReportsCompoundRespV1
+        return self._parse(ReportsCompoundRespV1, await self._get(f"/v1/instruments/{instrument_id}/reports"))
+
+    async def get_reports_metadata(self) -> 'ReportMetadataRespV1':
+        """Returns Report metadata."""
+        from .models import ReportMetadataRespV1
+        return self._parse(ReportMetadataRespV1, await self._get("/v1/instruments/reports/metadata"))
+
+    async def get_reports_array(self, instList: str, authKey: str, reporttype: Optional[ReportType] = None, from_date: str = None, to_date: str = None,
+                          maxYearCount: Optional[int] = None, maxR12QCount: Optional[int] = None, original: Optional[bool] = None) -> 'ReportsArrayRespV1':
+        """Returns Reports for list of instruments. instList is comma-separated IDs. Optionally filter by reporttype; maxYearCount (max 20) and maxR12QCount (max 40) set the depth."""
+        from .models import ReportsArrayRespV1
+        params = {"instList": instList, "authKey": authKey}
+        if reporttype:
+            params["reporttype"] = reporttype
+        if from_date:
+            params["from"] = from_date
+        if to_date:
+            params["to"] = to_date
+        if maxYearCount:
+            params["maxYearCount"] = maxYearCount
+        if maxR12QCount:
+            params["maxR12QCount"] = maxR12QCount
+        if original is not None:
+            params["original"] = str(original).lower()
+        return self._parse(ReportsArrayRespV1, await self._get("/v1/instruments/reports", params=params))
+
+    async def get_reports_array_batch(self, instruments: Iterable[int], authKey: str, reporttype: Optional[ReportType] = None, from_date: str = None, to_date: str = None,
+                                      maxYearCount: Optional[int] = None, maxR12QCount: Optional[int] = None, original: Optional[bool] = None) -> 'ReportsArrayRespV1':
+        """Returns Reports for any number of instruments, fetched concurrently in chunks of 50."""
+        from .models import ReportsArrayRespV1
+        responses = await self._gather_chunks(
+            lambda instList: self.get_reports_array(instList, authKey, reporttype, from_date, to_date, maxYearCount, maxR12QCount, original),
+            instruments,
+        )
+        return self._merge(ReportsArrayRespV1, "reportList", responses)
+
+    async def iter_reports(self, instruments: Iterable[int], authKey: str, reporttype: Optional[ReportType] = None, from_date: str = None, to_date: str = None, prefetch: Optional[int] = None,
+                           maxYearCount: Optional[int] = None, maxR12QCount: Optional[int] = None) -> AsyncIterator['ReportsCombineRespV1']:
+        """Yields Reports per instrument for any number of instruments, prefetching chunks of 50 concurrently."""
+        async for resp in self._iter_chunks(lambda instList: self.get_reports_array(instList, authKey, reporttype, from_date, to_date, maxYearCount, maxR12QCount), instruments, prefetch):
+            for item in resp.reportList or []:
+                yield item
+
+    # --- StockPrices ---
+    async def get_stockprices(self, instrument_id: int, as_arrays: bool = False) -> Union['StockPricesRespV1', 'PriceArrays']:
+        """Returns StockPrice for Instrument. 10 year default. as_arrays returns columnar PriceArrays instead of models."""
+        from .models import StockPricesRespV1
+        data = await self._get(f"/v1/instruments/{instrument_id}/stockprices")
+        if as_arrays:
+            from .arrays import decode_price_list
+            return decode_price_list(data.get("stockPricesList"), instrument=data.get("instrument"))
+        return self._parse(StockPricesRespV1, data)
+
+    async def get_stockprices_last(self, authKey: str, as_arrays: bool = False) -> Union['StockPricesLastRespV1', 'PriceArrays']:
+        """Returns Last StockPrices for all Instruments. Only Nordic(Pro)."""
+        from .models import StockPricesLastRespV1
+        data = await self._get("/v1/instruments/stockprices/last", params={"authKey": authKey})
+        if as_arrays:
+            from .arrays import decode_price_list
+            return decode_price_list(data.get("stockPricesList"), with_instrument=True)
+        return self._parse(StockPricesLastRespV1, data)
+
+    async def get_stockprices_global_last(self, authKey: str, as_arrays: bool = False) -> Union['StockPricesGlobalLastRespV1', 'PriceArrays']:
+        """Returns Last/Latest StockPrices for all Global Instruments. Only Global(Pro+)."""
+        from .models import StockPricesGlobalLastRespV1
+        data = await self._get("/v1/instruments/stockprices/global/last", params={"authKey": authKey})
+        if as_arrays:
+            from .arrays import decode_price_list
+            return decode_price_list(data.get("stockPricesList"), with_instrument=True)
+        return self._parse(StockPricesGlobalLastRespV1, data)
+
+    async def get_stockprices_date(self, authKey: str, date: str, as_arrays: bool = False) -> Union['StockPricesDateRespV1', 'PriceArrays']:
+        """Returns one StockPrice for each Instrument for a specific date. Only Nordic(Pro)."""
+        from .models import StockPricesDateRespV1
+        data = await self._get("/v1/instruments/stockprices/date", params={"authKey": authKey, "date": date})
+        if as_arrays:
+            from .arrays import decode_price_list
+            return decode_price_list(data.get("stockPricesList"), with_instrument=True)
+        return self._parse(StockPricesDateRespV1, data)
+
+    async def get_stockprices_global_date(self, authKey: str, date: str, as_arrays: bool = False) -> Union['StockPricesGlobalDateRespV1', 'PriceArrays']:
+        """Returns one StockPrice for each global Instrument for a specific date. Only Global(Pro+)."""
+        from .models import StockPricesGlobalDateRespV1
+        data = await self._get("/v1/instruments/stockprices/global/date", params={"authKey": authKey, "date": date})
+        if as_arrays:
+            from .arrays import decode_price_list
+            return decode_price_list(data.get("stockPricesList"), with_instrument=True)
+        return self._parse(StockPricesGlobalDateRespV1, data)
+
+    async def get_stockprices_array(self, instList: str, authKey: str, from_date: str = None, to_date: str = None, as_arrays: bool = False) -> Union['StockPricesArrayRespV1', Dict[int, 'PriceArrays']]:
+        """Returns StockPrice for list of Instruments. instList is comma-separated IDs. as_arrays returns one PriceArrays block per instrument."""
+        from .models import StockPricesArrayRespV1
+        params = {"instList": instList, "authKey": authKey}
+        if from_date:
+            params["from"] = from_date
+        if to_date:
+            params["to"] = to_date
+        data = await self._get("/v1/instruments/stockprices", params=params)
+        if as_arrays:
+            from .arrays import decode_price_array_list
+            return decode_price_array_list(data.get("stockPricesArrayList"))
+        return self._parse(StockPricesArrayRespV1, data)
+
+    async def get_stockprices_array_batch(self, instruments: Iterable[int], authKey: str, from_date: str = None, to_date: str = None, as_arrays: bool = False) -> Union['StockPricesArrayRespV1', Dict[int, 'PriceArrays']]:
+        """Returns StockPrice for any number of instruments, fetched concurrently in chunks of 50."""
+        from .models import StockPricesArrayRespV1
+        responses = await self._gather_chunks(
+            lambda instList: self.get_stockprices_array(instList, authKey, from_date, to_date, as_arrays=as_arrays),
+            instruments,
+        )
+        if as_arrays:
+            return {ins_id: block for resp in responses for ins_id, block in resp.items()}
+        return self._merge(StockPricesArrayRespV1, "stockPricesArrayList", responses)
+
+    async def iter_stockprices(self, instruments: Iterable[int], authKey: str, from_date: str = None, to_date: str = None, prefetch: Optional[int] = None, as_arrays: bool = False) -> AsyncIterator[Union['StockPricesArrayRespListV1', 'PriceArrays']]:
+        """Yields StockPrice per instrument for any number of instruments, prefetching chunks of 50 concurrently."""
+        async for resp in self._iter_chunks(lambda instList: self.get_stockprices_array(instList, authKey, from_date, to_date, as_arrays=as_arrays), instruments, prefetch):
+            for item in (resp.values() if as_arrays else resp.stockPricesArrayList or []):
+                yield item
+
+    async def get_stock_splits(self, authKey: str, from_date: str = None) -> 'StockSplitRespV1':
+        """Returns Stock Splits for Nordic Instruments. Max 1 Year."""
+        from .models import StockSplitRespV1
+        params = {"authKey": authKey}
+        if from_date:
+            params["from"] = from_date
+        return self._parse(StockSplitRespV1, await self._get("/v1/instruments/StockSplits", params=params))
+
+    # --- KPIs ---
+    async def get_kpi_history(self, insid: int, kpiId: int, reporttype: ReportType, pricetype: PriceType) -> 'KpisHistoryRespV1':
+        """Returns KPI history for an instrument."""
+        from .models import KpisHistoryRespV1
+        return self._parse(KpisHistoryRespV1, await self._get(f"/v1/instruments/{insid}/kpis/{kpiId}/{reporttype}/{pricetype}/history"))
+
+    async def get_kpi_summary(self, insid: int, reporttype: ReportType) -> 'KpisSummaryRespV1':
+        """Returns KPI summary for an instrument."""
+        from .models import KpisSummaryRespV1
+        return self._parse(KpisSummaryRespV1, await self._get(f"/v1/instruments/{insid}/kpis/{reporttype}/summary"))
+
+    async def get_kpi_history_alt(self, kpiId: int, reporttype: ReportType, pricetype: PriceType, instList: Optional[str] = None) -> 'KpisHistoryArrayRespV1':
+        """Returns KPI history for all instruments for a KPI, or for instList (comma-separated IDs) only."""
+        from .models import KpisHistoryArrayRespV1
+        params = {"instList": instList} if instList else None
+        return self._parse(KpisHistoryArrayRespV1, await self._get(f"/v1/instruments/kpis/{kpiId}/{reporttype}/{pricetype}/history", params=params))
+
+    async def iter_kpi_history(self, kpiId: int, reporttype: ReportType, pricetype: PriceType, instruments: Iterable[int], prefetch: Optional[int] = None) -> AsyncIterator['KpisHistoryCompV1']:
+        """Yields KPI history per instrument for any number of instruments, prefetching chunks of 50 concurrently."""
+        async for resp in self._iter_chunks(lambda instList: self.get_kpi_history_alt(kpiId, reporttype, pricetype, instList), instruments, prefetch):
+            for item in resp.kpisList or []:
+                yield item
+
+    async def get_kpi_calc(self, insid: int, kpiId: int, calcGroup: CalcGroup, calc: Calc) -> 'KpisRespV1':
+        """Returns calculated KPI for an instrument."""
+        from .models import KpisRespV1
+        return self._parse(KpisRespV1, await self._get(f"/v1/instruments/{insid}/kpis/{kpiId}/{calcGroup}/{calc}"))
+
+    async def get_kpi_calc_alt(self, kpiId: int, calcGroup: CalcGroup, calc: Calc) -> 'KpisAllCompRespV1':
+        """Returns calculated KPI for all instruments for a KPI."""
+        from .models import KpisAllCompRespV1
+        return self._parse(KpisAllCompRespV1, await self._get(f"/v1/instruments/kpis/{kpiId}/{calcGroup}/{calc}"))
+
+    async def get_kpi_calc_global(self, kpiId: int, calcGroup: CalcGroup, calc: Calc) -> 'KpisAllCompRespV1':
+        """Returns calculated KPI for all global instruments for a KPI."""
+        from .models import KpisAllCompRespV1
+        return self._parse(KpisAllCompRespV1, await self._get(f"/v1/instruments/global/kpis/{kpiId}/{calcGroup}/{calc}"))
+
+    async def get_kpis_updated(self) -> 'KpisCalcUpdatedRespV1':
+        """Returns updated KPIs."""
+        from .models import KpisCalcUpdatedRespV1
+        return self._parse(KpisCalcUpdatedRespV1, await self._get("/v1/instruments/kpis/updated"))
+
+    async def get_kpis_metadata(self) -> 'KpiMetadataRespV1':
+        """Returns KPI metadata."""
+        from .models import KpiMetadataRespV1
+        return self._parse(KpiMetadataRespV1, await self._get("/v1/instruments/kpis/metadata"))
+
+    # --- Holdings ---
+    async def get_holdings_insider(self, instList: str, authKey: str) -> 'HoldingsInsiderTableArrayRespV1':
+        """Returns insider transactions for list of instruments. instList is comma-separated IDs, max 50."""
+        from .models import HoldingsInsiderTableArrayRespV1
+        return self._parse(HoldingsInsiderTableArrayRespV1, await self._get("/v1/holdings/insider", params={"instList": instList, "authKey": authKey}))
+
+    async def get_holdings_insider_batch(self, instruments: Iterable[int], authKey: str) -> 'HoldingsInsiderTableArrayRespV1':
+        """Returns insider transactions for any number of instruments, fetched concurrently in chunks of 50."""
+        from .models import HoldingsInsiderTableArrayRespV1
+        responses = await self._gather_chunks(lambda instList: self.get_holdings_insider(instList, authKey), instruments)
+        return self._merge(HoldingsInsiderTableArrayRespV1, "list", responses)
+
+    async def iter_holdings_insider(self, instruments: Iterable[int], authKey: str, prefetch: Optional[int] = None) -> AsyncIterator['InsiderRespV1']:
+        """Yields insider transactions per instrument for any number of instruments, prefetching chunks of 50 concurrently."""
+        async for resp in self._iter_chunks(lambda instList: self.get_holdings_insider(instList, authKey), instruments, prefetch):
+            for item in resp.list or []:
+                yield item
+
+    async def get_holdings_shorts(self, authKey: str) -> 'HoldingsShortsTableRespV1':
+        """Returns short positions for all instruments."""
+        from .models import HoldingsShortsTableRespV1
+        return self._parse(HoldingsShortsTableRespV1, await self._get("/v1/holdings/shorts", params={"authKey": authKey}))
+
+    async def get_holdings_buyback(self, instList: str, authKey: str) -> 'HoldingsBuybackArrayRespV1':
+        """Returns buybacks for list of instruments. instList is comma-separated IDs, max 50."""
+        from .models import HoldingsBuybackArrayRespV1
+        return self._parse(HoldingsBuybackArrayRespV1, await self._get("/v1/holdings/buyback", params={"instList": instList, "authKey": authKey}))
+
+    async def get_holdings_buyback_batch(self, instruments: Iterable[int], authKey: str) -> 'HoldingsBuybackArrayRespV1':
+        """Returns buybacks for any number of instruments, fetched concurrently in chunks of 50."""
+        from .models import HoldingsBuybackArrayRespV1
+        responses = await self._gather_chunks(lambda instList: self.get_holdings_buyback(instList, authKey), instruments)
+        return self._merge(HoldingsBuybackArrayRespV1, "list", responses)
+
+    async def iter_holdings_buyback(self, instruments: Iterable[int], authKey: str, prefetch: Optional[int] = None) -> AsyncIterator['BuybackRespV1']:
+        """Yields buybacks per instrument for any number of instruments, prefetching chunks of 50 concurrently."""
+        async for resp in self._iter_chunks(lambda instList: self.get_holdings_buyback(instList, authKey), instruments, prefetch):
+            for item in resp.list or []:
+                yield item
+
+    # --- Calendars ---
+    async def get_report_calendar(self, instList: str, authKey: str) -> 'CompaniesCalenderArrayRespV1':
+        """Returns the report calendar for list of instruments. instList is comma-separated IDs, max 50."""
+        from .models import CompaniesCalenderArrayRespV1
+        return self._parse(CompaniesCalenderArrayRespV1, await self._get("/v1/instruments/report/calendar", params={"instList": instList, "authKey": authKey}))
+
+    async def get_report_calendar_batch(self, instruments: Iterable[int], authKey: str) -> 'CompaniesCalenderArrayRespV1':
+        """Returns the report calendar for any number of instruments, fetched concurrently in chunks of 50."""
+        from .models import CompaniesCalenderArrayRespV1
+        responses = await self._gather_chunks(lambda instList: self.get_report_calendar(instList, authKey), instruments)
+        return self._merge(CompaniesCalenderArrayRespV1, "list", responses)
+
+    async def get_dividend_calendar(self, instList: str, authKey: str) -> 'CompaniesDividendArrayRespV1':
+        """Returns the dividend calendar for list of instruments. instList is comma-separated IDs, max 50."""
+        from .models import CompaniesDividendArrayRespV1
+        return self._parse(CompaniesDividendArrayRespV1, await self._get("/v1/instruments/dividend/calendar", params={"instList": instList, "authKey": authKey}))
+
+    async def get_dividend_calendar_batch(self, instruments: Iterable[int], authKey: str) -> 'CompaniesDividendArrayRespV1':
+        """Returns the dividend calendar for any number of instruments, fetched concurrently in chunks of 50."""
+        from .models import CompaniesDividendArrayRespV1
+        responses = await self._gather_chunks(lambda instList: self.get_dividend_calendar(instList, authKey), instruments)
+        return self._merge(CompaniesDividendArrayRespV1, "list", responses)
+
+    async def get_instruments_description(self, instList: str, authKey: str) -> 'CompaniesDescriptionArrayRespV1':
+        """Returns company descriptions for list of instruments. instList is comma-separated IDs, max 50."""
+        from .models import CompaniesDescriptionArrayRespV1
+        return self._parse(CompaniesDescriptionArrayRespV1, await self._get("/v1/instruments/description", params={"instList": instList, "authKey": authKey}))
+
+    async def get_instruments_description_batch(self, instruments: Iterable[int], authKey: str) -> 'CompaniesDescriptionArrayRespV1':
+        """Returns company descriptions for any number of instruments, fetched concurrently in chunks of 50."""
+        from .models import CompaniesDescriptionArrayRespV1
+        responses = await self._gather_chunks(lambda instList: self.get_instruments_description(instList, authKey), instruments)
+        return self._merge(CompaniesDescriptionArrayRespV1, "list", responses)
+
+    # --- Miscellaneous ---
+    async def get_branches(self) -> 'BranchesRespV1':
+        """Returns all Branches."""
+        from .models import BranchesRespV1
+        return self._parse(BranchesRespV1, await self._get("/v1/branches"))
+
+    async def get_countries(self) -> 'CountriesRespV1':
+        """Returns all Countries."""
+        from .models import CountriesRespV1
+        return self._parse(CountriesRespV1, await self._get("/v1/countries"))
@@ -0,0 +1,183 @@
+"""
+Persistent on-disk response cache for Borsdata API.
+
+Responses are stored as raw JSON in SQLite, keyed by endpoint path and query
+parameters (the auth key is never part of the key). What may be cached, and
+what invalidates it, depends on the endpoint:
+
+- "kpi": KPI calculations and histories. Dropped when `/v1/instruments/kpis/updated`
+  reports a new calculation time.
+- "reports": per-instrument and instList report endpoints. Dropped per instrument
+  when `/v1/instruments/updated` reports a new update time for it.
+- "universe": instrument lists and descriptions. Dropped when any instrument changed.
+- "metadata": markets, sectors, branches, countries, translations, metadata. Expire
+  after `metadata_ttl` seconds.
+
+Stock prices, holdings and calendars are never cached.
+"""
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Iterable, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from .decode import loads
+
+_METADATA_PATHS = frozenset([
+    "/v1/markets", "/v1/sectors", "/v1/branches", "/v1/countries", "/v1/translationmetadata",
+    "/v1/instruments/reports/metadata", "/v1/instruments/kpis/metadata",
+])
+_UNIVERSE_PATHS = frozenset(["/v1/instruments", "/v1/instruments/global", "/v1/instruments/description"])
+_UNCACHED_PATHS = frozenset(["/v1/instruments/kpis/updated", "/v1/instruments/updated"])
+_INSTRUMENT_PATH = re.compile(r"^/v1/instruments/(\d+)/")
+
+
+def cache_scope(path: str) -> Optional[str]:
+    """Returns the invalidation scope of an endpoint path, or None if it must not be cached."""
+    if path in _UNCACHED_PATHS:
+        return None
+    if path in _METADATA_PATHS:
+        return "metadata"
+    if path in _UNIVERSE_PATHS:
+        return "universe"
+    if "/kpis/" in path:
+        return "kpi"
+    if path == "/v1/instruments/reports" or (_INSTRUMENT_PATH.match(path) and "/reports" in path):
+        return "reports"
+    return None
+
+
+def cache_key(path: str, params: Optional[dict] = None) -> str:
+    """Builds the cache key for a request, leaving out the auth key."""
+    query = sorted((k, str(v)) for k, v in (params or {}).items() if k != "authKey")
+    return f"{path}?{urlencode(query)}" if query else path
+
+
+def _instrument_ids(path: str, params: Optional[dict]) -> List[int]:
+    match = _INSTRUMENT_PATH.match(path)
+    if match:
+        return [int(match.group(1))]
+    inst_list = (params or {}).get("instList")
+    if inst_list:
+        return [int(i) for i in str(inst_list).split(",") if i.strip()]
+    return []
+
+
+class ResponseCache:
+    """
+    SQLite-backed response cache. Safe to share between threads.
+
+    Call `BorsdataAPIClient.refresh_cache()` at the start of a run so entries
+    invalidated by the /updated endpoints are dropped before they are served.
+    """
+
+    def __init__(self, path: str, metadata_ttl: float = 24 * 3600):
+        self.path = path
+        self.metadata_ttl = metadata_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY, scope TEXT NOT NULL, body BLOB NOT NULL, fetched_at REAL NOT NULL);
+                CREATE TABLE IF NOT EXISTS response_instruments (
+                    key TEXT NOT NULL, ins_id INTEGER NOT NULL, PRIMARY KEY (ins_id, key));
+                CREATE TABLE IF NOT EXISTS markers (
+                    name TEXT PRIMARY KEY, value TEXT);
+            """)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def get(self, path: str, params: Optional[dict] = None) -> Optional[Any]:
+        """Returns the decoded cached response, or None on a miss."""
+        scope = cache_scope(path)
+        if scope is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, fetched_at FROM responses WHERE key = ?", (cache_key(path, params),)
+            ).fetchone()
+        if row is None:
+            return None
+        body, fetched_at = row
+        if scope == "metadata" and time.time() - fetched_at > self.metadata_ttl:
+            return None
+        return loads(body)
+
+    def set(self, path: str, params: Optional[dict], body: bytes) -> bool:
+        """Stores a raw JSON response body if its endpoint is cacheable. Returns whether it was stored."""
+        scope = cache_scope(path)
+        if scope is None:
+            return False
+        key = cache_key(path, params)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, scope, body, fetched_at) VALUES (?, ?, ?, ?)",
+                (key, scope, body, time.time()),
+            )
+            if scope == "reports":
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO response_instruments (key, ins_id) VALUES (?, ?)",
+                    [(key, ins_id) for ins_id in _instrument_ids(path, params)],
+                )
+        return True
+
+    def clear(self, scope: Optional[str] = None) -> None:
+        """Drops all entries, or only those of one scope."""
+        with self._lock, self._conn:
+            if scope is None:
+                self._conn.execute("DELETE FROM responses")
+                self._conn.execute("DELETE FROM response_instruments")
+            else:
+                self._drop_scope(scope)
+
+    def _drop_scope(self, scope: str) -> None:
+        if scope == "reports":
+            self._conn.execute("DELETE FROM response_instruments")
+        self._conn.execute("DELETE FROM responses WHERE scope = ?", (scope,))
+
+    def _marker(self, name: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM markers WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_marker(self, name: str, value: Optional[str]) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO markers (name, value) VALUES (?, ?)", (name, value))
+
+    def invalidate_kpis(self, kpis_calc_updated: Optional[str]) -> bool:
+        """Drops cached KPI responses if the KPI calculation time changed. Returns whether it did."""
+        with self._lock, self._conn:
+            if self._marker("kpisCalcUpdated") == kpis_calc_updated:
+                return False
+            self._drop_scope("kpi")
+            self._set_marker("kpisCalcUpdated", kpis_calc_updated)
+            return True
+
+    def invalidate_instruments(self, updated: Iterable[Tuple[int, Optional[str]]]) -> List[int]:
+        """
+        Drops cached report responses for instruments whose update time changed.
+
+        `updated` holds (insId, updatedAt) pairs from `/v1/instruments/updated`.
+        Returns the ids of the instruments that changed.
+        """
+        changed = []
+        with self._lock, self._conn:
+            for ins_id, updated_at in updated:
+                name = f"instrument:{ins_id}"
+                if self._marker(name) == updated_at:
+                    continue
+                changed.append(ins_id)
+                self._set_marker(name, updated_at)
+            if not changed:
+                return changed
+            for start in range(0, len(changed), 500):
+                batch = changed[start:start + 500]
+                marks = ",".join("?" * len(batch))
+                self._conn.execute(
+                    f"DELETE FROM responses WHERE key IN (SELECT key FROM response_instruments WHERE ins_id IN ({marks}))",
+                    batch,
+                )
+            self._conn.execute("DELETE FROM response_instruments WHERE key NOT IN (SELECT key FROM responses)")
+            self._drop_scope("universe")
+        return changed
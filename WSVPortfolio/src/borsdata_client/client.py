@@ -2,8 +2,18 @@
 Base client for Borsdata API.
 """
 import requests
+import copy
+import itertools
 import os
-from typing import Optional, TYPE_CHECKING
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Type, TypeVar, Union, TYPE_CHECKING
+from requests.adapters import HTTPAdapter
+from .ratelimit import RetryPolicy
+from .decode import loads, iter_json_array
+from .records import build_record, record_type
+from .memo import MemoryCache, SingleFlight
 from typing_extensions import Literal, TypeAlias
 
 # --- Type Aliases for API enums ---
@@ -19,61 +29,297 @@ if TYPE_CHECKING:
         MarketsRespV1, SectorsRespV1, TranslationMetadataRespV1, ReportsRespV1, ReportsCompoundRespV1, ReportMetadataRespV1, ReportsArrayRespV1,
         StockPricesRespV1, StockPricesLastRespV1, StockPricesGlobalLastRespV1, StockPricesDateRespV1, StockPricesGlobalDateRespV1, StockPricesArrayRespV1, StockSplitRespV1,
         KpisHistoryRespV1, KpisSummaryRespV1, KpisHistoryArrayRespV1, KpisRespV1, KpisAllCompRespV1, KpisCalcUpdatedRespV1, KpiMetadataRespV1,
-        BranchesRespV1, CountriesRespV1
+        BranchesRespV1, CountriesRespV1, InstrumentsRespV1, InstrumentUpdatedRespV1,
+        HoldingsInsiderTableArrayRespV1, HoldingsShortsTableRespV1, HoldingsBuybackArrayRespV1,
+        CompaniesCalenderArrayRespV1, CompaniesDividendArrayRespV1, CompaniesDescriptionArrayRespV1,
+        StockPriceFullV1, KpisHistoryCompV1, KpiV1, ReportsCombineRespV1, StockPricesArrayRespListV1, InsiderRespV1, BuybackRespV1
     )
+    from .ratelimit import TokenBucket, SQLiteTokenBucket
+    from .cache import ResponseCache
+    from .arrays import PriceArrays
+    from .metrics import MetricsSink
+
+ModelT = TypeVar("ModelT")
+
+# Max number of instruments accepted by the instList query parameter.
+MAX_INSTLIST = 50
+
+# Bytes read from the socket per step when streaming a response.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def chunk_instruments(instruments: Iterable[int], size: int = MAX_INSTLIST) -> Iterator[List[int]]:
+    """Yields lists of at most `size` unique instrument ids, preserving order."""
+    chunk: List[int] = []
+    for ins_id in dict.fromkeys(int(i) for i in instruments):
+        chunk.append(ins_id)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
 class BorsdataAPIClient:
-    def __init__(self, base_url: str = "https://apiservice.borsdata.se", api_key: Optional[str] = None):
+    """
+    Blocking client for Borsdata API.
+
+    Pass a `rate_limiter` (TokenBucket, or SQLiteTokenBucket to share the limit
+    between processes) to stay under the per-key request rate; requests then
+    queue for a token instead of failing. `retry` controls retries on 429 and
+    5xx responses and defaults to RetryPolicy().
+
+    Pass a `cache` (ResponseCache) to keep reports, KPI and metadata responses
+    on disk between runs; call `refresh_cache()` at the start of a run to drop
+    whatever the /updated endpoints report as changed.
+
+    With `validate=False` responses are trusted: methods return lightweight
+    `__slots__` records (see `records.py`) with the models' field names instead
+    of validated pydantic models. `with_validation()` switches per call site.
+
+    Identical concurrent requests are always coalesced into one round trip.
+    Pass a `memory_cache` (MemoryCache) to also keep parsed metadata (markets,
+    sectors, branches, countries, translations, KPI and report metadata) in
+    memory for a per-endpoint TTL.
+
+    Pass a `metrics` sink (HistogramMetrics, PrometheusMetrics, or anything
+    with `observe()`/`increment()`) to time connect, TTFB, download, decode and
+    parse per endpoint and count bytes, retries and cache hits.
+    """
+
+    def __init__(self, base_url: str = "https://apiservice.borsdata.se", api_key: Optional[str] = None, max_workers: int = 8,
+                 rate_limiter: Optional[Union['TokenBucket', 'SQLiteTokenBucket']] = None, retry: Optional[RetryPolicy] = None,
+                 cache: Optional['ResponseCache'] = None, validate: bool = True, memory_cache: Optional[MemoryCache] = None,
+                 metrics: Optional['MetricsSink'] = None):
         self.base_url = base_url.rstrip("/")
         if api_key is None:
             api_key = os.environ.get("BORSDATA_API_KEY")
             if not api_key:
                 raise RuntimeError("BORSDATA_API_KEY environment variable must be set or api_key provided.")
         self.api_key = api_key
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.validate = validate
+        self.memory_cache = memory_cache
+        self.metrics = metrics
+        self._inflight = SingleFlight()
+        self.cache = cache
         self.session = requests.Session()
+        # Size the connection pool so batch workers don't block on each other.
+        adapter_cls = HTTPAdapter
+        if metrics is not None:
+            from .metrics import TimedHTTPAdapter as adapter_cls
+        adapter = adapter_cls(pool_connections=1, pool_maxsize=max(max_workers, 10))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         if api_key:
             self.session.headers.update({"Authorization": f"Bearer {api_key}"})
 
-    def _get(self, path: str, params: Optional[dict] = None):
+    def _request(self, path: str, params: Optional[dict] = None, stream: bool = False) -> requests.Response:
+        """Sends a GET through the rate limiter, retrying per `self.retry`, and raises on HTTP errors."""
         url = f"{self.base_url}{path}"
-        response = self.session.get(url, params=params)
+        if self.metrics is not None:
+            from .metrics import endpoint_template, timed_get
+            endpoint = endpoint_template(path)
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            if self.metrics is None:
+                response = self.session.get(url, params=params, stream=stream)
+            else:
+                response = timed_get(self.session, self.metrics, endpoint, url, params, stream)
+            if not self.retry.should_retry(response.status_code, attempt):
+                break
+            if self.metrics is not None:
+                self.metrics.increment(endpoint, "retries")
+            delay = self.retry.delay(attempt, response.headers.get("Retry-After"))
+            response.close()
+            if self.rate_limiter is not None and response.status_code == 429:
+                # Hold back every caller sharing the limiter, not just this one.
+                self.rate_limiter.pause(delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+        if self.metrics is not None and response.status_code >= 400:
+            self.metrics.increment(endpoint, "errors")
         response.raise_for_status()
-        return response.json()
+        return response
+
+    def _get(self, path: str, params: Optional[dict] = None):
+        if self.metrics is not None:
+            from .metrics import current_endpoint, endpoint_template
+            current_endpoint.set(endpoint_template(path))
+        # Identical concurrent GETs share one round trip.
+        key = (path, tuple(sorted(params.items())) if params else ())
+        return self._inflight.do(key, lambda: self._fetch(path, params))
+
+    def _fetch(self, path: str, params: Optional[dict] = None):
+        if self.cache is not None:
+            cached = self.cache.get(path, params)
+            if cached is not None:
+                if self.metrics is not None:
+                    from .metrics import endpoint_template
+                    self.metrics.increment(endpoint_template(path), "cache_hits")
+                return cached
+        response = self._request(path, params)
+        if self.cache is not None:
+            self.cache.set(path, params, response.content)
+        if self.metrics is None:
+            return loads(response.content)
+        from .metrics import endpoint_template
+        start = time.perf_counter()
+        data = loads(response.content)
+        self.metrics.observe(endpoint_template(path), "decode", time.perf_counter() - start)
+        return data
+
+    def _memoized(self, path: str, loader, params: Optional[dict] = None):
+        """Returns `loader()` through the in-memory cache, if one is configured."""
+        if self.memory_cache is None:
+            return loader()
+        key = (path, tuple(sorted(params.items())) if params else (), self.validate)
+        if self.metrics is None:
+            return self.memory_cache.get_or_load(key, loader)
+        loaded = []
+
+        def load():
+            loaded.append(True)
+            return loader()
+
+        value = self.memory_cache.get_or_load(key, load)
+        if not loaded:
+            from .metrics import endpoint_template
+            self.metrics.increment(endpoint_template(path), "cache_hits")
+        return value
+
+    def _stream(self, path: str, key: str, params: Optional[dict] = None, fields: Optional[dict] = None) -> Iterator:
+        """Yields the elements of the list under `key` as they arrive, without buffering the body. Bypasses the cache."""
+        if self.metrics is not None:
+            from .metrics import current_endpoint, endpoint_template
+            current_endpoint.set(endpoint_template(path))
+        response = self._request(path, params, stream=True)
+        try:
+            yield from iter_json_array(response.iter_content(chunk_size=STREAM_CHUNK_SIZE), key, fields)
+        finally:
+            response.close()
+
+    def refresh_cache(self) -> None:
+        """Drops cached responses that /v1/instruments/kpis/updated and /v1/instruments/updated report as changed."""
+        if self.cache is None:
+            return
+        self.cache.invalidate_kpis(self.get_kpis_updated().kpisCalcUpdated)
+        updated = self.get_instruments_updated(self.api_key).instruments or []
+        self.cache.invalidate_instruments((item.insId, item.updatedAt) for item in updated)
+
+    def with_validation(self, validate: bool) -> 'BorsdataAPIClient':
+        """Returns a view of this client sharing its connections, limiter and cache, with validation switched on or off."""
+        view = copy.copy(self)
+        view.validate = validate
+        return view
+
+    def _parse(self, model: Type[ModelT], data) -> ModelT:
+        """Validates decoded JSON into `model`, or builds a lightweight record of it when validation is off."""
+        start = time.perf_counter() if self.metrics is not None else None
+        result = model.parse_obj(data) if self.validate else build_record(model, data)
+        if start is not None:
+            from .metrics import current_endpoint
+            self.metrics.observe(current_endpoint.get(), "parse", time.perf_counter() - start)
+        return result
+
+    def _merge(self, model: Type[ModelT], field: str, responses: list) -> ModelT:
+        """Concatenates the `field` lists of chunked responses into one response."""
+        items = [item for resp in responses for item in getattr(resp, field) or []]
+        if self.validate:
+            return model(**{field: items})
+        return record_type(model)(**{field: items})
+
+    def _map_chunks(self, fetch, instruments: Iterable[int], max_workers: Optional[int] = None) -> list:
+        """Runs `fetch(instList)` for every 50-id chunk on a bounded pool, results in chunk order."""
+        chunks = [",".join(map(str, chunk)) for chunk in chunk_instruments(instruments)]
+        if len(chunks) <= 1:
+            return [fetch(chunk) for chunk in chunks]
+        workers = min(max_workers or self.max_workers, len(chunks))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(fetch, chunks))
+
+    def _iter_chunks(self, fetch, instruments: Iterable[int], prefetch: Optional[int] = None) -> Iterator:
+        """
+        Yields `fetch(instList)` for every 50-id chunk as each completes.
+
+        At most `prefetch` chunks (default `max_workers`) are in flight or
+        waiting to be consumed, counting the result the caller holds; chunks
+        are topped up each time the caller asks for the next result. Closing
+        the generator cancels chunks not yet started.
+        """
+        chunks = (",".join(map(str, chunk)) for chunk in chunk_instruments(instruments))
+        depth = max(1, prefetch or self.max_workers)
+        pool = ThreadPoolExecutor(max_workers=min(depth, self.max_workers))
+        pending: set = set()
+        ready: deque = deque()
+        try:
+            while True:
+                for chunk in itertools.islice(chunks, depth - len(pending) - len(ready)):
+                    pending.add(pool.submit(fetch, chunk))
+                if not ready:
+                    if not pending:
+                        return
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    ready.extend(done)
+                yield ready.popleft().result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
 
     # --- Instrument Meta ---
     def get_markets(self) -> 'MarketsRespV1':
         """Returns all Markets."""
         from .models import MarketsRespV1
-        return MarketsRespV1.parse_obj(self._get("/v1/markets"))
+        return self._memoized("/v1/markets", lambda: self._parse(MarketsRespV1, self._get("/v1/markets")))
 
     def get_sectors(self) -> 'SectorsRespV1':
         """Returns all Sectors."""
         from .models import SectorsRespV1
-        return SectorsRespV1.parse_obj(self._get("/v1/sectors"))
+        return self._memoized("/v1/sectors", lambda: self._parse(SectorsRespV1, self._get("/v1/sectors")))
 
     def get_translation_metadata(self, authKey: str) -> 'TranslationMetadataRespV1':
         """Returns translations for bransch, sector, country. Requires API key."""
         from .models import TranslationMetadataRespV1
-        return TranslationMetadataRespV1.parse_obj(self._get("/v1/translationmetadata", params={"authKey": authKey}))
+        params = {"authKey": authKey}
+        return self._memoized("/v1/translationmetadata", lambda: self._parse(TranslationMetadataRespV1, self._get("/v1/translationmetadata", params=params)), params)
+
+    def get_instruments(self, authKey: str) -> 'InstrumentsRespV1':
+        """Returns all Nordic Instruments."""
+        from .models import InstrumentsRespV1
+        return self._parse(InstrumentsRespV1, self._get("/v1/instruments", params={"authKey": authKey}))
+
+    def get_instruments_global(self, authKey: str) -> 'InstrumentsRespV1':
+        """Returns all Global Instruments. Only Global(Pro+)."""
+        from .models import InstrumentsRespV1
+        return self._parse(InstrumentsRespV1, self._get("/v1/instruments/global", params={"authKey": authKey}))
+
+    def get_instruments_updated(self, authKey: str) -> 'InstrumentUpdatedRespV1':
+        """Returns last Updated Nordic Instruments. Time when Nordic Instrument or Reports was updated."""
+        from .models import InstrumentUpdatedRespV1
+        return self._parse(InstrumentUpdatedRespV1, self._get("/v1/instruments/updated", params={"authKey": authKey}))
 
     # --- Reports ---
     def get_reports(self, instrument_id: int, reporttype: ReportType) -> 'ReportsRespV1':
         """Returns Reports for Instrument. Report Type (year, r12, quarter)."""
         from .models import ReportsRespV1
-        return ReportsRespV1.parse_obj(self._get(f"/v1/instruments/{instrument_id}/reports/{reporttype}"))
+        return self._parse(ReportsRespV1, self._get(f"/v1/instruments/{instrument_id}/reports/{reporttype}"))
 
     def get_reports_compound(self, instrument_id: int) -> 'ReportsCompoundRespV1':
         """Returns Reports for one Instrument. All Reports Type included (year, r12, quarter)."""
         from .models import ReportsCompoundRespV1
-        return ReportsCompoundRespV1.parse_obj(self._get(f"/v1/instruments/{instrument_id}/reports"))
+        return self._parse(ReportsCompoundRespV1, self._get(f"/v1/instruments/{instrument_id}/reports"))
 
     def get_reports_metadata(self) -> 'ReportMetadataRespV1':
         """Returns Report metadata."""
         from .models import ReportMetadataRespV1
-        return ReportMetadataRespV1.parse_obj(self._get("/v1/instruments/reports/metadata"))
+        return self._memoized("/v1/instruments/reports/metadata", lambda: self._parse(ReportMetadataRespV1, self._get("/v1/instruments/reports/metadata")))
 
-    def get_reports_array(self, instList: str, authKey: str, reporttype: Optional[ReportType] = None, from_date: str = None, to_date: str = None) -> 'ReportsArrayRespV1':
-        """Returns Reports for list of instruments. instList is comma-separated IDs. Optionally filter by reporttype."""
+    def get_reports_array(self, instList: str, authKey: str, reporttype: Optional[ReportType] = None, from_date: str = None, to_date: str = None,
+                          maxYearCount: Optional[int] = None, maxR12QCount: Optional[int] = None, original: Optional[bool] = None) -> 'ReportsArrayRespV1':
+        """Returns Reports for list of instruments. instList is comma-separated IDs. Optionally filter by reporttype; maxYearCount (max 20) and maxR12QCount (max 40) set the depth."""
         from .models import ReportsArrayRespV1
         params = {"instList": instList, "authKey": authKey}
         if reporttype:
@@ -82,43 +328,117 @@ class BorsdataAPIClient:
             params["from"] = from_date
         if to_date:
             params["to"] = to_date
-        return ReportsArrayRespV1.parse_obj(self._get("/v1/instruments/reports", params=params))
+        if maxYearCount:
+            params["maxYearCount"] = maxYearCount
+        if maxR12QCount:
+            params["maxR12QCount"] = maxR12QCount
+        if original is not None:
+            params["original"] = str(original).lower()
+        return self._parse(ReportsArrayRespV1, self._get("/v1/instruments/reports", params=params))
+
+    def get_reports_array_batch(self, instruments: Iterable[int], authKey: str, reporttype: Optional[ReportType] = None, from_date: str = None, to_date: str = None, max_workers: Optional[int] = None,
+                                maxYearCount: Optional[int] = None, maxR12QCount: Optional[int] = None, original: Optional[bool] = None) -> 'ReportsArrayRespV1':
+        """Returns Reports for any number of instruments, fetched concurrently in chunks of 50."""
+        from .models import ReportsArrayRespV1
+        responses = self._map_chunks(
+            lambda instList: self.get_reports_array(instList, authKey, reporttype, from_date, to_date, maxYearCount, maxR12QCount, original),
+            instruments, max_workers,
+        )
+        return self._merge(ReportsArrayRespV1, "reportList", responses)
+
+    def iter_reports(self, instruments: Iterable[int], authKey: str, reporttype: Optional[ReportType] = None, from_date: str = None, to_date: str = None, prefetch: Optional[int] = None,
+                     maxYearCount: Optional[int] = None, maxR12QCount: Optional[int] = None) -> Iterator['ReportsCombineRespV1']:
+        """Yields Reports per instrument for any number of instruments, prefetching chunks of 50 in the background."""
+        for resp in self._iter_chunks(lambda instList: self.get_reports_array(instList, authKey, reporttype, from_date, to_date, maxYearCount, maxR12QCount), instruments, prefetch):
+            yield from resp.reportList or []
 
     # --- StockPrices ---
-    def get_stockprices(self, instrument_id: int) -> 'StockPricesRespV1':
-        """Returns StockPrice for Instrument. 10 year default."""
+    def get_stockprices(self, instrument_id: int, as_arrays: bool = False) -> Union['StockPricesRespV1', 'PriceArrays']:
+        """Returns StockPrice for Instrument. 10 year default. as_arrays returns columnar PriceArrays instead of models."""
         from .models import StockPricesRespV1
-        return StockPricesRespV1.parse_obj(self._get(f"/v1/instruments/{instrument_id}/stockprices"))
+        data = self._get(f"/v1/instruments/{instrument_id}/stockprices")
+        if as_arrays:
+            from .arrays import decode_price_list
+            return decode_price_list(data.get("stockPricesList"), instrument=data.get("instrument"))
+        return self._parse(StockPricesRespV1, data)
 
-    def get_stockprices_last(self, authKey: str) -> 'StockPricesLastRespV1':
+    def get_stockprices_last(self, authKey: str, as_arrays: bool = False) -> Union['StockPricesLastRespV1', 'PriceArrays']:
         """Returns Last StockPrices for all Instruments. Only Nordic(Pro)."""
         from .models import StockPricesLastRespV1
-        return StockPricesLastRespV1.parse_obj(self._get("/v1/instruments/stockprices/last", params={"authKey": authKey}))
+        data = self._get("/v1/instruments/stockprices/last", params={"authKey": authKey})
+        if as_arrays:
+            from .arrays import decode_price_list
+            return decode_price_list(data.get("stockPricesList"), with_instrument=True)
+        return self._parse(StockPricesLastRespV1, data)
 
-    def get_stockprices_global_last(self, authKey: str) -> 'StockPricesGlobalLastRespV1':
+    def get_stockprices_global_last(self, authKey: str, as_arrays: bool = False) -> Union['StockPricesGlobalLastRespV1', 'PriceArrays']:
         """Returns Last/Latest StockPrices for all Global Instruments. Only Global(Pro+)."""
         from .models import StockPricesGlobalLastRespV1
-        return StockPricesGlobalLastRespV1.parse_obj(self._get("/v1/instruments/stockprices/global/last", params={"authKey": authKey}))
+        data = self._get("/v1/instruments/stockprices/global/last", params={"authKey": authKey})
+        if as_arrays:
+            from .arrays import decode_price_list
+            return decode_price_list(data.get("stockPricesList"), with_instrument=True)
+        return self._parse(StockPricesGlobalLastRespV1, data)
+
+    def stream_stockprices_last(self, authKey: str) -> Iterator['StockPriceFullV1']:
+        """Streams Last StockPrices for all Instruments, yielding each row as it arrives. Only Nordic(Pro)."""
+        from .models import StockPriceFullV1
+        for row in self._stream("/v1/instruments/stockprices/last", "stockPricesList", params={"authKey": authKey}):
+            yield self._parse(StockPriceFullV1, row)
+
+    def stream_stockprices_global_last(self, authKey: str) -> Iterator['StockPriceFullV1']:
+        """Streams Last/Latest StockPrices for all Global Instruments, yielding each row as it arrives. Only Global(Pro+)."""
+        from .models import StockPriceFullV1
+        for row in self._stream("/v1/instruments/stockprices/global/last", "stockPricesList", params={"authKey": authKey}):
+            yield self._parse(StockPriceFullV1, row)
 
-    def get_stockprices_date(self, authKey: str, date: str) -> 'StockPricesDateRespV1':
+    def get_stockprices_date(self, authKey: str, date: str, as_arrays: bool = False) -> Union['StockPricesDateRespV1', 'PriceArrays']:
         """Returns one StockPrice for each Instrument for a specific date. Only Nordic(Pro)."""
         from .models import StockPricesDateRespV1
-        return StockPricesDateRespV1.parse_obj(self._get("/v1/instruments/stockprices/date", params={"authKey": authKey, "date": date}))
+        data = self._get("/v1/instruments/stockprices/date", params={"authKey": authKey, "date": date})
+        if as_arrays:
+            from .arrays import decode_price_list
+            return decode_price_list(data.get("stockPricesList"), with_instrument=True)
+        return self._parse(StockPricesDateRespV1, data)
 
-    def get_stockprices_global_date(self, authKey: str, date: str) -> 'StockPricesGlobalDateRespV1':
+    def get_stockprices_global_date(self, authKey: str, date: str, as_arrays: bool = False) -> Union['StockPricesGlobalDateRespV1', 'PriceArrays']:
         """Returns one StockPrice for each global Instrument for a specific date. Only Global(Pro+)."""
         from .models import StockPricesGlobalDateRespV1
-        return StockPricesGlobalDateRespV1.parse_obj(self._get("/v1/instruments/stockprices/global/date", params={"authKey": authKey, "date": date}))
+        data = self._get("/v1/instruments/stockprices/global/date", params={"authKey": authKey, "date": date})
+        if as_arrays:
+            from .arrays import decode_price_list
+            return decode_price_list(data.get("stockPricesList"), with_instrument=True)
+        return self._parse(StockPricesGlobalDateRespV1, data)
 
-    def get_stockprices_array(self, instList: str, authKey: str, from_date: str = None, to_date: str = None) -> 'StockPricesArrayRespV1':
-        """Returns StockPrice for list of Instruments. instList is comma-separated IDs."""
+    def get_stockprices_array(self, instList: str, authKey: str, from_date: str = None, to_date: str = None, as_arrays: bool = False) -> Union['StockPricesArrayRespV1', Dict[int, 'PriceArrays']]:
+        """Returns StockPrice for list of Instruments. instList is comma-separated IDs. as_arrays returns one PriceArrays block per instrument."""
         from .models import StockPricesArrayRespV1
         params = {"instList": instList, "authKey": authKey}
         if from_date:
             params["from"] = from_date
         if to_date:
             params["to"] = to_date
-        return StockPricesArrayRespV1.parse_obj(self._get("/v1/instruments/stockprices", params=params))
+        data = self._get("/v1/instruments/stockprices", params=params)
+        if as_arrays:
+            from .arrays import decode_price_array_list
+            return decode_price_array_list(data.get("stockPricesArrayList"))
+        return self._parse(StockPricesArrayRespV1, data)
+
+    def get_stockprices_array_batch(self, instruments: Iterable[int], authKey: str, from_date: str = None, to_date: str = None, max_workers: Optional[int] = None, as_arrays: bool = False) -> Union['StockPricesArrayRespV1', Dict[int, 'PriceArrays']]:
+        """Returns StockPrice for any number of instruments, fetched concurrently in chunks of 50."""
+        from .models import StockPricesArrayRespV1
+        responses = self._map_chunks(
+            lambda instList: self.get_stockprices_array(instList, authKey, from_date, to_date, as_arrays=as_arrays),
+            instruments, max_workers,
+        )
+        if as_arrays:
+            return {ins_id: block for resp in responses for ins_id, block in resp.items()}
+        return self._merge(StockPricesArrayRespV1, "stockPricesArrayList", responses)
+
+    def iter_stockprices(self, instruments: Iterable[int], authKey: str, from_date: str = None, to_date: str = None, prefetch: Optional[int] = None, as_arrays: bool = False) -> Iterator[Union['StockPricesArrayRespListV1', 'PriceArrays']]:
+        """Yields StockPrice per instrument for any number of instruments, prefetching chunks of 50 in the background."""
+        for resp in self._iter_chunks(lambda instList: self.get_stockprices_array(instList, authKey, from_date, to_date, as_arrays=as_arrays), instruments, prefetch):
+            yield from resp.values() if as_arrays else resp.stockPricesArrayList or []
 
     def get_stock_splits(self, authKey: str, from_date: str = None) -> 'StockSplitRespV1':
         """Returns Stock Splits for Nordic Instruments. Max 1 Year."""
@@ -126,56 +446,153 @@ class BorsdataAPIClient:
         params = {"authKey": authKey}
         if from_date:
             params["from"] = from_date
-        return StockSplitRespV1.parse_obj(self._get("/v1/instruments/StockSplits", params=params))
+        return self._parse(StockSplitRespV1, self._get("/v1/instruments/StockSplits", params=params))
 
     # --- KPIs ---
     def get_kpi_history(self, insid: int, kpiId: int, reporttype: ReportType, pricetype: PriceType) -> 'KpisHistoryRespV1':
         """Returns KPI history for an instrument."""
         from .models import KpisHistoryRespV1
-        return KpisHistoryRespV1.parse_obj(self._get(f"/v1/instruments/{insid}/kpis/{kpiId}/{reporttype}/{pricetype}/history"))
+        return self._parse(KpisHistoryRespV1, self._get(f"/v1/instruments/{insid}/kpis/{kpiId}/{reporttype}/{pricetype}/history"))
 
     def get_kpi_summary(self, insid: int, reporttype: ReportType) -> 'KpisSummaryRespV1':
         """Returns KPI summary for an instrument."""
         from .models import KpisSummaryRespV1
-        return KpisSummaryRespV1.parse_obj(self._get(f"/v1/instruments/{insid}/kpis/{reporttype}/summary"))
+        return self._parse(KpisSummaryRespV1, self._get(f"/v1/instruments/{insid}/kpis/{reporttype}/summary"))
 
-    def get_kpi_history_alt(self, kpiId: int, reporttype: ReportType, pricetype: PriceType) -> 'KpisHistoryArrayRespV1':
-        """Returns KPI history for all instruments for a KPI."""
+    def get_kpi_history_alt(self, kpiId: int, reporttype: ReportType, pricetype: PriceType, instList: Optional[str] = None) -> 'KpisHistoryArrayRespV1':
+        """Returns KPI history for all instruments for a KPI, or for instList (comma-separated IDs) only."""
         from .models import KpisHistoryArrayRespV1
-        return KpisHistoryArrayRespV1.parse_obj(self._get(f"/v1/instruments/kpis/{kpiId}/{reporttype}/{pricetype}/history"))
+        params = {"instList": instList} if instList else None
+        return self._parse(KpisHistoryArrayRespV1, self._get(f"/v1/instruments/kpis/{kpiId}/{reporttype}/{pricetype}/history", params=params))
+
+    def iter_kpi_history(self, kpiId: int, reporttype: ReportType, pricetype: PriceType, instruments: Iterable[int], prefetch: Optional[int] = None) -> Iterator['KpisHistoryCompV1']:
+        """Yields KPI history per instrument for any number of instruments, prefetching chunks of 50 in the background."""
+        for resp in self._iter_chunks(lambda instList: self.get_kpi_history_alt(kpiId, reporttype, pricetype, instList), instruments, prefetch):
+            yield from resp.kpisList or []
+
+    def stream_kpi_history_alt(self, kpiId: int, reporttype: ReportType, pricetype: PriceType, instList: Optional[str] = None) -> Iterator['KpisHistoryCompV1']:
+        """Streams KPI history for all instruments for a KPI, or for instList (comma-separated IDs) only, yielding each instrument as it arrives."""
+        from .models import KpisHistoryCompV1
+        params = {"instList": instList} if instList else None
+        for row in self._stream(f"/v1/instruments/kpis/{kpiId}/{reporttype}/{pricetype}/history", "kpisList", params=params):
+            yield self._parse(KpisHistoryCompV1, row)
 
     def get_kpi_calc(self, insid: int, kpiId: int, calcGroup: CalcGroup, calc: Calc) -> 'KpisRespV1':
         """Returns calculated KPI for an instrument."""
         from .models import KpisRespV1
-        return KpisRespV1.parse_obj(self._get(f"/v1/instruments/{insid}/kpis/{kpiId}/{calcGroup}/{calc}"))
+        return self._parse(KpisRespV1, self._get(f"/v1/instruments/{insid}/kpis/{kpiId}/{calcGroup}/{calc}"))
 
     def get_kpi_calc_alt(self, kpiId: int, calcGroup: CalcGroup, calc: Calc) -> 'KpisAllCompRespV1':
         """Returns calculated KPI for all instruments for a KPI."""
         from .models import KpisAllCompRespV1
-        return KpisAllCompRespV1.parse_obj(self._get(f"/v1/instruments/kpis/{kpiId}/{calcGroup}/{calc}"))
+        return self._parse(KpisAllCompRespV1, self._get(f"/v1/instruments/kpis/{kpiId}/{calcGroup}/{calc}"))
 
     def get_kpi_calc_global(self, kpiId: int, calcGroup: CalcGroup, calc: Calc) -> 'KpisAllCompRespV1':
         """Returns calculated KPI for all global instruments for a KPI."""
         from .models import KpisAllCompRespV1
-        return KpisAllCompRespV1.parse_obj(self._get(f"/v1/instruments/global/kpis/{kpiId}/{calcGroup}/{calc}"))
+        return self._parse(KpisAllCompRespV1, self._get(f"/v1/instruments/global/kpis/{kpiId}/{calcGroup}/{calc}"))
+
+    def stream_kpi_calc_alt(self, kpiId: int, calcGroup: CalcGroup, calc: Calc) -> Iterator['KpiV1']:
+        """Streams calculated KPI for all instruments for a KPI, yielding each value as it arrives."""
+        from .models import KpiV1
+        for row in self._stream(f"/v1/instruments/kpis/{kpiId}/{calcGroup}/{calc}", "values"):
+            yield self._parse(KpiV1, row)
+
+    def stream_kpi_calc_global(self, kpiId: int, calcGroup: CalcGroup, calc: Calc) -> Iterator['KpiV1']:
+        """Streams calculated KPI for all global instruments for a KPI, yielding each value as it arrives."""
+        from .models import KpiV1
+        for row in self._stream(f"/v1/instruments/global/kpis/{kpiId}/{calcGroup}/{calc}", "values"):
+            yield self._parse(KpiV1, row)
 
     def get_kpis_updated(self) -> 'KpisCalcUpdatedRespV1':
         """Returns updated KPIs."""
         from .models import KpisCalcUpdatedRespV1
-        return KpisCalcUpdatedRespV1.parse_obj(self._get("/v1/instruments/kpis/updated"))
+        return self._parse(KpisCalcUpdatedRespV1, self._get("/v1/instruments/kpis/updated"))
 
     def get_kpis_metadata(self) -> 'KpiMetadataRespV1':
         """Returns KPI metadata."""
         from .models import KpiMetadataRespV1
-        return KpiMetadataRespV1.parse_obj(self._get("/v1/instruments/kpis/metadata"))
+        return self._memoized("/v1/instruments/kpis/metadata", lambda: self._parse(KpiMetadataRespV1, self._get("/v1/instruments/kpis/metadata")))
+
+    # --- Holdings ---
+    def get_holdings_insider(self, instList: str, authKey: str) -> 'HoldingsInsiderTableArrayRespV1':
+        """Returns insider transactions for list of instruments. instList is comma-separated IDs, max 50."""
+        from .models import HoldingsInsiderTableArrayRespV1
+        return self._parse(HoldingsInsiderTableArrayRespV1, self._get("/v1/holdings/insider", params={"instList": instList, "authKey": authKey}))
+
+    def get_holdings_insider_batch(self, instruments: Iterable[int], authKey: str, max_workers: Optional[int] = None) -> 'HoldingsInsiderTableArrayRespV1':
+        """Returns insider transactions for any number of instruments, fetched concurrently in chunks of 50."""
+        from .models import HoldingsInsiderTableArrayRespV1
+        responses = self._map_chunks(lambda instList: self.get_holdings_insider(instList, authKey), instruments, max_workers)
+        return self._merge(HoldingsInsiderTableArrayRespV1, "list", responses)
+
+    def iter_holdings_insider(self, instruments: Iterable[int], authKey: str, prefetch: Optional[int] = None) -> Iterator['InsiderRespV1']:
+        """Yields insider transactions per instrument for any number of instruments, prefetching chunks of 50 in the background."""
+        for resp in self._iter_chunks(lambda instList: self.get_holdings_insider(instList, authKey), instruments, prefetch):
+            yield from resp.list or []
+
+    def get_holdings_shorts(self, authKey: str) -> 'HoldingsShortsTableRespV1':
+        """Returns short positions for all instruments."""
+        from .models import HoldingsShortsTableRespV1
+        return self._parse(HoldingsShortsTableRespV1, self._get("/v1/holdings/shorts", params={"authKey": authKey}))
+
+    def get_holdings_buyback(self, instList: str, authKey: str) -> 'HoldingsBuybackArrayRespV1':
+        """Returns buybacks for list of instruments. instList is comma-separated IDs, max 50."""
+        from .models import HoldingsBuybackArrayRespV1
+        return self._parse(HoldingsBuybackArrayRespV1, self._get("/v1/holdings/buyback", params={"instList": instList, "authKey": authKey}))
+
+    def get_holdings_buyback_batch(self, instruments: Iterable[int], authKey: str, max_workers: Optional[int] = None) -> 'HoldingsBuybackArrayRespV1':
+        """Returns buybacks for any number of instruments, fetched concurrently in chunks of 50."""
+        from .models import HoldingsBuybackArrayRespV1
+        responses = self._map_chunks(lambda instList: self.get_holdings_buyback(instList, authKey), instruments, max_workers)
+        return self._merge(HoldingsBuybackArrayRespV1, "list", responses)
+
+    def iter_holdings_buyback(self, instruments: Iterable[int], authKey: str, prefetch: Optional[int] = None) -> Iterator['BuybackRespV1']:
+        """Yields buybacks per instrument for any number of instruments, prefetching chunks of 50 in the background."""
+        for resp in self._iter_chunks(lambda instList: self.get_holdings_buyback(instList, authKey), instruments, prefetch):
+            yield from resp.list or []
+
+    # --- Calendars ---
+    def get_report_calendar(self, instList: str, authKey: str) -> 'CompaniesCalenderArrayRespV1':
+        """Returns the report calendar for list of instruments. instList is comma-separated IDs, max 50."""
+        from .models import CompaniesCalenderArrayRespV1
+        return self._parse(CompaniesCalenderArrayRespV1, self._get("/v1/instruments/report/calendar", params={"instList": instList, "authKey": authKey}))
+
+    def get_report_calendar_batch(self, instruments: Iterable[int], authKey: str, max_workers: Optional[int] = None) -> 'CompaniesCalenderArrayRespV1':
+        """Returns the report calendar for any number of instruments, fetched concurrently in chunks of 50."""
+        from .models import CompaniesCalenderArrayRespV1
+        responses = self._map_chunks(lambda instList: self.get_report_calendar(instList, authKey), instruments, max_workers)
+        return self._merge(CompaniesCalenderArrayRespV1, "list", responses)
+
+    def get_dividend_calendar(self, instList: str, authKey: str) -> 'CompaniesDividendArrayRespV1':
+        """Returns the dividend calendar for list of instruments. instList is comma-separated IDs, max 50."""
+        from .models import CompaniesDividendArrayRespV1
+        return self._parse(CompaniesDividendArrayRespV1, self._get("/v1/instruments/dividend/calendar", params={"instList": instList, "authKey": authKey}))
+
+    def get_dividend_calendar_batch(self, instruments: Iterable[int], authKey: str, max_workers: Optional[int] = None) -> 'CompaniesDividendArrayRespV1':
+        """Returns the dividend calendar for any number of instruments, fetched concurrently in chunks of 50."""
+        from .models import CompaniesDividendArrayRespV1
+        responses = self._map_chunks(lambda instList: self.get_dividend_calendar(instList, authKey), instruments, max_workers)
+        return self._merge(CompaniesDividendArrayRespV1, "list", responses)
+
+    def get_instruments_description(self, instList: str, authKey: str) -> 'CompaniesDescriptionArrayRespV1':
+        """Returns company descriptions for list of instruments. instList is comma-separated IDs, max 50."""
+        from .models import CompaniesDescriptionArrayRespV1
+        return self._parse(CompaniesDescriptionArrayRespV1, self._get("/v1/instruments/description", params={"instList": instList, "authKey": authKey}))
+
+    def get_instruments_description_batch(self, instruments: Iterable[int], authKey: str, max_workers: Optional[int] = None) -> 'CompaniesDescriptionArrayRespV1':
+        """Returns company descriptions for any number of instruments, fetched concurrently in chunks of 50."""
+        from .models import CompaniesDescriptionArrayRespV1
+        responses = self._map_chunks(lambda instList: self.get_instruments_description(instList, authKey), instruments, max_workers)
+        return self._merge(CompaniesDescriptionArrayRespV1, "list", responses)
 
     # --- Miscellaneous ---
     def get_branches(self) -> 'BranchesRespV1':
         """Returns all Branches."""
         from .models import BranchesRespV1
-        return BranchesRespV1.parse_obj(self._get("/v1/branches"))
+        return self._memoized("/v1/branches", lambda: self._parse(BranchesRespV1, self._get("/v1/branches")))
 
     def get_countries(self) -> 'CountriesRespV1':
         """Returns all Countries."""
         from .models import CountriesRespV1
-        return CountriesRespV1.parse_obj(self._get("/v1/countries"))
+        return self._memoized("/v1/countries", lambda: self._parse(CountriesRespV1, self._get("/v1/countries")))
@@ -0,0 +1,123 @@
+"""
+JSON decoding for Borsdata API responses.
+
+`loads` uses orjson when it is installed and falls back to the standard
+library otherwise. `iter_json_array` decodes one list of a JSON object
+incrementally from a stream of byte chunks, yielding each element as soon as it
+is complete so peak memory stays proportional to one chunk, not the payload.
+"""
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+def loads(data: bytes) -> Any:
+    """Decodes a complete JSON document with the fastest available parser."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class _Buffer:
+    """Text buffer fed from byte chunks, with a read position."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.exhausted = False
+
+    def fill(self) -> bool:
+        """Reads one more chunk, dropping consumed text. Returns False at end of stream."""
+        if self.exhausted:
+            return False
+        self.text = self.text[self.pos:]
+        self.pos = 0
+        for chunk in self._chunks:
+            if chunk:
+                self.text += self._utf8.decode(chunk)
+                return True
+        self.text += self._utf8.decode(b"", final=True)
+        self.exhausted = True
+        return False
+
+    def peek(self) -> str:
+        """Returns the next non-whitespace character, reading more data as needed."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} in JSON stream")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decodes the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.exhausted:
+                    raise
+                self.fill()
+                continue
+            # A value ending exactly at the buffer edge may be a truncated number.
+            if end >= len(self.text) and not self.exhausted:
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str, fields: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """
+    Yields the elements of the list under top-level `key` of a streamed JSON object.
+
+    Other top-level members are decoded normally and, if `fields` is given,
+    stored in it. A null list yields nothing.
+    """
+    buf = _Buffer(chunks)
+    buf.expect("{")
+    if buf.peek() == "}":
+        return
+    while True:
+        name = buf.value()
+        buf.expect(":")
+        if name == key and buf.peek() == "[":
+            buf.pos += 1
+            if buf.peek() == "]":
+                buf.pos += 1
+            else:
+                while True:
+                    yield buf.value()
+                    if buf.peek() == ",":
+                        buf.pos += 1
+                        continue
+                    buf.expect("]")
+                    break
+        else:
+            value = buf.value()
+            if fields is not None:
+                fields[name] = value
+        if buf.peek() == ",":
+            buf.pos += 1
+            continue
+        buf.expect("}")
+        return
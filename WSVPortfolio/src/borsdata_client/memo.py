@@ -0,0 +1,130 @@
+"""
+In-process request coalescing and memoization.
+
+`SingleFlight` merges identical concurrent calls: the first caller runs the
+call, later callers with the same key block until it finishes and share its
+result (or exception). `MemoryCache` keeps parsed results in a bounded LRU with
+a per-endpoint TTL, loads misses through a SingleFlight, and counts hits and
+misses. Both are thread-safe.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; concurrent callers share its outcome."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+# Default time-to-live in seconds per endpoint path.
+DEFAULT_TTLS = {
+    "/v1/markets": 24 * 3600,
+    "/v1/sectors": 24 * 3600,
+    "/v1/branches": 24 * 3600,
+    "/v1/countries": 24 * 3600,
+    "/v1/translationmetadata": 24 * 3600,
+    "/v1/instruments/kpis/metadata": 24 * 3600,
+    "/v1/instruments/reports/metadata": 24 * 3600,
+}
+
+
+class MemoryCache:
+    """
+    Bounded LRU of parsed responses with a TTL per endpoint path.
+
+    Keys are tuples whose first item is the endpoint path. Cached objects are
+    shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize: int = 256, ttls: Optional[Dict[str, float]] = None, default_ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_load(self, key: tuple, loader: Callable[[], Any]) -> Any:
+        """Returns the cached value for `key`, calling `loader` (once across threads) on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        return self._flight.do(key, lambda: self._load(key, loader))
+
+    def _load(self, key: tuple, loader: Callable[[], Any]) -> Any:
+        value = loader()
+        expires = time.monotonic() + self.ttls.get(key[0], self.default_ttl)
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Drops all entries, or those loaded from one endpoint path."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == path]:
+                    del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit, miss, coalesced-load and eviction counters and the current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self._flight.coalesced,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
@@ -0,0 +1,266 @@
+"""
+Per-endpoint request metrics for Borsdata API clients.
+
+Pass a sink as `metrics=` to a client to time each request phase per
+endpoint template. Templates are paths with numeric segments replaced by
+`{id}`. The phases are:
+
+- `dns`: host resolution (async client only; the sync client counts it in
+  `connect`).
+- `connect`: opening a new connection, including TLS.
+- `ttfb`: request sent until the response headers, excluding connect.
+- `download`: reading the body.
+- `decode`: JSON decoding.
+- `parse`: building models or records. Building PriceArrays for `as_arrays`
+  calls happens after `decode` and is not timed.
+
+Sinks also receive the counters `requests`, `bytes`, `errors` (final
+status >= 400), `retries` and `cache_hits`.
+
+A sink is any object with `observe(endpoint, phase, seconds)` and
+`increment(endpoint, counter, value)`. `HistogramMetrics` keeps fixed-bucket
+histograms in memory and summarizes them. `PrometheusMetrics` also renders
+them in the Prometheus text format. Without a sink the clients skip all of
+this behind one `is None` check per step.
+"""
+import bisect
+import contextvars
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Optional, Protocol, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Upper bounds (seconds) of the histogram buckets; the last bucket is +Inf.
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+PHASES = ("dns", "connect", "ttfb", "download", "decode", "parse")
+
+_NUMERIC = re.compile(r"/\d+(?=/|$)")
+_templates: Dict[str, str] = {}
+
+# Endpoint of the last request made in the current thread or task, for `parse`.
+current_endpoint: contextvars.ContextVar[str] = contextvars.ContextVar("borsdata_endpoint", default="")
+
+
+class MetricsSink(Protocol):
+    def observe(self, endpoint: str, phase: str, seconds: float) -> None: ...
+
+    def increment(self, endpoint: str, counter: str, value: float = 1) -> None: ...
+
+
+def endpoint_template(path: str) -> str:
+    """Replaces numeric path segments with `{id}`: /v1/instruments/3/stockprices -> /v1/instruments/{id}/stockprices."""
+    template = _templates.get(path)
+    if template is None:
+        template = _templates[path] = _NUMERIC.sub("/{id}", path)
+    return template
+
+
+class HistogramMetrics:
+    """
+    Thread-safe in-memory histograms per (endpoint, phase) and counters per (endpoint, counter).
+
+    `buckets` are increasing upper bounds in seconds; a final +Inf bucket is added if missing.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        buckets = tuple(float(b) for b in buckets)
+        if any(a >= b for a, b in zip(buckets, buckets[1:])):
+            raise ValueError(f"buckets must be strictly increasing, got {buckets}")
+        if not buckets or buckets[-1] != float("inf"):
+            buckets += (float("inf"),)
+        self.buckets = buckets
+        self._histograms: Dict[Tuple[str, str], list] = {}
+        self._counters: Dict[Tuple[str, str], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint: str, phase: str, seconds: float) -> None:
+        k = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            hist = self._histograms.get((endpoint, phase))
+            if hist is None:
+                # [bucket counts, count, sum, max]
+                hist = self._histograms[(endpoint, phase)] = [[0] * len(self.buckets), 0, 0.0, 0.0]
+            hist[0][k] += 1
+            hist[1] += 1
+            hist[2] += seconds
+            hist[3] = max(hist[3], seconds)
+
+    def increment(self, endpoint: str, counter: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[(endpoint, counter)] += value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def _quantile(self, counts: list, total: int, maximum: float, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile, capped at the largest observation."""
+        rank, seen = q * total, 0
+        for bound, count in zip(self.buckets, counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, maximum)
+        return maximum
+
+    def summary(self) -> Dict[str, dict]:
+        """
+        Returns {endpoint: {phase: {count, sum, mean, p50, p99, max}, counter: value}}.
+
+        Quantiles are bucket upper bounds, so they are estimates.
+        """
+        out: Dict[str, dict] = defaultdict(dict)
+        with self._lock:
+            for (endpoint, phase), (counts, total, seconds, maximum) in self._histograms.items():
+                out[endpoint][phase] = {
+                    "count": total, "sum": seconds, "mean": seconds / total, "max": maximum,
+                    "p50": self._quantile(counts, total, maximum, 0.5), "p99": self._quantile(counts, total, maximum, 0.99),
+                }
+            for (endpoint, counter), value in self._counters.items():
+                out[endpoint][counter] = value
+        return dict(out)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class PrometheusMetrics(HistogramMetrics):
+    """HistogramMetrics that renders itself in the Prometheus text exposition format."""
+
+    def __init__(self, prefix: str = "borsdata_client", buckets: Tuple[float, ...] = BUCKETS):
+        super().__init__(buckets)
+        self.prefix = prefix
+
+    def render(self) -> str:
+        """Returns all histograms and counters as Prometheus text."""
+        with self._lock:
+            histograms = {key: (list(h[0]), h[1], h[2]) for key, h in self._histograms.items()}
+            counters = dict(self._counters)
+        name = f"{self.prefix}_phase_seconds"
+        lines = [f"# HELP {name} Borsdata API request time by endpoint and phase.", f"# TYPE {name} histogram"]
+        for (endpoint, phase), (counts, total, seconds) in sorted(histograms.items()):
+            labels = f'endpoint="{_escape(endpoint)}",phase="{phase}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {seconds!r}")
+            lines.append(f"{name}_count{{{labels}}} {total}")
+        by_counter: Dict[str, list] = defaultdict(list)
+        for (endpoint, counter), value in counters.items():
+            by_counter[counter].append((endpoint, value))
+        for counter, rows in sorted(by_counter.items()):
+            name = f"{self.prefix}_{counter}_total"
+            lines.append(f"# TYPE {name} counter")
+            for endpoint, value in sorted(rows):
+                text = str(int(value)) if float(value).is_integer() else repr(float(value))
+                lines.append(f'{name}{{endpoint="{_escape(endpoint)}"}} {text}')
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """Writes `render()` atomically, e.g. for node_exporter's textfile collector."""
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+
+# --- Connection timing for requests/urllib3 ---
+_connect = threading.local()
+
+
+def take_connect_seconds() -> float:
+    """Returns and clears the time this thread spent opening connections since the last call."""
+    seconds = getattr(_connect, "seconds", 0.0)
+    _connect.seconds = 0.0
+    return seconds
+
+
+class _TimedConnect:
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect.seconds = getattr(_connect, "seconds", 0.0) + time.perf_counter() - start
+
+
+class _TimedHTTPConnection(_TimedConnect, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnect, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections record their connect time for `take_connect_seconds()`."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool, "https": _TimedHTTPSConnectionPool}
+
+
+def timed_get(session, metrics, endpoint: str, url: str, params: Optional[dict], stream: bool):
+    """session.get() recording connect, ttfb and (unless streaming) download time and bytes."""
+    take_connect_seconds()
+    start = time.perf_counter()
+    response = session.get(url, params=params, stream=True)
+    headers_at = time.perf_counter()
+    connect = take_connect_seconds()
+    if connect:
+        metrics.observe(endpoint, "connect", connect)
+    metrics.observe(endpoint, "ttfb", headers_at - start - connect)
+    metrics.increment(endpoint, "requests")
+    if not stream:
+        body = response.content
+        metrics.observe(endpoint, "download", time.perf_counter() - headers_at)
+        metrics.increment(endpoint, "bytes", len(body))
+    return response
+
+
+# --- Connection timing for aiohttp ---
+def aiohttp_trace_config():
+    """TraceConfig storing DNS and connection-create times in the request's `trace_request_ctx` dict."""
+    import aiohttp
+
+    def stamp(key):
+        async def handler(session, ctx, params):
+            if ctx.trace_request_ctx is not None:
+                ctx.trace_request_ctx[key] = time.perf_counter()
+        return handler
+
+    config = aiohttp.TraceConfig()
+    config.on_dns_resolvehost_start.append(stamp("dns_start"))
+    config.on_dns_resolvehost_end.append(stamp("dns_end"))
+    config.on_connection_create_start.append(stamp("connect_start"))
+    config.on_connection_create_end.append(stamp("connect_end"))
+    return config
+
+
+def observe_trace(metrics, endpoint: str, trace: dict) -> float:
+    """Records dns/connect from a trace dict; returns the seconds they took."""
+    dns = trace.get("dns_end", 0.0) - trace.get("dns_start", 0.0)
+    connect = trace.get("connect_end", 0.0) - trace.get("connect_start", 0.0)
+    if dns > 0:
+        metrics.observe(endpoint, "dns", dns)
+    if connect > 0:
+        metrics.observe(endpoint, "connect", connect - max(dns, 0.0))
+    return max(connect, 0.0)
@@ -0,0 +1,481 @@
+"""
+Local stand-in for the Borsdata API, driven by the OpenAPI spec.
+
+`MockBorsdataServer` serves every GET path in `src/data/borsdataAPI.json`
+from a local HTTP server. Responses are synthesized from the response
+schemas:
+
+- Top-level lists of per-instrument items are scaled to the universe. That
+  is `universe` instruments, or the requested `instList`.
+- Price lists cover the requested `from`/`to` weekdays, or the last
+  `history` weekdays.
+- Report and KPI histories get `maxCount`-style depths.
+- Other lists get a few rows.
+
+Recorded responses can replace the synthesized ones per path template. Their
+per-instrument lists are cycled up to the same sizes with the ids rewritten.
+Fixtures may be keyed by spec path template or by the example names that
+`scripts/generate_api_examples.py` records (see `EXAMPLE_TEMPLATES`).
+
+Every response is deterministic for a given seed, path and query, and the
+encoded body is cached. The client under test is then the bottleneck, not
+the server. Latency, 429s (random, or a fixed-window rate limit) and 500s
+can be injected to exercise retries and rate limiting:
+
+    with MockBorsdataServer(universe=2000, latency=0.02) as server:
+        client = BorsdataAPIClient(base_url=server.url, api_key="test")
+        client.get_stockprices_last("test")
+
+or standalone, so the server does not share the client's GIL:
+
+    python -m borsdata_client.mock_server --port 8080 --universe 2000
+"""
+import argparse
+import datetime as dt
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlsplit
+
+SPEC_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "borsdataAPI.json")
+
+# Fields holding the id of the instrument a row belongs to.
+ID_FIELDS = ("insId", "instrument", "i", "instrumentId")
+# Query parameters bounding the depth of history lists, by list name.
+DEPTH_PARAMS = {"reportsYear": "maxYearCount", "reportsQuarter": "maxR12QCount", "reportsR12": "maxR12QCount"}
+
+DEFAULT_DEPTH = 10
+RESPONSE_CACHE_SIZE = 512
+
+# Serves `stats` as JSON, bypassing auth and fault injection.
+STATS_PATH = "/__stats"
+
+# Example names written by scripts/generate_api_examples.py -> spec path templates.
+EXAMPLE_TEMPLATES = {
+    "markets": "/v1/markets",
+    "sectors": "/v1/sectors",
+    "translation_metadata": "/v1/translationmetadata",
+    "reports": "/v1/instruments/{id}/reports/{reporttype}",
+    "reports_compound": "/v1/instruments/{id}/reports",
+    "reports_metadata": "/v1/instruments/reports/metadata",
+    "reports_array": "/v1/instruments/reports",
+    "stockprices": "/v1/instruments/{insid}/stockprices",
+    "stockprices_last": "/v1/instruments/stockprices/last",
+    "stockprices_global_last": "/v1/instruments/stockprices/global/last",
+    "stockprices_date": "/v1/instruments/stockprices/date",
+    "stockprices_global_date": "/v1/instruments/stockprices/global/date",
+    "stockprices_array": "/v1/instruments/stockprices",
+    "stock_splits": "/v1/instruments/StockSplits",
+    "kpi_history": "/v1/instruments/{insid}/kpis/{kpiId}/{reporttype}/{pricetype}/history",
+    "kpi_summary": "/v1/instruments/{insid}/kpis/{reporttype}/summary",
+    "kpi_history_alt": "/v1/instruments/kpis/{kpiId}/{reporttype}/{pricetype}/history",
+    "kpi_calc": "/v1/instruments/{insid}/kpis/{kpiId}/{calcGroup}/{calc}",
+    "kpi_calc_alt": "/v1/instruments/kpis/{kpiId}/{calcGroup}/{calc}",
+    "kpi_calc_global": "/v1/instruments/global/kpis/{kpiId}/{calcGroup}/{calc}",
+    "kpis_updated": "/v1/instruments/kpis/updated",
+    "kpis_metadata": "/v1/instruments/kpis/metadata",
+    "branches": "/v1/branches",
+    "countries": "/v1/countries",
+}
+
+
+def load_spec(path: str = SPEC_PATH) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def fixture_templates(fixtures: Dict[str, dict]) -> Dict[str, dict]:
+    """Keys fixtures by path template, translating example names; raises ValueError on unknown names."""
+    out = {}
+    for key, body in fixtures.items():
+        template = key if key.startswith("/") else EXAMPLE_TEMPLATES.get(key)
+        if template is None:
+            raise ValueError(f"Unknown fixture {key!r}; expected a path template or one of {sorted(EXAMPLE_TEMPLATES)}")
+        out[template] = body
+    return out
+
+
+def load_fixtures(path: str) -> Dict[str, dict]:
+    """Reads a fixtures file, e.g. tests/data/borsdata_api_examples.json, keyed by path template."""
+    with open(path) as f:
+        return fixture_templates(json.load(f))
+
+
+def _weekdays_back(end: dt.date, count: int) -> List[dt.date]:
+    days = []
+    day = end
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day -= dt.timedelta(days=1)
+    return days[::-1]
+
+
+def _weekdays_between(start: dt.date, end: dt.date) -> List[dt.date]:
+    return [start + dt.timedelta(days=k) for k in range((end - start).days + 1)
+            if (start + dt.timedelta(days=k)).weekday() < 5]
+
+
+def _is_date(name: str, schema: dict) -> bool:
+    return schema.get("type") == "string" and (
+        schema.get("format") == "date-time" or name == "d" or "date" in name.lower() or name.endswith("Updated"))
+
+
+class _Route:
+    """One spec path: a regex for the URL and the resolved 200 response schema."""
+
+    def __init__(self, template: str, schema: dict):
+        self.template = template
+        self.schema = schema
+        self.names = re.findall(r"{(\w+)}", template)
+        self.regex = re.compile("^" + re.sub(r"{\w+}", r"([^/]+)", template) + "$", re.IGNORECASE)
+        self.literals = len([part for part in template.split("/") if part and not part.startswith("{")])
+        self.is_global = "/global" in template
+
+
+class _Synthesizer:
+    """Builds one response body from a schema for one request."""
+
+    def __init__(self, server: 'MockBorsdataServer', route: _Route, path_params: Dict[str, str], query: Dict[str, str]):
+        self.server = server
+        self.route = route
+        self.path_params = path_params
+        self.query = query
+        self.rnd = random.Random(zlib.crc32(f"{server.seed}|{route.template}|{sorted(path_params.items())}|{sorted(query.items())}".encode()))
+        path_id = path_params.get("insid") or path_params.get("id")
+        self.path_id = int(path_id) if path_id and path_id.isdigit() else None
+        self.date = self._parse_date(query.get("date"))
+
+    @staticmethod
+    def _parse_date(value: Optional[str]) -> Optional[dt.date]:
+        if not value:
+            return None
+        try:
+            return dt.date.fromisoformat(value[:10])
+        except ValueError:
+            return None
+
+    def _universe_ids(self) -> List[int]:
+        if "instList" in self.query:
+            return [int(i) for i in self.query["instList"].split(",") if i.strip().isdigit()]
+        return self.server.instrument_ids(self.route.is_global)
+
+    def _bar_dates(self) -> List[dt.date]:
+        if self.date is not None:
+            return [self.date]
+        start, end = self._parse_date(self.query.get("from")), self._parse_date(self.query.get("to"))
+        end = end or self.server.today
+        if start is not None:
+            days = _weekdays_between(start, end)
+        else:
+            days = _weekdays_back(end, self.server.history)
+        if "maxCount" in self.query:
+            days = days[-int(self.query["maxCount"]):]
+        return days
+
+    def _depth(self, name: str) -> int:
+        param = DEPTH_PARAMS.get(name, "maxCount")
+        return int(self.query.get(param) or DEFAULT_DEPTH)
+
+    def build(self) -> dict:
+        return self.obj(self.route.schema, ins_id=self.path_id, top=True)
+
+    def obj(self, schema: dict, ins_id: Optional[int], top: bool = False, day: Optional[dt.date] = None,
+            period: Optional[Tuple[int, int]] = None, k: int = 0) -> dict:
+        out = {}
+        for name, prop in self.server.resolve(schema).get("properties", {}).items():
+            prop = self.server.resolve(prop)
+            if prop.get("type") == "array":
+                out[name] = self.array(name, prop, ins_id, top)
+            elif prop.get("type") == "object" or "properties" in prop:
+                out[name] = self.obj(prop, ins_id)
+            else:
+                out[name] = self.scalar(name, prop, ins_id, day, period, k)
+        return out
+
+    def array(self, name: str, schema: dict, ins_id: Optional[int], top: bool) -> list:
+        items = self.server.resolve(schema.get("items", {}))
+        fields = items.get("properties", {})
+        if top and any(f in fields for f in ID_FIELDS) and self.path_id is None:
+            # One row per instrument; cross-sectional price rows are dated `date` or today.
+            day = (self.date or self.server.today) if "d" in fields else None
+            return [self.obj(items, i, day=day, k=k) for k, i in enumerate(self._universe_ids())]
+        if "d" in fields:
+            return [self.obj(items, ins_id, day=day, k=k) for k, day in enumerate(self._bar_dates())]
+        if "y" in fields or "year" in fields:
+            return [self.obj(items, ins_id, period=p, k=k) for k, p in enumerate(self._periods(name))]
+        return [self.obj(items, ins_id, k=k) for k in range(self.server.rows)]
+
+    def _periods(self, name: str) -> List[Tuple[int, int]]:
+        count = self._depth(name)
+        today = self.server.today
+        if name == "reportsYear" or self.path_params.get("reporttype") == "year":
+            return [(today.year - count + k, 5) for k in range(count)]
+        last = today.year * 4 + (today.month - 1) // 3
+        return [(q // 4, q % 4 + 1) for q in range(last - count + 1, last + 1)]
+
+    def scalar(self, name: str, schema: dict, ins_id: Optional[int], day: Optional[dt.date], period, k: int):
+        kind = schema.get("type")
+        if name in ID_FIELDS and ins_id is not None:
+            return ins_id
+        if name == "error":
+            return None
+        if period is not None and name in ("y", "year"):
+            return period[0]
+        if period is not None and name in ("p", "period"):
+            return period[1]
+        if _is_date(name, schema):
+            day = day or self.date or (self.server.today - dt.timedelta(days=30 * k + self.rnd.randrange(30)))
+            return f"{day.isoformat()}T00:00:00"
+        if kind == "integer":
+            if name.lower() == "kpiid" and "kpiId" in self.path_params:
+                return int(self.path_params["kpiId"])
+            if name == "id" or name.endswith("Id"):
+                return k + 1 if name == "id" else self.rnd.randrange(1, self.server.rows + 1)
+            return self.rnd.randrange(0, 1_000_000)
+        if kind == "number":
+            return round(self.rnd.uniform(1.0, 500.0), 2)
+        if kind == "boolean":
+            # The first market is an index market.
+            return k == 0 if name == "isIndex" else self.rnd.random() < 0.5
+        return f"{name}-{ins_id if ins_id is not None else k}"
+
+
+class MockBorsdataServer:
+    """
+    Threaded local HTTP server answering Borsdata API paths.
+
+    `latency` is seconds per request, or a (min, max) range drawn uniformly.
+    `throttle_rate` and `error_rate` are the chances of a 429 or 500.
+    `rate_limit=(calls, seconds)` enforces a fixed window like the real API's
+    100 calls per 10 s. `fixtures` maps path templates (as in the spec) or
+    example names (`EXAMPLE_TEMPLATES`) to recorded response bodies. `stats` counts responses by status code.
+    """
+
+    def __init__(self, universe: int = 2000, global_universe: Optional[int] = None, history: int = 250, rows: int = 5,
+                 latency: Union[float, Tuple[float, float]] = 0.0, throttle_rate: float = 0.0, error_rate: float = 0.0,
+                 rate_limit: Optional[Tuple[int, float]] = None, fixtures: Optional[Dict[str, dict]] = None,
+                 seed: int = 0, today: Union[str, dt.date] = "2024-12-31", spec_path: str = SPEC_PATH,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.universe = universe
+        self.global_universe = universe if global_universe is None else global_universe
+        self.history = history
+        self.rows = rows
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.fixtures = fixture_templates(fixtures or {})
+        self.seed = seed
+        self.today = dt.date.fromisoformat(today) if isinstance(today, str) else today
+        self.spec = load_spec(spec_path)
+        self.schemas = self.spec.get("components", {}).get("schemas", {})
+        self.routes = self._routes()
+        self.stats: Counter = Counter()
+        self._host, self._port = host, port
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._rnd = random.Random(seed)
+        self._window: Tuple[float, int] = (0.0, 0)
+        self._cache: 'OrderedDict[tuple, bytes]' = OrderedDict()
+
+    def _routes(self) -> List[_Route]:
+        routes = []
+        for template, methods in self.spec.get("paths", {}).items():
+            content = methods.get("get", {}).get("responses", {}).get("200", {}).get("content", {})
+            if content:
+                routes.append(_Route(template, self.resolve(next(iter(content.values()))["schema"])))
+        # Literal segments win over path parameters, e.g. /instruments/kpis/... over /instruments/{insid}/...
+        return sorted(routes, key=lambda route: -route.literals)
+
+    def resolve(self, schema: dict) -> dict:
+        while "$ref" in schema:
+            schema = self.schemas[schema["$ref"].rsplit("/", 1)[-1]]
+        return schema
+
+    def instrument_ids(self, is_global: bool = False) -> List[int]:
+        """Nordic ids are 1..universe; global ids follow them."""
+        if is_global:
+            return list(range(self.universe + 1, self.universe + self.global_universe + 1))
+        return list(range(1, self.universe + 1))
+
+    # --- Responses ---
+    def match(self, path: str) -> Tuple[Optional[_Route], Dict[str, str]]:
+        for route in self.routes:
+            found = route.regex.match(path)
+            if found:
+                return route, dict(zip(route.names, found.groups()))
+        return None, {}
+
+    def body(self, path: str, query: Dict[str, str]) -> Optional[bytes]:
+        """Returns the encoded response for a path and query, or None for unknown paths."""
+        route, path_params = self.match(path)
+        if route is None:
+            return None
+        query = {k: v for k, v in query.items() if k != "authKey"}
+        key = (route.template, tuple(sorted(path_params.items())), tuple(sorted(query.items())))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        synth = _Synthesizer(self, route, path_params, query)
+        data = self._from_fixture(route, synth) if route.template in self.fixtures else synth.build()
+        encoded = json.dumps(data, separators=(",", ":")).encode()
+        with self._lock:
+            self._cache[key] = encoded
+            if len(self._cache) > RESPONSE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return encoded
+
+    def _from_fixture(self, route: _Route, synth: _Synthesizer) -> dict:
+        """Scales a recorded response: per-instrument lists are cycled over the requested ids."""
+        recorded = self.fixtures[route.template]
+        out = dict(recorded)
+        if synth.path_id is not None:
+            return out
+        for name, value in recorded.items():
+            if isinstance(value, list) and value and isinstance(value[0], dict) and any(f in value[0] for f in ID_FIELDS):
+                rows = []
+                for k, ins_id in enumerate(synth._universe_ids()):
+                    row = dict(value[k % len(value)])
+                    for field in ID_FIELDS:
+                        if field in row:
+                            row[field] = ins_id
+                    rows.append(row)
+                out[name] = rows
+        return out
+
+    def fault(self) -> Tuple[Optional[int], Dict[str, str]]:
+        """Applies latency and draws an injected status (429/500) for one request."""
+        latency = self.latency
+        if isinstance(latency, tuple):
+            latency = self._rnd.uniform(*latency)
+        if latency:
+            time.sleep(latency)
+        with self._lock:
+            if self.rate_limit is not None:
+                calls, per = self.rate_limit
+                now = time.monotonic()
+                start, count = self._window
+                if now - start >= per:
+                    start, count = now, 0
+                self._window = (start, count + 1)
+                if count >= calls:
+                    return 429, {"Retry-After": str(max(1, math.ceil(start + per - now)))}
+            draw = self._rnd.random()
+        if draw < self.throttle_rate:
+            return 429, {"Retry-After": "1"}
+        if draw < self.throttle_rate + self.error_rate:
+            return 500, {}
+        return None, {}
+
+    # --- HTTP server ---
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockBorsdataServer':
+        """Starts serving on a background thread; port 0 picks a free port."""
+        self._httpd = ThreadingHTTPServer((self._host, self._port), _handler(self))
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="MockBorsdataServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = self._thread = None
+
+    def __enter__(self) -> 'MockBorsdataServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def _problem(status: int, title: str) -> bytes:
+    return json.dumps({"title": title, "status": status}).encode()
+
+
+def _handler(server: MockBorsdataServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out as separate writes; without this, delayed ACKs add ~40 ms per request.
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            query = dict(parse_qsl(url.query))
+            if url.path == STATS_PATH:
+                with server._lock:
+                    body = json.dumps({str(k): v for k, v in server.stats.items()}).encode()
+                return self._send(200, {}, body)
+            status, headers = server.fault()
+            if status is not None:
+                body = _problem(status, "Too Many Requests" if status == 429 else "Injected error")
+            elif "authKey" not in query and "Authorization" not in self.headers:
+                status, headers, body = 401, {}, _problem(401, "Unauthorized")
+            else:
+                body = server.body(url.path, query)
+                status, body = (200, body) if body is not None else (404, _problem(404, "Not Found"))
+            with server._lock:
+                server.stats[status] += 1
+            self._send(status, headers, body)
+
+        def _send(self, status: int, headers: Dict[str, str], body: bytes) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local mock Borsdata API server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--universe", type=int, default=2000)
+    parser.add_argument("--global-universe", type=int, default=None)
+    parser.add_argument("--history", type=int, default=250, help="bars per price history")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of requests answered 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered 500")
+    parser.add_argument("--rate-limit", type=int, nargs=2, metavar=("CALLS", "SECONDS"), default=None)
+    parser.add_argument("--fixtures", default=None, help="JSON file of recorded responses keyed by path template or example name")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else None
+    server = MockBorsdataServer(universe=args.universe, global_universe=args.global_universe, history=args.history,
+                                latency=args.latency, throttle_rate=args.throttle_rate, error_rate=args.error_rate,
+                                rate_limit=tuple(args.rate_limit) if args.rate_limit else None, fixtures=fixtures,
+                                seed=args.seed, host=args.host, port=args.port)
+    server.start()
+    print(f"Serving {len(server.routes)} Borsdata API paths on {server.url}")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -56,11 +56,82 @@ class InstrumentV1(BaseModel):
     stockPriceCurrency: Optional[str] = None
     reportCurrency: Optional[str] = None
 
+class InstrumentsRespV1(BaseModel):
+    instruments: Optional[List[InstrumentV1]] = None
+
+class InstrumentUpdatedV1(BaseModel):
+    insId: int
+    updatedAt: Optional[str] = None
+
+class InstrumentUpdatedRespV1(BaseModel):
+    instruments: Optional[List[InstrumentUpdatedV1]] = None
+
 class KpiV1(BaseModel):
     i: int
     n: Optional[float] = None
     s: Optional[str] = None
 
+class KpiHistoryV1(BaseModel):
+    y: int
+    p: int
+    v: Optional[float] = None
+
+class KpiSummaryValueV1(BaseModel):
+    y: int
+    p: int
+    v: Optional[float] = None
+
+class KpiSummaryGroupV1(BaseModel):
+    KpiId: int
+    values: Optional[List[KpiSummaryValueV1]] = None
+
+class KpisHistoryRespV1(BaseModel):
+    kpiId: int
+    reportTime: Optional[str] = None
+    priceValue: Optional[str] = None
+    values: Optional[List[KpiHistoryV1]] = None
+
+class KpisHistoryCompV1(BaseModel):
+    instrument: int
+    values: Optional[List[KpiHistoryV1]] = None
+    error: Optional[str] = None
+
+class KpisHistoryArrayRespV1(BaseModel):
+    kpiId: int
+    reportTime: Optional[str] = None
+    priceValue: Optional[str] = None
+    kpisList: Optional[List[KpisHistoryCompV1]] = None
+
+class KpisSummaryRespV1(BaseModel):
+    instrument: int
+    reportType: Optional[str] = None
+    kpis: Optional[List[KpiSummaryGroupV1]] = None
+
+class KpisRespV1(BaseModel):
+    kpiId: int
+    group: Optional[str] = None
+    calculation: Optional[str] = None
+    value: Optional[KpiV1] = None
+
+class KpisAllCompRespV1(BaseModel):
+    kpiId: int
+    group: Optional[str] = None
+    calculation: Optional[str] = None
+    values: Optional[List[KpiV1]] = None
+
+class KpisCalcUpdatedRespV1(BaseModel):
+    kpisCalcUpdated: Optional[str] = None
+
+class KpiMetadataV1(BaseModel):
+    kpiId: int
+    nameSv: Optional[str] = None
+    nameEn: Optional[str] = None
+    format: Optional[str] = None
+    isString: bool
+
+class KpiMetadataRespV1(BaseModel):
+    kpiHistoryMetadatas: Optional[List[KpiMetadataV1]] = None
+
 class StockPriceV1(BaseModel):
     d: Optional[str] = None
     h: Optional[float] = None
@@ -91,6 +162,9 @@ class BuybackRespV1(BaseModel):
     values: Optional[List[BuybackRowV1]] = None
     error: Optional[str] = None
 
+class HoldingsBuybackArrayRespV1(BaseModel):
+    list: Optional[List[BuybackRespV1]] = None
+
 class CompaniesCalenderV1(BaseModel):
     insId: int
     values: Optional[List['ReportCalenderDateResp']] = None
@@ -0,0 +1,175 @@
+"""
+Rate limiting and retry policy for Borsdata API clients.
+
+Buckets hand out *reservations*: `reserve()` takes one token and returns how
+long the caller must wait before sending. Tokens may go negative, so callers
+queue up behind each other instead of polling, and the same bucket serves both
+the blocking and the asyncio client.
+"""
+import hashlib
+import random
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Tuple
+
+
+class TokenBucket:
+    """
+    In-process token bucket allowing `rate` requests per `per` seconds.
+
+    Thread-safe; share one instance between all clients using the same API key.
+    `burst` is the bucket capacity and defaults to `rate`.
+    """
+
+    def __init__(self, rate: float, per: float = 1.0, burst: Optional[float] = None):
+        if rate <= 0 or per <= 0:
+            raise ValueError("rate and per must be positive")
+        self.rate = rate / per
+        self.capacity = float(burst if burst is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Takes `tokens` from the bucket and returns the seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, wait = _take(self._tokens, self._updated, self._blocked_until, now, self.rate, self.capacity, tokens)
+            self._updated = now
+            return wait
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Blocks until `tokens` may be used."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Stops handing out tokens for `seconds`, e.g. after the server answered 429."""
+        with self._lock:
+            now = time.monotonic()
+            self._blocked_until = max(self._blocked_until, now + seconds)
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = now
+
+
+class SQLiteTokenBucket:
+    """
+    Token bucket whose state lives in an SQLite file, shared between processes.
+
+    Every process opening the same `path` with the same `key` (typically the
+    API key, stored hashed) draws from one bucket.
+    """
+
+    def __init__(self, path: str, rate: float, per: float = 1.0, burst: Optional[float] = None, key: str = "default"):
+        if rate <= 0 or per <= 0:
+            raise ValueError("rate and per must be positive")
+        self.path = path
+        self.rate = rate / per
+        self.capacity = float(burst if burst is not None else rate)
+        self.key = hashlib.sha256(key.encode()).hexdigest()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS token_buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, blocked_until REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+
+    def _update(self, fn) -> float:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT tokens, updated, blocked_until FROM token_buckets WHERE key = ?", (self.key,)
+            ).fetchone()
+            now = time.time()
+            state = row if row is not None else (self.capacity, now, 0.0)
+            tokens, blocked_until, result = fn(state, now)
+            conn.execute(
+                "INSERT OR REPLACE INTO token_buckets (key, tokens, updated, blocked_until) VALUES (?, ?, ?, ?)",
+                (self.key, tokens, now, blocked_until),
+            )
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Takes `tokens` from the bucket and returns the seconds to wait before using them."""
+        def take(state, now):
+            current, updated, blocked_until = state
+            remaining, wait = _take(current, updated, blocked_until, now, self.rate, self.capacity, tokens)
+            return remaining, blocked_until, wait
+        return self._update(take)
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Blocks until `tokens` may be used."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Stops handing out tokens for `seconds` in every process sharing the bucket."""
+        def block(state, now):
+            current, updated, blocked_until = state
+            return min(current, 0.0), max(blocked_until, now + seconds), 0.0
+        self._update(block)
+
+
+def _take(tokens: float, updated: float, blocked_until: float, now: float, rate: float, capacity: float, amount: float) -> Tuple[float, float]:
+    """Refills the bucket up to `now`, takes `amount` and returns (remaining, wait)."""
+    if now > blocked_until:
+        tokens = min(capacity, tokens + (now - max(updated, blocked_until)) * rate)
+    tokens -= amount
+    wait = max(0.0, blocked_until - now) + (max(0.0, -tokens) / rate)
+    return tokens, wait
+
+
+class RetryPolicy:
+    """
+    Decides whether and how long to wait before retrying a failed request.
+
+    Retries `retry_statuses` up to `max_retries` times. A `Retry-After` header is
+    honoured when present; otherwise the delay is exponential backoff with full
+    jitter, capped at `backoff_max` seconds.
+    """
+
+    def __init__(self, max_retries: int = 5, backoff_base: float = 0.5, backoff_max: float = 30.0, retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def should_retry(self, status: int, attempt: int) -> bool:
+        return status in self.retry_statuses and attempt < self.max_retries
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before retry number `attempt + 1`."""
+        seconds = parse_retry_after(retry_after)
+        if seconds is not None:
+            return min(seconds, self.backoff_max) + random.uniform(0, self.backoff_base)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
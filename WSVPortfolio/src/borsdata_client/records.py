@@ -0,0 +1,123 @@
+"""
+Validation-free lightweight records mirroring the pydantic models.
+
+For trusted responses, `build_record(Model, data)` copies the decoded JSON into
+compact `__slots__` objects with the same field names as `Model`, skipping all
+validation and coercion. Nested models become nested records. Call
+`to_model()` on a record to get the validated pydantic model when needed.
+"""
+import sys
+import typing
+from typing import Any, Dict, List, Tuple, Type
+
+from pydantic import BaseModel
+
+# Per-field conversion plan: (name, kind, nested model) with kind "value", "model" or "list".
+_Plan = List[Tuple[str, str, Any]]
+
+_record_types: Dict[type, type] = {}
+_plans: Dict[type, _Plan] = {}
+
+
+class Record:
+    """Base class of generated records. Subclasses define `__slots__` and `_model`."""
+
+    __slots__ = ()
+    _model: Type[BaseModel]
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def dict(self) -> dict:
+        """Returns the record as plain nested dicts and lists."""
+        return {name: _to_plain(getattr(self, name)) for name in self.__slots__}
+
+    def to_model(self) -> BaseModel:
+        """Validates the record into its pydantic model."""
+        return self._model.parse_obj(self.dict())
+
+
+def _to_plain(value):
+    if isinstance(value, Record):
+        return value.dict()
+    if isinstance(value, list):
+        return [_to_plain(item) for item in value]
+    return value
+
+
+def _model_fields(model: Type[BaseModel]) -> Dict[str, Any]:
+    fields = getattr(model, "model_fields", None)
+    if fields is None:  # pydantic v1
+        fields = model.__fields__
+    return {name: getattr(field, "annotation", None) or field.outer_type_ for name, field in fields.items()}
+
+
+def _resolve(annotation, model: Type[BaseModel]):
+    if isinstance(annotation, str):
+        annotation = typing.ForwardRef(annotation)
+    if isinstance(annotation, typing.ForwardRef):
+        return getattr(sys.modules[model.__module__], annotation.__forward_arg__)
+    return annotation
+
+
+def _is_model(annotation) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+def _plan(model: Type[BaseModel]) -> _Plan:
+    plan = _plans.get(model)
+    if plan is not None:
+        return plan
+    plan = []
+    for name, annotation in _model_fields(model).items():
+        annotation = _resolve(annotation, model)
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if typing.get_origin(annotation) is typing.Union and len(args) == 1:
+            annotation = _resolve(args[0], model)
+        if _is_model(annotation):
+            plan.append((name, "model", annotation))
+        elif typing.get_origin(annotation) in (list, List):
+            item = _resolve(typing.get_args(annotation)[0], model)
+            plan.append((name, "list", item) if _is_model(item) else (name, "value", None))
+        else:
+            plan.append((name, "value", None))
+    _plans[model] = plan
+    return plan
+
+
+def record_type(model: Type[BaseModel]) -> Type[Record]:
+    """Returns the record class mirroring `model`, creating it on first use."""
+    cls = _record_types.get(model)
+    if cls is None:
+        slots = tuple(_model_fields(model))
+        cls = type(f"{model.__name__}Record", (Record,), {"__slots__": slots, "_model": model})
+        _record_types[model] = cls
+    return cls
+
+
+def build_record(model: Type[BaseModel], data: Any) -> Any:
+    """Builds a record of `model` from decoded JSON without validation. Non-dicts pass through."""
+    if not isinstance(data, dict):
+        return data
+    cls = record_type(model)
+    record = cls.__new__(cls)
+    get = data.get
+    for name, kind, nested in _plan(model):
+        value = get(name)
+        if value is not None:
+            if kind == "list":
+                value = [build_record(nested, item) for item in value]
+            elif kind == "model":
+                value = build_record(nested, value)
+        setattr(record, name, value)
+    return record
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from borsdata_client.arrays import PriceArrays
+from WSVPortfolio import Adjuster
+from WSVPortfolio.adjust import parse_ratio
+from WSVPortfolio.portfolio import align_closes
+from WSVPortfolio.pricestore import PRICE_DTYPE
+
+
+def split(ins_id, date, ratio, split_type="Split"):
+    return SimpleNamespace(instrumentId=ins_id, splitDate=f"{date}T00:00:00", ratio=ratio, splitType=split_type)
+
+
+def dividend(date, amount, dividend_type=0):
+    return SimpleNamespace(excludingDate=f"{date}T00:00:00", amountPaid=amount, dividendType=dividend_type)
+
+
+def prices(closes, volume=100.0):
+    d = np.datetime64("2024-01-01") + np.arange(len(closes))
+    c = np.array(closes, dtype=np.float64)
+    return PriceArrays(d, c.copy(), c.copy(), c.copy(), c, np.full(len(c), volume))
+
+
+class TestParseRatio(unittest.TestCase):
+    def test_formats(self):
+        self.assertEqual(parse_ratio("2:1"), 2.0)
+        self.assertEqual(parse_ratio("1/10"), 0.1)
+        self.assertEqual(parse_ratio("3 for 1"), 3.0)
+        self.assertEqual(parse_ratio("2,5"), 2.5)
+        self.assertEqual(parse_ratio("10:1", "Omvänd split"), 0.1)
+        self.assertTrue(np.isnan(parse_ratio("n/a")))
+        self.assertTrue(np.isnan(parse_ratio(None)))
+
+
+class TestAdjuster(unittest.TestCase):
+    def test_split_and_dividend_factors(self):
+        adjuster = Adjuster()
+        bars = prices([100, 100, 50, 50, 49])
+        self.assertEqual(adjuster.add_splits([split(1, "2024-01-03", "2:1")]), {1})
+        self.assertTrue(adjuster.add_dividends(1, [dividend("2024-01-05", 1.0)], bars))
+        adjusted = adjuster.adjust(1, bars)
+        f = 1 - 1.0 / 50
+        np.testing.assert_allclose(adjusted.c, [50 * f, 50 * f, 50 * f, 50 * f, 49])
+        np.testing.assert_allclose(adjusted.v, [200, 200, 100, 100, 100])
+        np.testing.assert_allclose(adjuster.adjust(1, bars, dividends=False).c, [50, 50, 50, 50, 49])
+        np.testing.assert_array_equal(bars.c, [100, 100, 50, 50, 49])
+
+    def test_non_cash_dividends_skipped(self):
+        adjuster = Adjuster()
+        bars = prices([100, 100, 100])
+        self.assertFalse(adjuster.add_dividends(1, [dividend("2024-01-02", 5.0, dividend_type=1)], bars))
+        self.assertNotIn(1, adjuster)
+        self.assertTrue(adjuster.add_dividends(1, [dividend("2024-01-02", 5.0, dividend_type=1)], bars, types=(0, 1)))
+        np.testing.assert_allclose(adjuster.adjust(1, bars).c, [95, 100, 100])
+
+    def test_records_and_matrix(self):
+        adjuster = Adjuster()
+        adjuster.add_splits([split(1, "2024-01-02", "1:2")])
+        bars = prices([10, 20, 20])
+        records = np.zeros(3, dtype=PRICE_DTYPE)
+        records["d"], records["c"], records["v"] = bars.d, bars.c, 100
+        np.testing.assert_allclose(adjuster.adjust(1, records)["c"], [20, 20, 20])
+        matrix = adjuster.adjust_matrix(align_closes({1: bars, 2: prices([5, 5, 5])}))
+        np.testing.assert_allclose(matrix.closes, [[20, 5], [20, 5], [20, 5]])
+
+    def test_incremental_update(self):
+        adjuster = Adjuster()
+        adjuster.add_splits([split(1, "2024-01-02", "2:1"), split(2, "2024-01-02", "2:1")])
+        self.assertEqual(adjuster.add_splits([split(1, "2024-01-02", "2:1")]), set())
+        before = adjuster.factors(2, prices([1, 1, 1, 1]).d)
+        self.assertEqual(adjuster.add_splits([split(1, "2024-01-03", "3:1")]), {1})
+        np.testing.assert_allclose(adjuster.factors(1, prices([1, 1, 1, 1]).d), [1 / 6, 1 / 3, 1, 1])
+        np.testing.assert_array_equal(adjuster.factors(2, prices([1, 1, 1, 1]).d), before)
+        np.testing.assert_array_equal(adjuster.factors(3, prices([1, 1]).d), [1, 1])
+
+    def test_save_and_load(self):
+        adjuster = Adjuster()
+        adjuster.add_splits([split(1, "2024-01-02", "2:1"), split(5, "2024-01-03", "1:4")])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.npz")
+            adjuster.save(path)
+            self.assertEqual(os.listdir(tmp), ["events.npz"])
+            loaded = Adjuster.load(path)
+        dates = prices([1, 1, 1]).d
+        for ins_id in (1, 5):
+            np.testing.assert_array_equal(loaded.factors(ins_id, dates), adjuster.factors(ins_id, dates))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+
+from borsdata_client import BorsdataAPIClient
+from borsdata_client.arrays import PriceArrays, decode_price_array_list, decode_price_list
+
+
+class StaticClient(BorsdataAPIClient):
+    def __init__(self, payload):
+        super().__init__(api_key="test")
+        self.payload = payload
+
+    def _get(self, path, params=None):
+        return self.payload
+
+
+class TestPriceArrays(unittest.TestCase):
+    def test_decode_price_list(self):
+        arrays = decode_price_list([
+            {"d": "2024-01-02T00:00:00", "o": 1.0, "h": 2.0, "l": 0.5, "c": 1.5, "v": 100},
+            {"d": "2024-01-03", "c": 1.6, "o": None},
+        ])
+        self.assertEqual(arrays.d.dtype, np.dtype("datetime64[D]"))
+        self.assertEqual(str(arrays.d[0]), "2024-01-02")
+        np.testing.assert_array_equal(arrays.c, [1.5, 1.6])
+        self.assertTrue(np.isnan(arrays.o[1]) and np.isnan(arrays.v[1]))
+        self.assertIsNone(arrays.i)
+        self.assertEqual(len(arrays), 2)
+
+    def test_decode_rejects_missing_close(self):
+        with self.assertRaises(ValueError):
+            decode_price_list([{"d": "2024-01-02"}])
+
+    def test_decode_rejects_null_close_and_date(self):
+        with self.assertRaisesRegex(ValueError, "row 1: null 'c'"):
+            decode_price_list([{"d": "2024-01-02", "c": 1.0}, {"d": "2024-01-03", "c": None}])
+        with self.assertRaisesRegex(ValueError, "row 2"):
+            decode_price_list([{"d": "2024-01-02", "c": 1.0}, {"d": "2024-01-03", "c": 1.1}, {"d": None, "c": 1.2}])
+
+    def test_decode_array_list_keeps_errors(self):
+        blocks = decode_price_array_list([
+            {"instrument": 3, "stockPricesList": [{"d": "2024-01-02", "c": 1.0}]},
+            {"instrument": 4, "error": "Not found", "stockPricesList": None},
+        ])
+        self.assertEqual(list(blocks), [3, 4])
+        self.assertEqual(blocks[4].error, "Not found")
+        self.assertEqual(len(blocks[4]), 0)
+
+    def test_client_as_arrays(self):
+        client = StaticClient({"stockPricesList": [{"i": 3, "d": "2024-01-02", "c": 1.0}, {"i": 4, "d": "2024-01-02", "c": 2.0}]})
+        arrays = client.get_stockprices_last("key", as_arrays=True)
+        self.assertIsInstance(arrays, PriceArrays)
+        np.testing.assert_array_equal(arrays.i, [3, 4])
+        self.assertEqual(client.get_stockprices_last("key").stockPricesList[1].c, 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
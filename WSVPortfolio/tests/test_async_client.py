@@ -0,0 +1,164 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from borsdata_client import AsyncBorsdataAPIClient, SQLiteTokenBucket
+
+
+class RecordingBucket(SQLiteTokenBucket):
+    """Records the threads its transactions run on."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = set()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        self.threads.add(threading.get_ident())
+        return super().reserve(tokens)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers a handful of Borsdata endpoints with small synthetic payloads."""
+
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            parts = url.path.strip("/").split("/")
+            if url.path == "/v1/markets":
+                body = {"markets": [{"id": 1, "name": "Large Cap", "isIndex": False}]}
+            elif url.path == "/v1/instruments/stockprices":
+                ids = [int(i) for i in query["instList"].split(",")]
+                body = {"stockPricesArrayList": [
+                    {"instrument": i, "stockPricesList": [{"d": "2024-01-02", "c": float(i)}]} for i in ids
+                ]}
+            elif parts[-1] == "summary":
+                threading.Event().wait(0.02)
+                body = {"instrument": int(parts[2]), "reportType": parts[4], "kpis": [
+                    {"KpiId": 2, "values": [{"y": 2023, "p": 5, "v": 1.5}]}
+                ]}
+            else:
+                self.send_response(404)
+                self.end_headers()
+                return
+            payload = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp not installed")
+class TestAsyncClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_get_markets(self):
+        async def main():
+            async with AsyncBorsdataAPIClient(self.base_url, api_key="test") as client:
+                return await client.get_markets()
+
+        resp = self.run_async(main())
+        self.assertEqual(resp.markets[0].name, "Large Cap")
+
+    def test_fan_out_respects_concurrency_limit(self):
+        StandInHandler.max_in_flight = 0
+
+        async def main():
+            async with AsyncBorsdataAPIClient(self.base_url, api_key="test", pool_size=8, max_concurrency=4) as client:
+                return await asyncio.gather(*(client.get_kpi_summary(i, "year") for i in range(40)))
+
+        results = self.run_async(main())
+        self.assertEqual([r.instrument for r in results], list(range(40)))
+        self.assertEqual(results[0].kpis[0].values[0].v, 1.5)
+        self.assertLessEqual(StandInHandler.max_in_flight, 4)
+        self.assertGreater(StandInHandler.max_in_flight, 1)
+
+    def test_stockprices_array_batch(self):
+        async def main():
+            async with AsyncBorsdataAPIClient(self.base_url, api_key="test") as client:
+                return await client.get_stockprices_array_batch(range(1, 121), "test")
+
+        resp = self.run_async(main())
+        self.assertEqual([item.instrument for item in resp.stockPricesArrayList], list(range(1, 121)))
+
+    def test_iter_stockprices(self):
+        async def main():
+            async with AsyncBorsdataAPIClient(self.base_url, api_key="test") as client:
+                return [item.instrument async for item in client.iter_stockprices(range(1, 121), "test", prefetch=2)]
+
+        self.assertEqual(sorted(self.run_async(main())), list(range(1, 121)))
+
+    def test_sqlite_limiter_runs_off_the_event_loop(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            bucket = RecordingBucket(os.path.join(tmp, "bucket.sqlite"), rate=1000)
+
+            async def main():
+                async with AsyncBorsdataAPIClient(self.base_url, api_key="test", rate_limiter=bucket) as client:
+                    await asyncio.gather(*(client.get_markets() for _ in range(5)))
+                return threading.get_ident()
+
+            loop_thread = self.run_async(main())
+        self.assertTrue(bucket.threads)
+        self.assertNotIn(loop_thread, bucket.threads)
+
+    def test_with_validation_shares_session(self):
+        async def main():
+            client = AsyncBorsdataAPIClient(self.base_url, api_key="test")
+            records = client.with_validation(False)  # copied before the first request
+            async with client:
+                await records.get_markets()
+                await client.get_markets()
+                self.assertIs(records._get_session(), client._get_session())
+            return records._shared.session
+
+        self.assertIsNone(self.run_async(main()))
+
+    def test_http_error_raises(self):
+        async def main():
+            async with AsyncBorsdataAPIClient(self.base_url, api_key="test") as client:
+                await client.get_countries()
+
+        with self.assertRaises(aiohttp.ClientResponseError):
+            self.run_async(main())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+import requests
+
+from borsdata_client import BorsdataAPIClient, ResponseCache
+from borsdata_client.cache import cache_key, cache_scope
+
+
+class RoutingSession:
+    """Stands in for requests.Session, answering from a dict of path -> body."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.headers = {}
+        self.paths = []
+
+    def get(self, url, params=None, **kwargs):
+        path = url.split("://", 1)[1].split("/", 1)[1]
+        path = "/" + path
+        self.paths.append(path)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(self.routes[path]).encode()
+        return response
+
+
+class TestCacheScopes(unittest.TestCase):
+    def test_scopes(self):
+        self.assertEqual(cache_scope("/v1/markets"), "metadata")
+        self.assertEqual(cache_scope("/v1/instruments/kpis/metadata"), "metadata")
+        self.assertEqual(cache_scope("/v1/instruments/kpis/1/last/high"), "kpi")
+        self.assertEqual(cache_scope("/v1/instruments/3/kpis/1/year/mean/history"), "kpi")
+        self.assertEqual(cache_scope("/v1/instruments/3/reports/year"), "reports")
+        self.assertEqual(cache_scope("/v1/instruments/reports"), "reports")
+        self.assertEqual(cache_scope("/v1/instruments"), "universe")
+        self.assertIsNone(cache_scope("/v1/instruments/kpis/updated"))
+        self.assertIsNone(cache_scope("/v1/instruments/3/stockprices"))
+        self.assertIsNone(cache_scope("/v1/instruments/stockprices/last"))
+
+    def test_key_ignores_auth_key_and_param_order(self):
+        a = cache_key("/v1/instruments/reports", {"instList": "1,2", "authKey": "secret", "reporttype": "year"})
+        b = cache_key("/v1/instruments/reports", {"reporttype": "year", "instList": "1,2"})
+        self.assertEqual(a, b)
+        self.assertNotIn("secret", a)
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(os.path.join(self.tmp.name, "cache.sqlite"))
+        self.routes = {
+            "/v1/markets": {"markets": [{"id": 1, "name": "Large Cap"}]},
+            "/v1/instruments/kpis/1/last/high": {"kpiId": 1, "values": [{"i": 3, "n": 1.0}]},
+            "/v1/instruments/3/reports/year": {"instrument": 3, "reports": []},
+            "/v1/instruments/4/reports/year": {"instrument": 4, "reports": []},
+            "/v1/instruments/kpis/updated": {"kpisCalcUpdated": "2024-01-01T06:00:00"},
+            "/v1/instruments/updated": {"instruments": [
+                {"insId": 3, "updatedAt": "2024-01-01T00:00:00"},
+                {"insId": 4, "updatedAt": "2024-01-01T00:00:00"},
+            ]},
+        }
+        self.client = BorsdataAPIClient(api_key="test", cache=self.cache)
+        self.client.session = RoutingSession(self.routes)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_warm_calls_skip_network(self):
+        self.client.get_markets()
+        self.client.get_kpi_calc_alt(1, "last", "high")
+        self.client.get_markets()
+        self.client.get_kpi_calc_alt(1, "last", "high")
+        self.assertEqual(self.client.session.paths.count("/v1/markets"), 1)
+        self.assertEqual(self.client.session.paths.count("/v1/instruments/kpis/1/last/high"), 1)
+
+    def test_cache_persists_across_instances(self):
+        self.client.get_markets()
+        other = BorsdataAPIClient(api_key="test", cache=ResponseCache(self.cache.path))
+        other.session = RoutingSession(self.routes)
+        self.assertEqual(other.get_markets().markets[0].name, "Large Cap")
+        self.assertEqual(other.session.paths, [])
+        other.cache.close()
+
+    def test_metadata_ttl(self):
+        self.cache.metadata_ttl = 0
+        self.client.get_markets()
+        time.sleep(0.01)
+        self.client.get_markets()
+        self.assertEqual(self.client.session.paths.count("/v1/markets"), 2)
+
+    def test_refresh_invalidates_only_changed_data(self):
+        self.client.refresh_cache()
+        self.client.get_kpi_calc_alt(1, "last", "high")
+        self.client.get_reports(3, "year")
+        self.client.get_reports(4, "year")
+
+        # Nothing changed: everything stays cached.
+        self.client.refresh_cache()
+        self.client.get_kpi_calc_alt(1, "last", "high")
+        self.client.get_reports(3, "year")
+        self.assertEqual(self.client.session.paths.count("/v1/instruments/kpis/1/last/high"), 1)
+        self.assertEqual(self.client.session.paths.count("/v1/instruments/3/reports/year"), 1)
+
+        # Instrument 3 got new reports and KPIs were recalculated.
+        self.routes["/v1/instruments/updated"]["instruments"][0]["updatedAt"] = "2024-01-02T00:00:00"
+        self.routes["/v1/instruments/kpis/updated"]["kpisCalcUpdated"] = "2024-01-02T06:00:00"
+        self.client.refresh_cache()
+        self.client.get_kpi_calc_alt(1, "last", "high")
+        self.client.get_reports(3, "year")
+        self.client.get_reports(4, "year")
+        self.assertEqual(self.client.session.paths.count("/v1/instruments/kpis/1/last/high"), 2)
+        self.assertEqual(self.client.session.paths.count("/v1/instruments/3/reports/year"), 2)
+        self.assertEqual(self.client.session.paths.count("/v1/instruments/4/reports/year"), 1)
+
+    def test_instlist_entries_invalidated_by_any_member(self):
+        self.cache.set("/v1/instruments/reports", {"instList": "3,4"}, b'{"reportList": []}')
+        self.assertIsNotNone(self.cache.get("/v1/instruments/reports", {"instList": "3,4"}))
+        self.assertEqual(self.cache.invalidate_instruments([(4, "x")]), [4])
+        self.assertIsNone(self.cache.get("/v1/instruments/reports", {"instList": "3,4"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import threading
+import time
+import unittest
+
+from borsdata_client.client import BorsdataAPIClient, chunk_instruments
+
+
+class FakeGetClient(BorsdataAPIClient):
+    """Client whose `_get` answers from a callable instead of the network."""
+
+    def __init__(self, handler, **kwargs):
+        super().__init__(api_key="test", **kwargs)
+        self.handler = handler
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _get(self, path, params=None):
+        with self._lock:
+            self.calls.append((path, dict(params or {})))
+        return self.handler(path, params or {})
+
+
+def stockprices_handler(path, params):
+    ids = [int(i) for i in params["instList"].split(",")]
+    return {"stockPricesArrayList": [
+        {"instrument": i, "error": "not found" if i == 7 else None,
+         "stockPricesList": [] if i == 7 else [{"d": "2024-01-02", "c": float(i)}]}
+        for i in ids
+    ]}
+
+
+class TestChunking(unittest.TestCase):
+    def test_chunk_instruments(self):
+        chunks = list(chunk_instruments(range(120)))
+        self.assertEqual([len(c) for c in chunks], [50, 50, 20])
+        self.assertEqual(chunks[1][0], 50)
+
+    def test_chunk_instruments_dedupes(self):
+        self.assertEqual(list(chunk_instruments([3, 1, 3, 2], size=2)), [[3, 1], [2]])
+
+
+class TestBatchFetching(unittest.TestCase):
+    def test_stockprices_array_batch_merges_chunks(self):
+        client = FakeGetClient(stockprices_handler)
+        resp = client.get_stockprices_array_batch(range(1, 131), "key", from_date="2024-01-01", max_workers=4)
+        self.assertEqual(len(client.calls), 3)
+        self.assertTrue(all(params["from"] == "2024-01-01" for _, params in client.calls))
+        self.assertEqual([item.instrument for item in resp.stockPricesArrayList], list(range(1, 131)))
+        errored = [item for item in resp.stockPricesArrayList if item.error]
+        self.assertEqual([item.instrument for item in errored], [7])
+
+    def test_reports_array_batch_merges_chunks(self):
+        def handler(path, params):
+            ids = [int(i) for i in params["instList"].split(",")]
+            return {"reportList": [{"instrument": i, "error": None} for i in ids]}
+
+        client = FakeGetClient(handler)
+        resp = client.get_reports_array_batch(range(75), "key", reporttype="year")
+        self.assertEqual(len(client.calls), 2)
+        self.assertEqual(client.calls[0][1]["reporttype"], "year")
+        self.assertEqual(len(resp.reportList), 75)
+
+    def test_holdings_buyback_batch_merges_chunks(self):
+        def handler(path, params):
+            ids = [int(i) for i in params["instList"].split(",")]
+            return {"list": [{"insId": i, "values": []} for i in ids]}
+
+        client = FakeGetClient(handler)
+        resp = client.get_holdings_buyback_batch(range(60), "key")
+        self.assertEqual([path for path, _ in client.calls], ["/v1/holdings/buyback"] * 2)
+        self.assertEqual([item.insId for item in resp.list], list(range(60)))
+
+    def test_batch_with_no_instruments(self):
+        client = FakeGetClient(stockprices_handler)
+        resp = client.get_stockprices_array_batch([], "key")
+        self.assertEqual(resp.stockPricesArrayList, [])
+        self.assertEqual(client.calls, [])
+
+
+
+class TestIterators(unittest.TestCase):
+    def make_client(self):
+        state = {"in_flight": 0, "max_in_flight": 0}
+        lock = threading.Lock()
+
+        def handler(path, params):
+            with lock:
+                state["in_flight"] += 1
+                state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            time.sleep(0.01)
+            with lock:
+                state["in_flight"] -= 1
+            return stockprices_handler(path, params)
+
+        return FakeGetClient(handler, max_workers=8), state
+
+    def test_iter_stockprices_yields_every_instrument_with_bounded_prefetch(self):
+        client, state = self.make_client()
+        items = list(client.iter_stockprices(range(1, 501), "key", prefetch=3))
+        self.assertEqual(sorted(item.instrument for item in items), list(range(1, 501)))
+        self.assertEqual(len(client.calls), 10)
+        self.assertLessEqual(state["max_in_flight"], 3)
+
+    def test_prefetch_depth_holds_when_chunks_finish_together(self):
+        client = FakeGetClient(stockprices_handler, max_workers=8)
+        started = []
+        lock = threading.Lock()
+
+        def fetch(instList):
+            with lock:
+                started.append(instList)
+            return instList
+
+        consumed = 0
+        for _ in client._iter_chunks(fetch, range(1, 1001), prefetch=4):
+            time.sleep(0.005)  # let every submitted chunk start and finish before the next wait()
+            with lock:
+                self.assertLessEqual(len(started) - consumed, 4)
+            consumed += 1
+        self.assertEqual((consumed, len(started)), (20, 20))
+
+    def test_iter_stockprices_as_arrays(self):
+        client, _ = self.make_client()
+        blocks = list(client.iter_stockprices(range(1, 61), "key", as_arrays=True))
+        self.assertEqual(sorted(block.instrument for block in blocks), list(range(1, 61)))
+        self.assertEqual(len(blocks[0]), 1)
+
+    def test_closing_iterator_stops_fetching(self):
+        client, _ = self.make_client()
+        items = client.iter_stockprices(range(1, 1001), "key", prefetch=2)
+        next(items)
+        items.close()
+        time.sleep(0.05)
+        self.assertLessEqual(len(client.calls), 4)
+
+    def test_iter_kpi_history_passes_inst_list(self):
+        def handler(path, params):
+            return {"kpiId": 2, "kpisList": [{"instrument": int(i)} for i in params["instList"].split(",")]}
+
+        client = FakeGetClient(handler)
+        items = list(client.iter_kpi_history(2, "year", "mean", range(70)))
+        self.assertEqual(sorted(item.instrument for item in items), list(range(70)))
+        self.assertEqual(client.calls[0][0], "/v1/instruments/kpis/2/year/mean/history")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import io
+import json
+import unittest
+
+import requests
+
+from borsdata_client import BorsdataAPIClient
+from borsdata_client.decode import iter_json_array, loads
+
+
+def chunked(data, size):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+class StreamingSession:
+    """Stands in for requests.Session, serving one JSON body from a byte stream."""
+
+    def __init__(self, body):
+        self.body = json.dumps(body).encode()
+        self.headers = {}
+        self.calls = []
+
+    def get(self, url, params=None, stream=False):
+        self.calls.append((url, params))
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(self.body)
+        return response
+
+
+class TestDecode(unittest.TestCase):
+    def test_loads(self):
+        self.assertEqual(loads(b'{"a": [1, 2.5, null]}'), {"a": [1, 2.5, None]})
+
+    def test_iter_json_array_across_chunk_boundaries(self):
+        doc = {"kpiId": 1, "kpisList": [{"instrument": i, "values": [{"y": 2020, "p": 5, "v": i / 3}]} for i in range(200)], "priceValue": "mean"}
+        data = json.dumps(doc).encode()
+        for size in (1, 7, 4096):
+            fields = {}
+            rows = list(iter_json_array(chunked(data, size), "kpisList", fields))
+            self.assertEqual(rows, doc["kpisList"])
+            self.assertEqual(fields, {"kpiId": 1, "priceValue": "mean"})
+
+    def test_iter_json_array_numbers_and_unicode(self):
+        data = '{"a": [1, 22, 333, {"s": "åäö"}]}'.encode()
+        self.assertEqual(list(iter_json_array(chunked(data, 1), "a")), [1, 22, 333, {"s": "åäö"}])
+
+    def test_iter_json_array_null_or_missing(self):
+        self.assertEqual(list(iter_json_array([b'{"a": null}'], "a")), [])
+        self.assertEqual(list(iter_json_array([b'{"b": [1]}'], "a")), [])
+
+    def test_iter_json_array_truncated(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'{"a": [{"x": 1}, {"x"'], "a"))
+
+    def test_client_stream(self):
+        client = BorsdataAPIClient(api_key="test")
+        client.session = StreamingSession({"stockPricesList": [{"i": i, "d": "2024-01-02", "c": float(i)} for i in range(5)]})
+        rows = list(client.stream_stockprices_last("key"))
+        self.assertEqual([row.i for row in rows], list(range(5)))
+        self.assertEqual(rows[3].c, 3.0)
+
+    def test_client_stream_kpi_history_inst_list(self):
+        client = BorsdataAPIClient(base_url="http://test", api_key="test")
+        client.session = StreamingSession({"kpiId": 2, "kpisList": [{"instrument": i, "values": []} for i in (3, 5)]})
+        rows = list(client.stream_kpi_history_alt(2, "year", "mean", instList="3,5"))
+        self.assertEqual([row.instrument for row in rows], [3, 5])
+        self.assertEqual(client.session.calls, [("http://test/v1/instruments/kpis/2/year/mean/history", {"instList": "3,5"})])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+from borsdata_client import BorsdataAPIClient
+from WSVPortfolio.holdings import load_table, refresh_calendars, refresh_holdings
+
+
+def per_instrument(params, values):
+    ids = [int(i) for i in params["instList"].split(",")]
+    return {"list": [{"insId": i, "values": values(i), "error": "no data" if i == 13 else None} for i in ids]}
+
+
+ROUTES = {
+    "/v1/holdings/insider": lambda p: per_instrument(p, lambda i: [{
+        "misc": False, "ownerName": f"Owner {i}", "ownerPosition": None, "equityProgram": False, "shares": 100 * i,
+        "price": 10.5, "amount": 1050.0 * i, "currency": "SEK", "transactionType": 0,
+        "verificationDate": "2024-03-01T00:00:00", "transactionDate": None}]),
+    "/v1/holdings/buyback": lambda p: per_instrument(p, lambda i: [
+        {"change": k, "changeProc": 0.1, "price": 50.0, "currency": "SEK", "shares": 1000, "sharesProc": 1.0,
+         "date": f"2024-02-0{k + 1}T00:00:00"} for k in range(2)]),
+    "/v1/holdings/shorts": lambda p: {"list": [{"insId": 1, "shortsProc": 2.5, "lastTransactionDate": "2024-03-04"},
+                                               {"insId": 2, "shortsProc": None}]},
+    "/v1/instruments/dividend/calendar": lambda p: per_instrument(p, lambda i: [
+        {"amountPaid": 1.5, "currencyShortName": "SEK", "excludingDate": "2024-04-10T00:00:00", "dividendType": 0}]),
+    "/v1/instruments/report/calendar": lambda p: per_instrument(p, lambda i: [
+        {"releaseDate": "2024-04-20T00:00:00", "reportType": "Q1"}]),
+    "/v1/instruments/description": lambda p: {"list": [
+        {"insId": int(i), "languageCode": "en", "text": f"Company {i}"} for i in p["instList"].split(",")]},
+}
+
+
+class FakeBulkClient(BorsdataAPIClient):
+    def __init__(self):
+        super().__init__(api_key="test")
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _get(self, path, params=None):
+        with self._lock:
+            self.calls.append(path)
+        return ROUTES[path](params)
+
+
+class TestBulkIngestion(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.client = FakeBulkClient()
+        self.instruments = list(range(1, 121))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_refresh_holdings_writes_columnar_tables(self):
+        counts = refresh_holdings(self.client, self.instruments, "key", self.tmp.name)
+        self.assertEqual(counts, {"insider": 119, "shorts": 2, "buyback": 238})
+        self.assertEqual(self.client.calls.count("/v1/holdings/insider"), 3)
+        self.assertEqual(self.client.calls.count("/v1/holdings/shorts"), 1)
+        insider = load_table(os.path.join(self.tmp.name, "insider.npz"))
+        self.assertEqual(insider["verificationDate"].dtype, np.dtype("M8[D]"))
+        self.assertTrue(np.isnat(insider["transactionDate"]).all())
+        self.assertNotIn(13, insider["insId"])
+        np.testing.assert_array_equal(insider["shares"][:2], [100, 200])
+        self.assertEqual(insider["ownerPosition"][0], "")
+        shorts = load_table(os.path.join(self.tmp.name, "shorts.npz"))
+        np.testing.assert_array_equal(shorts["shortsProc"], [2.5, np.nan])
+
+    def test_refresh_calendars(self):
+        counts = refresh_calendars(self.client, self.instruments, "key", self.tmp.name)
+        self.assertEqual(counts, {"dividends": 119, "report_calendar": 119, "descriptions": 120})
+        dividends = load_table(os.path.join(self.tmp.name, "dividends.npz"))
+        self.assertEqual(dividends["excludingDate"][0], np.datetime64("2024-04-10"))
+        self.assertTrue(np.isnan(dividends["distributionFrequency"]).all())
+        descriptions = load_table(os.path.join(self.tmp.name, "descriptions.npz"))
+        self.assertEqual(descriptions["text"][-1], "Company 120")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+from borsdata_client import BorsdataAPIClient
+from WSVPortfolio import KpiCube
+from WSVPortfolio.kpicube import build_cubes, period_code, period_range
+
+
+class FakeHistoryClient(BorsdataAPIClient):
+    """Serves KPI history where value = kpiId + year/10000 + period/10 for instruments 1-3 and 77."""
+
+    def __init__(self):
+        super().__init__(api_key="test")
+        self.offset = 0.0
+        self.requested = []
+
+    def _get(self, path, params=None):
+        _, _, _, kpi_id, reporttype, _, _ = path.strip("/").split("/")
+        instruments = [int(i) for i in params["instList"].split(",")]
+        self.requested.append((int(kpi_id), reporttype, instruments))
+        periods = [5] if reporttype == "year" else [1, 2, 3, 4]
+        return {"kpiId": int(kpi_id), "reportTime": reporttype, "priceValue": "mean", "kpisList": [
+            {"instrument": ins_id, "values": [
+                {"y": y, "p": p, "v": None if (ins_id == 2 and y == 2021) else int(kpi_id) + y / 10000 + p / 10 + self.offset}
+                for y in (2019, 2020, 2021) for p in periods
+            ]}
+            for ins_id in instruments if ins_id in (1, 2, 3, 77)
+        ]}
+
+
+class TestKpiCube(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "quarter")
+        self.client = FakeHistoryClient()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_period_codes(self):
+        self.assertEqual(int(period_code(2020, 3, "quarter")), 20203)
+        self.assertEqual(int(period_code(2020, 5, "year")), 20200)
+        np.testing.assert_array_equal(period_range(2020, 2021, "year"), [20200, 20210])
+        self.assertEqual(len(period_range(2020, 2021, "r12")), 8)
+
+    def test_build_and_open_read_only(self):
+        cube = KpiCube.create(self.root, [3, 1, 2], period_range(2020, 2022, "quarter"), "quarter")
+        cube.build_many(self.client, [2, 10])
+        reader = KpiCube(self.root)
+        self.assertEqual(reader.values.shape, (2, 3, 12))
+        np.testing.assert_array_equal(reader.instruments, [1, 2, 3])
+        series = reader.series(10, 3)
+        self.assertAlmostEqual(series[0], 10 + 2020 / 10000 + 0.1)
+        self.assertTrue(np.isnan(series[8:]).all())  # 2022 not served
+        self.assertTrue(np.isnan(reader.series(2, 2)[4:8]).all())  # None values
+        self.assertFalse(reader.values.flags.writeable)
+        with self.assertRaises(PermissionError):
+            reader.build(self.client, 2)
+
+    def test_rebuild_touches_only_its_slice(self):
+        cube = KpiCube.create(self.root, [1, 2, 3], period_range(2020, 2021, "quarter"), "quarter")
+        cube.build_many(self.client, [2, 10, 42])
+        before = np.array(KpiCube(self.root).values)
+        self.client.offset = 1000.0
+        cube.build(self.client, 10)
+        reader = KpiCube(self.root)
+        k = reader.kpis.tolist().index(10)
+        others = [j for j in range(3) if j != k]
+        np.testing.assert_array_equal(reader.values[others], before[others])
+        rebuilt = reader.slice(10)
+        np.testing.assert_allclose(rebuilt[~np.isnan(rebuilt)], before[k][~np.isnan(before[k])] + 1000.0)
+        self.assertEqual(os.path.getsize(os.path.join(self.root, "values.f8")), before.nbytes)
+
+    def test_requests_only_cube_instruments(self):
+        cube = KpiCube.create(self.root, range(1, 121), period_range(2020, 2021, "quarter"), "quarter")
+        cube.build(self.client, 5)
+        self.assertEqual([len(ids) for _, _, ids in self.client.requested], [50, 50, 20])
+        self.assertEqual(sorted(i for _, _, ids in self.client.requested for i in ids), list(range(1, 121)))
+
+    def test_append_drops_orphan_slice(self):
+        cube = KpiCube.create(self.root, [1, 2, 3], period_range(2020, 2021, "quarter"), "quarter")
+        cube.build(self.client, 2)
+        with open(os.path.join(self.root, "values.f8"), "ab") as f:
+            f.write(b"\xff" * 100)  # a writer died after the slice, before the id
+        cube.build(self.client, 10)
+        reader = KpiCube(self.root)
+        self.assertEqual(os.path.getsize(os.path.join(self.root, "values.f8")), reader.values.nbytes)
+        self.assertAlmostEqual(reader.series(10, 1)[0], 10 + 2020 / 10000 + 0.1)
+
+    def test_independent_writers_append_in_step(self):
+        KpiCube.create(self.root, [1, 2, 3], period_range(2020, 2021, "quarter"), "quarter")
+        writers = [KpiCube(self.root, writable=True) for _ in range(4)]
+        threads = [threading.Thread(target=w.build_many, args=(self.client, range(k, 40, 4))) for k, w in enumerate(writers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        reader = KpiCube(self.root)
+        self.assertEqual(sorted(reader.kpis.tolist()), list(range(40)))
+        for kpi_id in range(40):
+            self.assertAlmostEqual(reader.series(kpi_id, 3)[0], kpi_id + 2020 / 10000 + 0.1)
+
+    def test_build_cubes_per_report_type(self):
+        cubes = build_cubes(self.client, self.tmp.name, [7], [1, 2], 2020, 2021, reporttypes=("year", "r12"))
+        self.assertEqual(cubes["year"].values.shape, (1, 2, 2))
+        self.assertEqual(cubes["r12"].values.shape, (1, 2, 8))
+        self.assertAlmostEqual(cubes["year"].series(7, 1)[1], 7 + 2021 / 10000 + 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from borsdata_client import BorsdataAPIClient, MemoryCache
+from borsdata_client.memo import SingleFlight
+
+
+class SlowFetchClient(BorsdataAPIClient):
+    """Client whose network fetch is slow and counted."""
+
+    def __init__(self, **kwargs):
+        super().__init__(api_key="test", **kwargs)
+        self.fetches = 0
+        self._count_lock = threading.Lock()
+
+    def _fetch(self, path, params=None):
+        with self._count_lock:
+            self.fetches += 1
+        time.sleep(0.05)
+        return {"markets": [{"id": 1, "name": "Large Cap"}], "sectors": [{"id": 2, "name": "Tech"}]}
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_share_result(self):
+        flight = SingleFlight()
+        calls = []
+
+        def work():
+            calls.append(1)
+            time.sleep(0.05)
+            return 42
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda _: flight.do("k", work), range(8)))
+        self.assertEqual(results, [42] * 8)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.coalesced, 7)
+
+    def test_error_propagates_to_waiters_and_is_not_kept(self):
+        flight = SingleFlight()
+        with self.assertRaises(ZeroDivisionError):
+            flight.do("k", lambda: 1 / 0)
+        self.assertEqual(flight.do("k", lambda: 1), 1)
+
+
+class TestMemoryCache(unittest.TestCase):
+    def test_lru_and_ttl(self):
+        cache = MemoryCache(maxsize=2, ttls={"/a": 0.0})
+        self.assertEqual(cache.get_or_load(("/a",), lambda: 1), 1)
+        self.assertEqual(cache.get_or_load(("/a",), lambda: 2), 2)  # expired immediately
+        cache.get_or_load(("/b",), lambda: "b")
+        cache.get_or_load(("/c",), lambda: "c")
+        self.assertEqual(cache.get_or_load(("/b",), lambda: "B"), "b")
+        stats = cache.stats()
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 4)
+
+    def test_invalidate_by_path(self):
+        cache = MemoryCache()
+        cache.get_or_load(("/a", 1), lambda: 1)
+        cache.get_or_load(("/b", 1), lambda: 2)
+        cache.invalidate("/a")
+        self.assertEqual(cache.stats()["size"], 1)
+
+    def test_client_coalesces_and_memoizes_metadata(self):
+        client = SlowFetchClient(memory_cache=MemoryCache())
+        with ThreadPoolExecutor(16) as pool:
+            results = list(pool.map(lambda _: client.get_markets(), range(16)))
+        self.assertEqual(client.fetches, 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        client.get_markets()
+        client.get_sectors()
+        self.assertEqual(client.fetches, 2)
+        stats = client.memory_cache.stats()
+        self.assertGreaterEqual(stats["hits"], 1)
+        self.assertEqual(stats["size"], 2)
+
+    def test_client_coalesces_without_memory_cache(self):
+        client = SlowFetchClient()
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(lambda _: client.get_sectors(), range(8)))
+        self.assertEqual(client.fetches, 1)
+        client.get_sectors()
+        self.assertEqual(client.fetches, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
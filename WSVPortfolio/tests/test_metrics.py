@@ -0,0 +1,159 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+import requests
+
+from borsdata_client import (AsyncBorsdataAPIClient, BorsdataAPIClient, HistogramMetrics, MemoryCache,
+                             PrometheusMetrics, ResponseCache, RetryPolicy)
+from borsdata_client.metrics import endpoint_template
+from borsdata_client.mock_server import MockBorsdataServer
+
+NO_BACKOFF = RetryPolicy(max_retries=20, backoff_base=0, backoff_max=0)
+
+
+class TestEndpointTemplate(unittest.TestCase):
+    def test_numeric_segments(self):
+        self.assertEqual(endpoint_template("/v1/instruments/3/stockprices"), "/v1/instruments/{id}/stockprices")
+        self.assertEqual(endpoint_template("/v1/instruments/kpis/12/last/latest"), "/v1/instruments/kpis/{id}/last/latest")
+        self.assertEqual(endpoint_template("/v1/markets"), "/v1/markets")
+
+
+class TestHistogramMetrics(unittest.TestCase):
+    def test_summary(self):
+        metrics = HistogramMetrics()
+        for seconds in (0.001, 0.002, 0.003, 0.2):
+            metrics.observe("/v1/markets", "ttfb", seconds)
+        metrics.increment("/v1/markets", "bytes", 100)
+        metrics.increment("/v1/markets", "bytes", 50)
+        summary = metrics.summary()["/v1/markets"]
+        self.assertEqual(summary["ttfb"]["count"], 4)
+        self.assertAlmostEqual(summary["ttfb"]["sum"], 0.206)
+        self.assertEqual(summary["ttfb"]["max"], 0.2)
+        self.assertEqual(summary["ttfb"]["p50"], 0.0025)
+        self.assertEqual(summary["ttfb"]["p99"], 0.2)
+        self.assertEqual(summary["bytes"], 150)
+        metrics.reset()
+        self.assertEqual(metrics.summary(), {})
+
+    def test_custom_buckets(self):
+        metrics = PrometheusMetrics(buckets=(0.1, 1))
+        self.assertEqual(metrics.buckets, (0.1, 1.0, float("inf")))
+        metrics.observe("/v1/markets", "ttfb", 0.1)
+        metrics.observe("/v1/markets", "ttfb", 30.0)
+        self.assertEqual(metrics._histograms[("/v1/markets", "ttfb")][0], [1, 0, 1])
+        self.assertEqual(metrics.summary()["/v1/markets"]["ttfb"]["p99"], 30.0)
+        self.assertIn('le="+Inf"} 2', metrics.render())
+        with self.assertRaises(ValueError):
+            HistogramMetrics(buckets=(1.0, 0.5))
+
+    def test_prometheus_text(self):
+        metrics = PrometheusMetrics(prefix="bd")
+        metrics.observe("/v1/instruments/{id}/stockprices", "decode", 0.003)
+        metrics.increment("/v1/instruments/{id}/stockprices", "retries")
+        lines = metrics.render().splitlines()
+        labels = 'endpoint="/v1/instruments/{id}/stockprices",phase="decode"'
+        self.assertIn("# TYPE bd_phase_seconds histogram", lines)
+        self.assertIn(f'bd_phase_seconds_bucket{{{labels},le="0.0025"}} 0', lines)
+        self.assertIn(f'bd_phase_seconds_bucket{{{labels},le="0.005"}} 1', lines)
+        self.assertIn(f'bd_phase_seconds_bucket{{{labels},le="+Inf"}} 1', lines)
+        self.assertIn(f"bd_phase_seconds_count{{{labels}}} 1", lines)
+        self.assertIn("# TYPE bd_retries_total counter", lines)
+        self.assertIn('bd_retries_total{endpoint="/v1/instruments/{id}/stockprices"} 1', lines)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "borsdata.prom")
+            metrics.write_textfile(path)
+            with open(path) as f:
+                self.assertEqual(f.read(), metrics.render())
+
+
+class TestClientMetrics(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockBorsdataServer(universe=50, history=30).start()
+        # Resolve a hostname so the async client sees a DNS lookup.
+        cls.url = cls.server.url.replace("127.0.0.1", "localhost")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_sync_phases(self):
+        metrics = HistogramMetrics()
+        client = BorsdataAPIClient(base_url=self.url, api_key="test", metrics=metrics)
+        client.get_stockprices(1)
+        client.get_stockprices(2)
+        client.get_stockprices_last("test", as_arrays=True)
+        summary = metrics.summary()
+        prices = summary["/v1/instruments/{id}/stockprices"]
+        self.assertEqual(prices["connect"]["count"], 1)  # the second call reuses the connection
+        for phase in ("ttfb", "download", "decode", "parse"):
+            self.assertEqual(prices[phase]["count"], 2, phase)
+        self.assertEqual(prices["requests"], 2)
+        self.assertGreater(prices["bytes"], 0)
+        self.assertNotIn("parse", summary["/v1/instruments/stockprices/last"])
+
+    def test_sync_retries_and_errors(self):
+        server = MockBorsdataServer(universe=10, error_rate=0.5, seed=3).start()
+        try:
+            metrics = HistogramMetrics()
+            client = BorsdataAPIClient(base_url=server.url, api_key="test", metrics=metrics, retry=NO_BACKOFF)
+            for ins_id in range(1, 11):
+                client.get_stockprices(ins_id)
+            keyless = BorsdataAPIClient(base_url=server.url, api_key="", metrics=metrics, retry=NO_BACKOFF)
+            with self.assertRaises(requests.HTTPError):
+                keyless.get_stockprices(1)  # 401 is not retried
+        finally:
+            server.stop()
+        counters = metrics.summary()["/v1/instruments/{id}/stockprices"]
+        self.assertEqual(counters["requests"], sum(server.stats.values()))
+        self.assertEqual(counters["retries"], server.stats[500])
+        self.assertGreater(counters["retries"], 0)
+        self.assertEqual(counters["errors"], 1)
+
+    def test_cache_hits(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            metrics = HistogramMetrics()
+            client = BorsdataAPIClient(base_url=self.url, api_key="test", metrics=metrics,
+                                       cache=ResponseCache(os.path.join(tmp, "cache.sqlite")))
+            client.get_markets()
+            client.get_markets()
+            client.cache.close()
+        markets = metrics.summary()["/v1/markets"]
+        self.assertEqual((markets["requests"], markets["cache_hits"]), (1, 1))
+        self.assertEqual((markets["decode"]["count"], markets["parse"]["count"]), (1, 2))
+
+    def test_memory_cache_hits(self):
+        metrics = HistogramMetrics()
+        client = BorsdataAPIClient(base_url=self.url, api_key="test", metrics=metrics, memory_cache=MemoryCache())
+        for _ in range(3):
+            client.get_markets()
+        markets = metrics.summary()["/v1/markets"]
+        self.assertEqual((markets["requests"], markets["cache_hits"]), (1, 2))
+        self.assertEqual(client.memory_cache.hits, 2)
+
+    def test_async_phases(self):
+        metrics = HistogramMetrics()
+
+        async def run():
+            async with AsyncBorsdataAPIClient(base_url=self.url, api_key="test", metrics=metrics) as client:
+                await client.get_stockprices(1)
+                await client.get_kpi_calc_alt(7, "last", "latest")
+
+        asyncio.run(run())
+        summary = metrics.summary()
+        prices = summary["/v1/instruments/{id}/stockprices"]
+        for phase in ("dns", "connect", "ttfb", "download", "decode", "parse"):
+            self.assertEqual(prices[phase]["count"], 1, phase)
+        self.assertEqual(summary["/v1/instruments/kpis/{id}/last/latest"]["parse"]["count"], 1)
+
+    def test_disabled(self):
+        client = BorsdataAPIClient(base_url=self.url, api_key="test")
+        self.assertIsNone(client.metrics)
+        self.assertEqual(type(client.session.get_adapter(self.url)).__name__, "HTTPAdapter")
+        self.assertEqual(len(client.get_stockprices(1).stockPricesList), 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
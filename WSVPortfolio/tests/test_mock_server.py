@@ -0,0 +1,117 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+import requests
+
+from borsdata_client import BorsdataAPIClient, RetryPolicy
+from borsdata_client.mock_server import MockBorsdataServer, load_fixtures
+
+
+class TestMockServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockBorsdataServer(universe=120, global_universe=30, history=40).start()
+        cls.client = BorsdataAPIClient(base_url=cls.server.url, api_key="test")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_every_spec_path_has_a_route(self):
+        self.assertEqual(len(self.server.routes), len(self.server.spec["paths"]))
+        route, params = self.server.match("/v1/instruments/kpis/7/last/latest")
+        self.assertEqual((route.template, params["kpiId"]), ("/v1/instruments/kpis/{kpiId}/{calcGroup}/{calc}", "7"))
+        route, params = self.server.match("/v1/instruments/5/kpis/year/summary")
+        self.assertEqual(params, {"insid": "5", "reporttype": "year"})
+        self.assertIsNone(self.server.match("/v1/nope")[0])
+
+    def test_universe_scaling(self):
+        self.assertEqual(len(self.client.get_instruments("test").instruments), 120)
+        last = self.client.get_stockprices_global_last("test", as_arrays=True)
+        self.assertEqual(last.i.tolist(), list(range(121, 151)))
+        kpis = self.client.get_kpi_calc_alt(7, "last", "latest")
+        self.assertEqual((kpis.kpiId, len(kpis.values)), (7, 120))
+
+    def test_history_follows_query(self):
+        bars = self.client.get_stockprices(3, as_arrays=True)
+        self.assertEqual((len(bars), bars.instrument, str(bars.d[-1])), (40, 3, "2024-12-31"))
+        batch = self.client.get_stockprices_array_batch(range(1, 61), "test", "2024-12-02", "2024-12-06", as_arrays=True)
+        self.assertEqual(sorted(batch), list(range(1, 61)))
+        self.assertEqual([str(d) for d in batch[60].d], ["2024-12-02", "2024-12-03", "2024-12-04", "2024-12-05", "2024-12-06"])
+        reports = self.client.get_reports_array("1,2", "test", maxYearCount=3, maxR12QCount=5).reportList
+        self.assertEqual([r.instrument for r in reports], [1, 2])
+        self.assertEqual([(r.year, r.period) for r in reports[0].reportsYear], [(2021, 5), (2022, 5), (2023, 5)])
+        self.assertEqual((reports[0].reportsQuarter[-1].year, reports[0].reportsQuarter[-1].period), (2024, 4))
+        self.assertEqual(len(reports[0].reportsR12), 5)
+        snapshot = self.client.get_stockprices_date("test", "2024-06-03", as_arrays=True)
+        self.assertTrue((snapshot.d == snapshot.d[0]).all() and str(snapshot.d[0]) == "2024-06-03")
+
+    def test_responses_are_deterministic(self):
+        first = self.server.body("/v1/instruments/1/stockprices", {})
+        self.server._cache.clear()
+        self.assertEqual(self.server.body("/v1/instruments/1/stockprices", {}), first)
+        self.assertNotEqual(self.server.body("/v1/instruments/2/stockprices", {}), first)
+
+    def test_auth_and_unknown_paths(self):
+        self.assertEqual(requests.get(f"{self.server.url}/v1/markets").status_code, 401)
+        self.assertEqual(requests.get(f"{self.server.url}/v1/nope", params={"authKey": "k"}).status_code, 404)
+
+    def test_fixtures_are_scaled(self):
+        recorded = {"instruments": [{"insId": 1, "name": "Alpha"}, {"insId": 2, "name": "Beta"}]}
+        with MockBorsdataServer(universe=5, fixtures={"/v1/instruments": recorded}) as server:
+            client = BorsdataAPIClient(base_url=server.url, api_key="test", validate=False)
+            rows = client.get_instruments("test").instruments
+        self.assertEqual([(r.insId, r.name) for r in rows], [(1, "Alpha"), (2, "Beta"), (3, "Alpha"), (4, "Beta"), (5, "Alpha")])
+
+    def test_generator_examples_file(self):
+        examples = {  # the layout scripts/generate_api_examples.py writes
+            "markets": {"markets": [{"id": 1, "name": "Recorded Cap", "countryId": 1, "isIndex": False, "exchangeName": "XSTO"}]},
+            "stockprices_last": {"stockPricesList": [{"i": 1, "d": "2024-03-01", "c": 12.5, "o": None, "h": None, "l": None, "v": None}]},
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "borsdata_api_examples.json")
+            with open(path, "w") as f:
+                json.dump(examples, f)
+            fixtures = load_fixtures(path)
+        self.assertEqual(sorted(fixtures), ["/v1/instruments/stockprices/last", "/v1/markets"])
+        with MockBorsdataServer(universe=3, fixtures=fixtures) as server:
+            client = BorsdataAPIClient(base_url=server.url, api_key="test")
+            self.assertEqual(client.get_markets().markets[0].name, "Recorded Cap")
+            last = client.get_stockprices_last("test", as_arrays=True)
+        self.assertEqual((last.i.tolist(), last.c.tolist()), ([1, 2, 3], [12.5, 12.5, 12.5]))
+        with self.assertRaises(ValueError):
+            MockBorsdataServer(fixtures={"no_such_example": {}})
+
+
+class TestFaultInjection(unittest.TestCase):
+    def test_errors_are_retried(self):
+        with MockBorsdataServer(universe=5, error_rate=0.5, seed=3) as server:
+            client = BorsdataAPIClient(base_url=server.url, api_key="test",
+                                       retry=RetryPolicy(max_retries=20, backoff_base=0.0, backoff_max=0.0))
+            for _ in range(10):
+                self.assertEqual(len(client.get_markets().markets), 5)
+            self.assertGreater(server.stats[500], 0)
+            self.assertEqual(server.stats[200], 10)
+
+    def test_rate_limit_window(self):
+        with MockBorsdataServer(universe=5, rate_limit=(3, 60.0)) as server:
+            client = BorsdataAPIClient(base_url=server.url, api_key="test", retry=RetryPolicy(max_retries=0))
+            for _ in range(3):
+                client.get_sectors()
+            with self.assertRaises(requests.HTTPError) as ctx:
+                client.get_sectors()
+        self.assertEqual(ctx.exception.response.status_code, 429)
+        self.assertGreater(int(ctx.exception.response.headers["Retry-After"]), 50)
+
+    def test_latency(self):
+        server = MockBorsdataServer(universe=5, latency=(0.01, 0.02))
+        start = time.perf_counter()
+        self.assertEqual(server.fault(), (None, {}))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
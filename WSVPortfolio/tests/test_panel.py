@@ -0,0 +1,83 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+from borsdata_client import BorsdataAPIClient
+from WSVPortfolio import Panel, PanelBuilder
+from WSVPortfolio.panel import weekdays
+
+
+class FakeDateClient(BorsdataAPIClient):
+    """Serves a snapshot per date: instrument i closes at i + day-of-month; `fail` dates raise."""
+
+    def __init__(self, fail=()):
+        super().__init__(api_key="test")
+        self.fail = set(fail)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _get(self, path, params=None):
+        with self._lock:
+            self.calls.append((path, params["date"]))
+        if params["date"] in self.fail:
+            raise RuntimeError("boom")
+        day = int(params["date"][8:10])
+        return {"stockPricesList": [{"i": i, "d": params["date"], "c": float(i + day), "v": 100.0 * i}
+                                    for i in (1, 2, 3, 99)]}
+
+
+class TestPanel(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "panel")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_weekdays(self):
+        days = weekdays("2024-01-05", "2024-01-09")
+        self.assertEqual([str(d) for d in days], ["2024-01-05", "2024-01-08", "2024-01-09"])
+
+    def test_build_scatters_snapshots(self):
+        builder = PanelBuilder(self.root, [3, 1, 2, 4], "2024-01-01", "2024-01-05", fields=("c", "v"))
+        client = FakeDateClient()
+        result = builder.build(client, "key", max_workers=3)
+        self.assertEqual((result["fetched"], result["skipped"], result["failed"]), (5, 0, {}))
+        self.assertTrue(all(path == "/v1/instruments/stockprices/date" for path, _ in client.calls))
+
+        panel = Panel(self.root)
+        self.assertEqual(panel.shape, (5, 4))
+        self.assertEqual(panel.instruments.tolist(), [1, 2, 3, 4])
+        closes = panel.matrix("c")
+        np.testing.assert_array_equal(closes[:, 0], [2, 3, 4, 5, 6])
+        self.assertTrue(np.isnan(closes[:, 3]).all())
+        np.testing.assert_array_equal(panel.column(2, "v"), 200.0)
+        with self.assertRaises(KeyError):
+            panel.matrix("o")
+
+    def test_resume_fetches_only_unfinished_dates(self):
+        builder = PanelBuilder(self.root, [1, 2], "2024-01-01", "2024-01-05")
+        result = builder.build(FakeDateClient(fail={"2024-01-03"}), "key")
+        self.assertEqual((result["fetched"], list(result["failed"])), (4, ["2024-01-03"]))
+        self.assertEqual(Panel(self.root).done.tolist(), [True, True, False, True, True])
+
+        client = FakeDateClient()
+        result = PanelBuilder(self.root, [], "2000-01-01", "2000-01-01").build(client, "key")
+        self.assertEqual(client.calls, [("/v1/instruments/stockprices/date", "2024-01-03")])
+        self.assertEqual((result["fetched"], result["skipped"]), (1, 4))
+        np.testing.assert_array_equal(Panel(self.root).matrix()[2], [4, 5])
+
+    def test_global_and_price_matrix(self):
+        builder = PanelBuilder(self.root, [1], "2024-01-01", "2024-01-02", global_=True)
+        client = FakeDateClient(fail={"2024-01-02"})
+        builder.build(client, "key")
+        self.assertTrue(all(path.endswith("/global/date") for path, _ in client.calls))
+        prices = Panel(self.root).price_matrix()
+        np.testing.assert_array_equal(prices.closes[:, 0], [2, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import threading
+import unittest
+
+import numpy as np
+
+from borsdata_client import BorsdataAPIClient
+from WSVPortfolio import LastPricePoller
+
+
+class FakeLastClient(BorsdataAPIClient):
+    """Serves `rows` (a list of stockPricesList dicts) on every last-price call."""
+
+    def __init__(self, rows):
+        super().__init__(api_key="test")
+        self.rows = rows
+        self.paths = []
+
+    def _get(self, path, params=None):
+        self.paths.append(path)
+        return {"stockPricesList": [dict(row) for row in self.rows]}
+
+
+def bar(i, c, v=1000.0, d="2024-03-01"):
+    return {"i": i, "d": d, "o": c, "h": c, "l": c, "c": c, "v": v}
+
+
+class TestLastPricePoller(unittest.TestCase):
+    def test_first_poll_publishes_everything(self):
+        client = FakeLastClient([bar(3, 30.0), bar(1, 10.0), bar(2, 20.0)])
+        poller = LastPricePoller(client, "key")
+        changes = poller.poll()
+        self.assertEqual(sorted(changes["i"].tolist()), [1, 2, 3])
+        self.assertTrue(np.isnan(changes["prev_c"]).all())
+        self.assertEqual(poller.table["i"].tolist(), [1, 2, 3])
+        self.assertEqual(client.paths, ["/v1/instruments/stockprices/last"])
+
+    def test_only_changed_rows_are_emitted(self):
+        client = FakeLastClient([bar(1, 10.0), bar(2, 20.0), bar(3, 30.0, v=None)])
+        poller = LastPricePoller(client, "key")
+        poller.poll()
+        self.assertEqual(len(poller.poll()), 0)  # NaN volume compares equal to NaN
+
+        client.rows = [bar(1, 10.0), bar(2, 21.0), bar(3, 30.0, v=None), bar(4, 40.0), bar(5, 50.0, d="2024-03-04")]
+        client.rows[0]["d"] = "2024-03-04"
+        changes = poller.poll()
+        self.assertEqual(changes["i"].tolist(), [1, 2, 4, 5])
+        np.testing.assert_array_equal(changes["prev_c"][:2], [10.0, 20.0])
+        self.assertTrue(np.isnan(changes["prev_c"][2:]).all())
+        self.assertEqual(poller.snapshot(2)["c"], 21.0)
+        self.assertEqual(str(poller.snapshot(1)["d"]), "2024-03-04")
+        self.assertEqual(poller.table["i"].tolist(), [1, 2, 3, 4, 5])
+        self.assertIsNone(poller.snapshot(9))
+
+        client.rows = [bar(2, 21.0, v=5.0)]  # missing rows keep their last value
+        self.assertEqual(poller.poll()["i"].tolist(), [2])
+        self.assertEqual(len(poller.table), 5)
+
+    def test_repeated_ids_keep_the_last_row(self):
+        client = FakeLastClient([bar(2, 20.0), bar(1, 10.0), bar(2, 22.0)])
+        poller = LastPricePoller(client, "key")
+        changes = poller.poll()
+        self.assertEqual(changes["i"].tolist(), [1, 2])
+        self.assertEqual(changes["c"].tolist(), [10.0, 22.0])
+        self.assertEqual(poller.table["i"].tolist(), [1, 2])
+
+        client.rows = [bar(1, 10.0), bar(2, 22.0), bar(2, 23.0), bar(3, 30.0)]
+        changes = poller.poll()
+        self.assertEqual(changes["i"].tolist(), [2, 3])
+        np.testing.assert_array_equal(changes["prev_c"], [22.0, np.nan])
+        self.assertEqual(poller.snapshot(2)["c"], 23.0)
+
+    def test_subscribers_and_queue(self):
+        client = FakeLastClient([bar(1, 10.0)])
+        poller = LastPricePoller(client, "key", global_=True)
+        seen = []
+        unsubscribe = poller.subscribe(seen.append)
+        q = poller.queue()
+        poller.poll()
+        poller.poll()  # nothing changed, nothing published
+        self.assertEqual(len(seen), 1)
+        self.assertEqual(q.get_nowait()["i"].tolist(), [1])
+        self.assertTrue(q.empty())
+        unsubscribe()
+        client.rows = [bar(1, 11.0)]
+        poller.poll()
+        self.assertEqual(len(seen), 1)
+        self.assertEqual(q.get_nowait()["c"].tolist(), [11.0])
+        self.assertEqual(client.paths[0], "/v1/instruments/stockprices/global/last")
+
+    def test_background_polling(self):
+        client = FakeLastClient([bar(1, 10.0)])
+        poller = LastPricePoller(client, "key")
+        published = threading.Event()
+        poller.subscribe(lambda changes: published.set())
+        poller.start(interval=0.01)
+        with self.assertRaises(RuntimeError):
+            poller.start(interval=0.01)
+        self.assertTrue(published.wait(5))
+        poller.stop(timeout=5)
+        self.assertIsNone(poller._thread)
+
+
+if __name__ == "__main__":
+    unittest.main()
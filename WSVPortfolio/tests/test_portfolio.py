@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+
+from borsdata_client.arrays import PriceArrays
+from WSVPortfolio.portfolio import (CASHFLOW_DTYPE, TRANSACTION_DTYPE, align_closes, forward_fill, positions, valuate,
+                                    weights)
+
+
+def bars(dates, closes):
+    d = np.array(dates, dtype="M8[D]")
+    c = np.array(closes, dtype=np.float64)
+    nan = np.full(len(d), np.nan)
+    return PriceArrays(d, nan, nan, nan, c, nan)
+
+
+class TestPortfolio(unittest.TestCase):
+    def setUp(self):
+        self.prices = align_closes({
+            1: bars(["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"], [10, 11, 12, 12]),
+            2: bars(["2024-01-01", "2024-01-03", "2024-01-04"], [100, 90, 99]),
+        })
+        self.tx = np.array([
+            (7, "2024-01-01", 1, 10, 10, 0),
+            (7, "2024-01-02", 2, 1, 100, 1),
+            (7, "2024-01-04", 1, -5, 12, 0),
+            (8, "2024-01-01", 2, 2, 100, 0),
+        ], dtype=TRANSACTION_DTYPE)
+        self.cf = np.array([
+            (7, "2024-01-01", 300),
+            (8, "2024-01-01", 200),
+            (8, "2024-01-03", 100),
+        ], dtype=CASHFLOW_DTYPE)
+
+    def test_forward_fill(self):
+        values = np.array([[np.nan, 1], [2, np.nan], [np.nan, np.nan]])
+        np.testing.assert_array_equal(forward_fill(values), [[np.nan, 1], [2, 1], [2, 1]])
+
+    def test_align_closes(self):
+        np.testing.assert_array_equal(self.prices.ids, [1, 2])
+        np.testing.assert_array_equal(self.prices.closes[:, 1], [100, 100, 90, 99])
+
+    def test_nav_cash_and_twr(self):
+        v = valuate(self.prices, self.tx, self.cf)
+        np.testing.assert_array_equal(v.portfolios, [7, 8])
+        # Portfolio 7: 300 in, buys 10 @ 10, 1 @ 100 + fee 1, sells 5 @ 12.
+        np.testing.assert_allclose(v.cash[0], [200, 99, 99, 159])
+        np.testing.assert_allclose(v.holdings[0], [100, 210, 210, 159])
+        np.testing.assert_allclose(v.nav[0], [300, 309, 309, 318])
+        # Portfolio 8: 2 shares of instrument 2, 100 deposited on day 3.
+        np.testing.assert_allclose(v.nav[1], [200, 200, 280, 298])
+        np.testing.assert_allclose(v.returns[1], [0, 0, 180 / 200 - 1, 298 / 280 - 1])
+        np.testing.assert_allclose(v.twr[:, -1], [318 / 300 - 1, (180 / 200) * (298 / 280) - 1])
+
+    def test_weights_and_positions(self):
+        ids, w = weights(self.prices, self.tx, 7, self.cf)
+        np.testing.assert_array_equal(ids, [1, 2])
+        np.testing.assert_allclose(w[-1], [60 / 318, 99 / 318])
+        held = positions(self.prices, self.tx, 7)
+        np.testing.assert_array_equal(held[1], [10, 10, 10, 5])
+
+    def test_missing_close_of_held_position_is_nan(self):
+        prices = align_closes({1: bars(["2024-01-01", "2024-01-02"], [10, 11]), 3: bars(["2024-01-02"], [5])})
+        tx = np.array([(1, "2024-01-01", 3, 1, 5, 0), (2, "2024-01-01", 1, 1, 10, 0)], dtype=TRANSACTION_DTYPE)
+        v = valuate(prices, tx)
+        np.testing.assert_array_equal(v.holdings, [[np.nan, 5], [10, 11]])
+
+    def test_unknown_instrument(self):
+        tx = np.array([(1, "2024-01-01", 99, 1, 1, 0)], dtype=TRANSACTION_DTYPE)
+        with self.assertRaises(ValueError):
+            valuate(self.prices, tx)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from borsdata_client import BorsdataAPIClient
+from WSVPortfolio import PriceStore
+from WSVPortfolio.pricestore import PRICE_DTYPE
+
+
+class FakePriceClient(BorsdataAPIClient):
+    """Serves one bar per calendar day from 2024-01-01 up to the requested `to` date."""
+
+    def __init__(self):
+        super().__init__(api_key="test")
+        self.requests = []
+
+    def _get(self, path, params=None):
+        self.requests.append(dict(params))
+        start = np.datetime64(params.get("from", "2024-01-01"))
+        end = np.datetime64(params["to"])
+        days = np.arange(start, end + 1)
+        return {"stockPricesArrayList": [
+            {"instrument": int(i), "stockPricesList": [
+                {"d": str(d), "c": float(k), "o": None, "v": 100} for k, d in enumerate(days)
+            ]}
+            for i in params["instList"].split(",")
+        ]}
+
+
+class TestPriceStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = PriceStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_append_is_idempotent_and_sorted(self):
+        records = np.zeros(3, dtype=PRICE_DTYPE)
+        records["d"] = np.array(["2024-01-03", "2024-01-01", "2024-01-02"], dtype="M8[D]")
+        self.assertEqual(self.store.append(5, records), 3)
+        self.assertEqual(self.store.append(5, records), 0)
+        self.assertEqual(str(self.store.last_date(5)), "2024-01-03")
+        self.assertTrue(np.all(np.diff(self.store.read(5)["d"]) > np.timedelta64(0, "D")))
+
+    def test_update_fetches_only_missing_tail(self):
+        client = FakePriceClient()
+        appended = self.store.update(client, [1, 2], "key", until="2024-01-10")
+        self.assertEqual(appended, {1: 10, 2: 10})
+        self.assertEqual(len(client.requests), 1)
+
+        appended = self.store.update(client, [1, 2, 3], "key", until="2024-01-15")
+        self.assertEqual(appended, {1: 5, 2: 5, 3: 15})
+        self.assertEqual(client.requests[-2]["from"], "2024-01-11")
+        self.assertEqual(client.requests[-2]["instList"], "1,2")
+        self.assertNotIn("from", client.requests[-1])
+
+        client.requests.clear()
+        self.assertEqual(self.store.update(client, [1, 2, 3], "key", until="2024-01-15"), {})
+        self.assertEqual(client.requests, [])
+
+    def test_read_date_range(self):
+        self.store.update(FakePriceClient(), [7], "key", until="2024-01-31")
+        bars = self.store.read(7, "2024-01-05", "2024-01-07")
+        self.assertEqual([str(d) for d in bars["d"]], ["2024-01-05", "2024-01-06", "2024-01-07"])
+        self.assertTrue(np.isnan(bars["o"]).all())
+        self.assertEqual(bars["v"][0], 100)
+        self.assertEqual(len(self.store.read(99)), 0)
+        self.assertEqual(self.store.instruments(), [7])
+
+
+if __name__ == "__main__":
+    unittest.main()
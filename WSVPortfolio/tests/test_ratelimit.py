@@ -0,0 +1,114 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import requests
+
+from borsdata_client.client import BorsdataAPIClient
+from borsdata_client.ratelimit import RetryPolicy, SQLiteTokenBucket, TokenBucket, parse_retry_after
+
+
+def make_response(status, body=None, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(body or {}).encode()
+    response.raw = io.BytesIO(response._content)
+    response.headers.update(headers or {})
+    response.url = "http://test"
+    return response
+
+
+class ScriptedSession:
+    """Stands in for requests.Session, returning queued responses in order."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.headers = {}
+        self.calls = 0
+
+    def get(self, url, params=None, **kwargs):
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_queue(self):
+        bucket = TokenBucket(rate=10, per=1.0)
+        waits = [bucket.reserve() for _ in range(12)]
+        self.assertTrue(all(w == 0 for w in waits[:10]))
+        self.assertAlmostEqual(waits[10], 0.1, delta=0.01)
+        self.assertAlmostEqual(waits[11], 0.2, delta=0.01)
+
+    def test_pause_blocks_reservations(self):
+        bucket = TokenBucket(rate=100, per=1.0)
+        bucket.pause(2.0)
+        self.assertGreaterEqual(bucket.reserve(), 1.9)
+
+    def test_sqlite_bucket_shared_between_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bucket.sqlite")
+            a = SQLiteTokenBucket(path, rate=2, per=10.0, key="api-key")
+            b = SQLiteTokenBucket(path, rate=2, per=10.0, key="api-key")
+            other = SQLiteTokenBucket(path, rate=2, per=10.0, key="other-key")
+            self.assertEqual(a.reserve(), 0)
+            self.assertEqual(b.reserve(), 0)
+            self.assertAlmostEqual(a.reserve(), 5.0, delta=0.1)
+            self.assertEqual(other.reserve(), 0)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("3"), 3.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+    def test_delay_is_jittered_and_capped(self):
+        policy = RetryPolicy(backoff_base=1.0, backoff_max=4.0)
+        for attempt in range(8):
+            self.assertLessEqual(policy.delay(attempt), 4.0)
+        self.assertGreaterEqual(policy.delay(0, "2"), 2.0)
+
+    def test_should_retry(self):
+        policy = RetryPolicy(max_retries=2)
+        self.assertTrue(policy.should_retry(429, 0))
+        self.assertTrue(policy.should_retry(503, 1))
+        self.assertFalse(policy.should_retry(503, 2))
+        self.assertFalse(policy.should_retry(404, 0))
+
+
+class TestClientRetries(unittest.TestCase):
+    def make_client(self, responses, **kwargs):
+        client = BorsdataAPIClient(api_key="test", retry=RetryPolicy(backoff_base=0.001), **kwargs)
+        client.session = ScriptedSession(responses)
+        return client
+
+    def test_retries_429_then_succeeds(self):
+        client = self.make_client([
+            make_response(429, headers={"Retry-After": "0"}),
+            make_response(503),
+            make_response(200, {"countries": [{"id": 1, "name": "Sverige"}]}),
+        ])
+        self.assertEqual(client.get_countries().countries[0].name, "Sverige")
+        self.assertEqual(client.session.calls, 3)
+
+    def test_429_pauses_shared_limiter(self):
+        bucket = TokenBucket(rate=1000, per=1.0)
+        client = self.make_client([
+            make_response(429, headers={"Retry-After": "0"}),
+            make_response(200, {"countries": []}),
+        ], rate_limiter=bucket)
+        client.get_countries()
+        self.assertEqual(client.session.calls, 2)
+
+    def test_gives_up_after_max_retries(self):
+        client = self.make_client([make_response(500)] * 6)
+        with self.assertRaises(requests.HTTPError):
+            client.get_countries()
+        self.assertEqual(client.session.calls, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from borsdata_client import BorsdataAPIClient
+from borsdata_client.models import CompaniesCalenderArrayRespV1, ReportsArrayRespV1, ReportV1
+from borsdata_client.records import Record, build_record, record_type
+
+REPORT = {
+    "year": 2023, "period": 4, "revenues": 100.0, "operating_Income": 10.0, "profit_Before_Tax": 9.0,
+    "earnings_Per_Share": 1.5, "number_Of_Shares": 1000.0, "dividend": 0.5, "non_Current_Assets": 50.0,
+    "current_Assets": 20.0, "total_Assets": 70.0, "total_Equity": 30.0, "total_Liabilities_And_Equity": 70.0,
+    "stock_Price_Average": 12.0, "stock_Price_High": 14.0, "stock_Price_Low": 10.0,
+}
+
+
+class StaticClient(BorsdataAPIClient):
+    def __init__(self, payload, **kwargs):
+        super().__init__(api_key="test", **kwargs)
+        self.payload = payload
+
+    def _get(self, path, params=None):
+        return self.payload
+
+
+class TestRecords(unittest.TestCase):
+    def test_record_mirrors_model_fields(self):
+        cls = record_type(ReportV1)
+        self.assertIs(record_type(ReportV1), cls)
+        self.assertEqual(set(cls.__slots__), set(ReportV1.model_fields if hasattr(ReportV1, "model_fields") else ReportV1.__fields__))
+        record = build_record(ReportV1, REPORT)
+        self.assertEqual(record.earnings_Per_Share, 1.5)
+        self.assertIsNone(record.gross_Income)
+        self.assertFalse(hasattr(record, "__dict__"))
+
+    def test_nested_records_and_round_trip(self):
+        payload = {"reportList": [{"instrument": 3, "reportsYear": [REPORT], "reportsQuarter": None}]}
+        record = build_record(ReportsArrayRespV1, payload)
+        self.assertIsInstance(record.reportList[0].reportsYear[0], Record)
+        model = record.to_model()
+        self.assertIsInstance(model, ReportsArrayRespV1)
+        self.assertEqual(model, ReportsArrayRespV1.parse_obj(payload))
+
+    def test_forward_referenced_nested_model(self):
+        record = build_record(CompaniesCalenderArrayRespV1, {"list": [{"insId": 1, "values": [{"releaseDate": "2024-02-01"}]}]})
+        self.assertEqual(record.list[0].values[0].releaseDate, "2024-02-01")
+
+    def test_client_validation_switch(self):
+        payload = {"reportList": [{"instrument": 3, "reportsYear": [REPORT]}]}
+        client = StaticClient(payload, validate=False)
+        trusted = client.get_reports_array("3", "key")
+        self.assertIsInstance(trusted, Record)
+        validated = client.with_validation(True).get_reports_array("3", "key")
+        self.assertIsInstance(validated, ReportsArrayRespV1)
+        self.assertFalse(client.validate)
+
+    def test_batch_merge_without_validation(self):
+        client = StaticClient(None, validate=False)
+        client._get = lambda path, params=None: {"reportList": [{"instrument": int(i)} for i in params["instList"].split(",")]}
+        merged = client.get_reports_array_batch(range(60), "key")
+        self.assertEqual([r.instrument for r in merged.reportList], list(range(60)))
+
+
+if __name__ == "__main__":
+    unittest.main()
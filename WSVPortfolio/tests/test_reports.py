@@ -0,0 +1,86 @@
+import datetime as dt
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+from borsdata_client import BorsdataAPIClient
+from WSVPortfolio import ReportStore
+from WSVPortfolio.reports import _depth
+
+
+def report(year, period, revenues):
+    return {"year": year, "period": period, "revenues": revenues, "operating_Income": 1.0, "profit_Before_Tax": 1.0,
+            "earnings_Per_Share": 0.5, "number_Of_Shares": 100.0, "dividend": 0.2, "non_Current_Assets": 1.0,
+            "current_Assets": 1.0, "total_Assets": 2.0, "total_Equity": 1.0, "total_Liabilities_And_Equity": 2.0,
+            "stock_Price_Average": 10.0, "stock_Price_High": 11.0, "stock_Price_Low": 9.0, "currency": "SEK",
+            "report_Date": f"{year + 1}-02-15T00:00:00"}
+
+
+class FakeReportsClient(BorsdataAPIClient):
+    """Serves yearly reports through `last_year` and quarters through `last_year` Q`last_period`."""
+
+    def __init__(self, last_year=2023, last_period=4):
+        super().__init__(api_key="test")
+        self.last_year, self.last_period = last_year, last_period
+        self.revision = 0.0
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _get(self, path, params=None):
+        with self._lock:
+            self.calls.append(dict(params))
+        years = int(params["maxYearCount"])
+        quarters = [(y, p) for y in range(self.last_year - 20, self.last_year + 1) for p in range(1, 5)
+                    if (y, p) <= (self.last_year, self.last_period)][-int(params["maxR12QCount"]):]
+        return {"reportList": [{
+            "instrument": int(i),
+            "reportsYear": [report(y, 5, 100.0 * y + self.revision) for y in range(self.last_year - years + 1, self.last_year + 1)],
+            "reportsQuarter": [report(y, p, 10.0 * y + p) for y, p in quarters],
+            "reportsR12": [report(y, p, 40.0 * y + p) for y, p in quarters],
+        } for i in params["instList"].split(",")]}
+
+
+class TestReportStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ReportStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_depth_rounding(self):
+        self.assertEqual([_depth(n, 20) for n in (1, 2, 3, 5, 30)], [1, 2, 4, 8, 20])
+
+    def test_backfill_full_depth_columnar(self):
+        client = FakeReportsClient()
+        added = self.store.backfill(client, range(1, 61), "key")
+        self.assertEqual(added, {"year": 60 * 20, "r12": 60 * 40, "quarter": 60 * 40})
+        self.assertEqual(len(client.calls), 2)
+        self.assertTrue(all(c["maxYearCount"] == 20 and c["maxR12QCount"] == 40 for c in client.calls))
+        year = self.store.read("year")
+        self.assertEqual(year["revenues"].dtype, np.float64)
+        self.assertTrue(np.isnan(year["gross_Income"]).all())
+        self.assertEqual(year["report_Date"][0], np.datetime64("2005-02-15"))
+        np.testing.assert_array_equal(year["insId"][:2], [1, 1])
+        np.testing.assert_array_equal(year["year"][:2], [2004, 2005])
+        self.assertEqual(self.store.last_periods("quarter")[60], (2023, 4))
+
+    def test_update_fetches_and_merges_only_new_periods(self):
+        self.store.backfill(FakeReportsClient(last_year=2023, last_period=3), [1, 2], "key")
+        client = FakeReportsClient(last_year=2024, last_period=1)
+        client.revision = 0.5
+        added = self.store.update(client, [1, 2, 3], "key", today=dt.date(2024, 5, 1))
+        requested = sorted((c["instList"], c["maxYearCount"], c["maxR12QCount"]) for c in client.calls)
+        self.assertEqual(requested, [("1,2", 2, 4), ("3", 20, 40)])
+        self.assertEqual(added["quarter"], 2 * 2 + 40)  # 2023Q4 and 2024Q1 for 1 and 2
+        self.assertEqual(added["year"], 2 + 20)
+        year = self.store.read("year")
+        rows = year["insId"] == 1
+        self.assertEqual(rows.sum(), 21)
+        self.assertEqual(year["revenues"][rows][-2], 100.0 * 2023 + 0.5)  # re-reported period replaced
+
+
+if __name__ == "__main__":
+    unittest.main()
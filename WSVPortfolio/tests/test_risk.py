@@ -0,0 +1,101 @@
+import unittest
+
+import numpy as np
+
+from WSVPortfolio import PriceMatrix, RiskEngine
+from WSVPortfolio.risk import returns
+
+
+def make_prices(days=120, instruments=7, seed=1):
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, days)
+    noise = rng.normal(0, 0.01, (days, instruments))
+    loadings = np.linspace(0.5, 1.5, instruments)
+    rets = market[:, None] * loadings + noise
+    rets[:, 0] = market  # column 0 is the index
+    closes = 100 * np.cumprod(1 + rets, axis=0)
+    closes[10:20, 3] = np.nan  # a gap
+    dates = np.datetime64("2024-01-01") + np.arange(days)
+    return PriceMatrix(dates, np.arange(100, 100 + instruments), closes)
+
+
+class TestRisk(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.prices = make_prices()
+        cls.engine = RiskEngine(cls.prices, max_workers=2, block_size=3)
+        cls.r = returns(cls.prices)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.engine.close()
+
+    def test_returns_in_shared_memory(self):
+        np.testing.assert_array_equal(self.engine.returns, self.r)
+        self.assertTrue(np.isnan(self.r[0]).all())
+        self.assertTrue(np.isnan(self.r[10:21, 3]).all())
+
+    def test_rolling_volatility(self):
+        vol = self.engine.rolling_volatility(window=20, annualize=None)
+        self.assertEqual(vol.shape, self.prices.closes.shape)
+        for t in (20, 50, 119):
+            np.testing.assert_allclose(vol[t, 1], np.std(self.r[t - 19:t + 1, 1], ddof=1))
+        self.assertTrue(np.isnan(vol[:20, 1]).all())
+        self.assertTrue(np.isnan(vol[25, 3]))  # too few returns in the window
+        scaled = self.engine.rolling_volatility(window=20)
+        np.testing.assert_allclose(scaled[50], vol[50] * np.sqrt(252))
+
+    def test_rolling_volatility_long_offset_series(self):
+        rng = np.random.default_rng(2)
+        days = 5000
+        rets = 0.01 + rng.normal(0, 1e-7, (days, 2))
+        closes = np.cumprod(np.vstack([np.ones((1, 2)), 1 + rets]), axis=0)
+        dates = np.datetime64("2000-01-01") + np.arange(days + 1)
+        with RiskEngine(PriceMatrix(dates, np.array([1, 2]), closes), max_workers=1) as engine:
+            vol = engine.rolling_volatility(window=20, annualize=None)
+            r = engine.returns
+        for t in (25, 2500, days):
+            np.testing.assert_allclose(vol[t], np.nanstd(r[t - 19:t + 1], axis=0, ddof=1), rtol=1e-9)
+
+    def test_covariance_matches_numpy(self):
+        cov, corr = self.engine.covariance(window=60)
+        window = self.r[-60:]
+        np.testing.assert_allclose(cov, np.cov(window, rowvar=False), atol=1e-15)
+        np.testing.assert_allclose(corr, np.corrcoef(window, rowvar=False), atol=1e-12)
+        full = self.engine.correlation()
+        complete = ~np.isnan(self.r[:, 2]) & ~np.isnan(self.r[:, 3])
+        expected = np.corrcoef(self.r[complete, 2], self.r[complete, 3])[0, 1]
+        self.assertAlmostEqual(full[2, 3], expected)
+        np.testing.assert_allclose(full, full.T)
+
+    def test_betas(self):
+        betas = self.engine.betas([100], window=100)
+        self.assertEqual(betas.shape, (7, 1))
+        window = self.r[-100:]
+        for k in range(7):
+            x, m = window[:, k], window[:, 0]
+            both = ~np.isnan(x) & ~np.isnan(m)
+            expected = np.cov(x[both], m[both])[0, 1] / np.var(m[both], ddof=1)
+            self.assertAlmostEqual(betas[k, 0], expected)
+        self.assertAlmostEqual(betas[0, 0], 1.0)
+        with self.assertRaises(ValueError):
+            self.engine.betas([999])
+
+    def test_close_while_caller_holds_returns(self):
+        engine = RiskEngine(make_prices(), max_workers=1)
+        held = engine.returns
+        engine.close()
+        self.assertEqual(held.shape, self.r.shape)
+
+    def test_use_after_close(self):
+        engine = RiskEngine(make_prices(), max_workers=1)
+        engine.close()
+        engine.close()
+        for call in (lambda: engine.returns, engine.rolling_volatility, engine.covariance,
+                     lambda: engine.betas([100])):
+            with self.assertRaisesRegex(ValueError, "RiskEngine is closed"):
+                call()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import threading
+import unittest
+
+import numpy as np
+
+from borsdata_client import BorsdataAPIClient
+from WSVPortfolio import Kpi, KpiScreener
+from WSVPortfolio.screener import Expr, percentile, rank
+
+
+class FakeKpiClient(BorsdataAPIClient):
+    """Serves one calc-alt column per KPI id; instrument 4 lacks KPI 2."""
+
+    def __init__(self):
+        super().__init__(api_key="test")
+        self.columns = {
+            2: {1: 12.0, 2: 30.0, 3: -5.0},
+            33: {1: 0.25, 2: 0.10, 3: 0.05, 4: 0.40},
+            61: {1: 1.0, 2: None, 3: 3.0, 4: 4.0},
+        }
+        self.calc_updated = "2024-01-01T00:00:00"
+        self.paths = []
+        self._lock = threading.Lock()
+
+    def _get(self, path, params=None):
+        with self._lock:
+            self.paths.append(path)
+        if path == "/v1/instruments/kpis/updated":
+            return {"kpisCalcUpdated": self.calc_updated}
+        kpi_id, group, calc = path.split("/")[-3:]
+        return {"kpiId": int(kpi_id), "group": group, "calculation": calc,
+                "values": [{"i": i, "n": n} for i, n in self.columns[int(kpi_id)].items()]}
+
+
+class TestRankPercentile(unittest.TestCase):
+    def test_nan_and_ties(self):
+        values = np.array([3.0, np.nan, 1.0, 3.0])
+        np.testing.assert_array_equal(rank(values), [2, np.nan, 1, 2])
+        np.testing.assert_array_equal(rank(values, ascending=False), [1, np.nan, 3, 1])
+        np.testing.assert_allclose(percentile(values), [100, np.nan, 100 / 3, 100])
+
+
+class TestKpiScreener(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeKpiClient()
+        self.screener = KpiScreener(self.client)
+
+    def kpi_paths(self):
+        return [p for p in self.client.paths if not p.endswith("/updated")]
+
+    def test_fetches_only_referenced_columns_into_matrix(self):
+        pe, roe = Kpi(2), Kpi(33, "1year", "mean")
+        result = self.screener.screen(where=(pe > 0) & (roe >= 0.1), order_by=roe, ascending=False, select=[pe, roe])
+        np.testing.assert_array_equal(result.ids, [1, 2])
+        np.testing.assert_allclose(result.values, [[12.0, 0.25], [30.0, 0.10]])
+        self.assertEqual(sorted(self.kpi_paths()), ["/v1/instruments/kpis/2/last/latest", "/v1/instruments/kpis/33/1year/mean"])
+        np.testing.assert_array_equal(self.screener.ids, [1, 2, 3, 4])
+        np.testing.assert_array_equal(self.screener.mask[:, self.screener.columns[pe.key]], [True, True, True, False])
+
+    def test_rank_percentile_and_missing_last(self):
+        growth = Kpi(61)
+        result = self.screener.screen(where=growth.percentile() > 50, order_by=growth.rank(ascending=False))
+        np.testing.assert_array_equal(result.ids, [4, 3])
+        result = self.screener.screen(order_by=growth, ascending=False, limit=None)
+        np.testing.assert_array_equal(result.ids, [4, 3, 1, 2])
+        np.testing.assert_array_equal(self.screener.evaluate(growth.isna()), [False, True, False, False])
+
+    def test_columns_reused_until_recalculation(self):
+        pe = Kpi(2)
+        self.screener.screen(where=pe < 20)
+        self.screener.screen(where=pe > 0, select=[pe * 2])
+        self.assertEqual(len(self.kpi_paths()), 1)
+        self.client.columns[2][3] = 8.0
+        self.client.calc_updated = "2024-01-02T00:00:00"
+        result = self.screener.screen(where=pe < 10)
+        np.testing.assert_array_equal(result.ids, [3])
+        self.assertEqual(len(self.kpi_paths()), 2)
+
+    def test_fixed_rows_ignore_unknown_instruments(self):
+        screener = KpiScreener(self.client, ids=[4, 1, 99])
+        np.testing.assert_array_equal(screener.evaluate(Kpi(33, "1year", "mean")), [0.25, 0.40, np.nan])
+
+
+    def test_incomplete_expression_fails_on_creation(self):
+        class KeysOnly(Expr):
+            def keys(self):
+                return []
+
+        with self.assertRaises(TypeError):
+            KeysOnly()
+
+if __name__ == "__main__":
+    unittest.main()
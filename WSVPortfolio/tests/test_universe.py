@@ -0,0 +1,102 @@
+import copy
+import unittest
+
+import numpy as np
+
+from borsdata_client import BorsdataAPIClient
+from WSVPortfolio import InstrumentUniverse
+from WSVPortfolio.universe import MISSING
+
+
+def instrument(ins_id, ticker, sector, market, country=1, isin=None, yahoo=None):
+    return {"insId": ins_id, "name": ticker, "instrument": 0, "ticker": ticker, "isin": isin or f"SE{ins_id:010d}",
+            "yahoo": yahoo or f"{ticker}.ST", "sectorId": sector, "marketId": market, "branchId": sector * 10 if sector else None, "countryId": country}
+
+
+class FakeUniverseClient(BorsdataAPIClient):
+    def __init__(self):
+        super().__init__(api_key="test")
+        self.routes = {
+            "/v1/instruments": {"instruments": [
+                instrument(1, "ERIC B", sector=5, market=1),
+                instrument(2, "VOLV B", sector=3, market=1),
+                instrument(3, "HM B", sector=2, market=1),
+                instrument(4, "OMXS30", sector=None, market=9, country=None),
+            ]},
+            "/v1/instruments/global": {"instruments": [instrument(100, "AAPL", sector=5, market=20, country=5, yahoo="AAPL"),
+                                                       instrument(101, "ERIC B", sector=5, market=20, country=5, yahoo="ERIC")]},
+            "/v1/instruments/updated": {"instruments": [{"insId": i, "updatedAt": "2024-01-01"} for i in (1, 2, 3, 4)]},
+            "/v1/markets": {"markets": [{"id": 1, "name": "Large Cap", "isIndex": False}, {"id": 9, "name": "Index", "isIndex": True}]},
+            "/v1/sectors": {"sectors": [{"id": 2, "name": "Consumer"}, {"id": 3, "name": "Industry"}, {"id": 5, "name": "Tech"}]},
+            "/v1/branches": {"branches": []},
+            "/v1/countries": {"countries": [{"id": 1, "name": "Sverige"}]},
+        }
+        self.paths = []
+
+    def _get(self, path, params=None):
+        self.paths.append(path)
+        return copy.deepcopy(self.routes[path])
+
+
+class TestInstrumentUniverse(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeUniverseClient()
+        self.universe = InstrumentUniverse.load(self.client, "key")
+
+    def test_key_lookups(self):
+        self.assertEqual(self.universe.by_ticker("eric b"), 1)
+        self.assertEqual(self.universe.by_isin("SE0000000002"), 2)
+        self.assertEqual(self.universe.by_yahoo("HM B.ST"), 3)
+        self.assertIsNone(self.universe.by_ticker("NOPE"))
+        np.testing.assert_array_equal(self.universe.resolve(["VOLV B", "nope", "ERIC B"]), [2, MISSING, 1])
+
+    def test_group_lookups(self):
+        np.testing.assert_array_equal(self.universe.by_market(1), [1, 2, 3])
+        np.testing.assert_array_equal(self.universe.by_sector(5), [1])
+        np.testing.assert_array_equal(self.universe.by_sector(MISSING), [4])
+        np.testing.assert_array_equal(self.universe.by_branch(30), [2])
+        self.assertEqual(len(self.universe.by_country(42)), 0)
+        np.testing.assert_array_equal(self.universe.index_instruments(), [4])
+
+    def test_global_instruments_lose_ticker_collisions(self):
+        universe = InstrumentUniverse.load(self.client, "key", include_global=True)
+        self.assertEqual(len(universe), 6)
+        self.assertEqual(universe.by_ticker("ERIC B"), 1)
+        self.assertEqual(universe.by_yahoo("AAPL"), 100)
+        np.testing.assert_array_equal(universe.by_sector(5), [1, 100, 101])
+
+    def test_refresh_is_noop_without_changes(self):
+        self.client.paths.clear()
+        self.assertEqual(self.universe.refresh(self.client, "key"), [])
+        self.assertEqual(self.client.paths, ["/v1/instruments/updated"])
+
+    def test_refresh_reindexes_changed_instruments(self):
+        self.client.routes["/v1/instruments"]["instruments"][1]["ticker"] = "VOLCAR B"
+        self.client.routes["/v1/instruments"]["instruments"][1]["sectorId"] = 5
+        self.client.routes["/v1/instruments"]["instruments"].append(instrument(5, "NEW", sector=3, market=1))
+        self.client.routes["/v1/instruments/updated"]["instruments"][1]["updatedAt"] = "2024-02-01"
+        self.client.routes["/v1/instruments/updated"]["instruments"].append({"insId": 5, "updatedAt": "2024-02-01"})
+        self.assertEqual(self.universe.refresh(self.client, "key"), [2, 5])
+        self.assertIsNone(self.universe.by_ticker("VOLV B"))
+        self.assertEqual(self.universe.by_ticker("VOLCAR B"), 2)
+        np.testing.assert_array_equal(np.sort(self.universe.by_sector(5)), [1, 2])
+        np.testing.assert_array_equal(self.universe.by_sector(3), [5])
+
+
+    def test_refresh_promotes_instrument_sharing_a_released_key(self):
+        universe = InstrumentUniverse.load(self.client, "key", include_global=True)
+        self.client.routes["/v1/instruments"]["instruments"][0]["ticker"] = "ERICSSON B"
+        self.client.routes["/v1/instruments/updated"]["instruments"][0]["updatedAt"] = "2024-02-01"
+        self.assertEqual(universe.refresh(self.client, "key"), [1])
+        self.assertEqual(universe.by_ticker("ERIC B"), 101)
+        self.assertEqual(universe.by_ticker("ERICSSON B"), 1)
+
+        self.client.routes["/v1/instruments/global"]["instruments"].pop()  # 101 delisted
+        self.client.routes["/v1/instruments/updated"]["instruments"][0]["updatedAt"] = "2024-03-01"
+        self.assertEqual(universe.refresh(self.client, "key"), [1, 101])
+        self.assertIsNone(universe.by_ticker("ERIC B"))
+        self.assertEqual(universe.by_ticker("ERICSSON B"), 1)
+        self.assertEqual(universe._shadowed, {})
+
+if __name__ == "__main__":
+    unittest.main()